@@ -0,0 +1,95 @@
+# benchmarks/bench_api_client.py
+# Requisições/segundo contra um servidor HTTP local (keep-alive, JSON pequeno):
+#   module → `requests.get/post` direto (comportamento antigo do api_client: conexão nova a cada chamada)
+#   pooled → ApiClient em cima de build_session() (pool de conexões reaproveitadas)
+#
+# Uso (na raiz do repo):
+#   python -m benchmarks.bench_api_client --requests 2000 --threads 1 --threads 8
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import requests  # noqa: E402
+
+from utils.api_client import ApiClient, build_session  # noqa: E402
+
+_BODY = json.dumps([{"id": i, "name": f"Produto {i}", "price": "10.00"} for i in range(5)]).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # como uvicorn/gunicorn; senão o keep-alive cai no delayed ACK
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(_BODY)))
+        self.end_headers()
+        self.wfile.write(_BODY)
+
+    do_GET = do_POST = _reply
+
+
+def _start_server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, f"http://127.0.0.1:{httpd.server_address[1]}"
+
+
+def _run(client, url, total, threads):
+    def call(i):
+        if i % 2:
+            resp = client.post(f"{url}/wishlists", json={"name": f"w{i}"}, headers={"Authorization": "Bearer x"})
+        else:
+            resp = client.get(f"{url}/wishlists", headers={"Authorization": "Bearer x"})
+        assert resp.status_code == 200
+
+    t0 = time.perf_counter()
+    if threads == 1:
+        for i in range(total):
+            call(i)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(call, range(total)))
+    return total / (time.perf_counter() - t0)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark requests (módulo) vs ApiClient com pool")
+    ap.add_argument("--requests", type=int, default=2000)
+    ap.add_argument("--threads", type=int, action="append", help="pode repetir (default: 1 e 8)")
+    args = ap.parse_args(argv)
+
+    httpd, url = _start_server()
+    session = build_session(pool_size=max(args.threads or [8]))
+    pooled = ApiClient(session, timeout=10)
+    print(f"\nAPI client benchmark ({url}, {args.requests} requests)")
+    print(f"{'client':<8} {'threads':>7} {'req/s':>10}")
+    try:
+        for threads in args.threads or [1, 8]:
+            for name, client in (("module", requests), ("pooled", pooled)):
+                _run(client, url, min(50, args.requests), threads)  # aquecimento
+                rps = _run(client, url, args.requests, threads)
+                print(f"{name:<8} {threads:>7} {rps:10.0f}")
+    finally:
+        session.close()
+        httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main()
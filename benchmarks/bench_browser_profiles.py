@@ -0,0 +1,136 @@
+# benchmarks/bench_browser_profiles.py
+# Compara o perfil padrão do `browser` com o --fast-profile numa página
+# estática local (benchmarks/static/fixture_page.html), medindo por navegador:
+#   launch → tempo para abrir o navegador
+#   nav    → tempo do driver.get() da página fixture (imagens/fontes servidas com atraso)
+#   rss    → memória (RSS) somada do driver + processos do navegador
+# e confere que os seletores de WebSearchResultsPage/WebProductPage continuam válidos.
+#
+# Uso (na raiz do repo):
+#   python -m benchmarks.bench_browser_profiles --browser chrome --browser firefox --runs 3
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pages.pages_web.web_product_page import WebProductPage  # noqa: E402
+from pages.pages_web.web_search_results_page import WebSearchResultsPage  # noqa: E402
+from utils.browser_factory import create_browser  # noqa: E402
+from utils.driver_resolver import DriverResolver  # noqa: E402
+
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+ASSET_DELAY_S = 0.05
+ASSET_SIZE = 200 * 1024
+
+
+class _FixtureHandler(SimpleHTTPRequestHandler):
+    """Serve a página fixture; imagens e fontes são bytes sintéticos com atraso."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path.startswith("/img/") or path.endswith(".woff2"):
+            time.sleep(ASSET_DELAY_S)
+            body = os.urandom(ASSET_SIZE)
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg" if "/img/" in path else "font/woff2")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        super().do_GET()
+
+
+def _start_server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), partial(_FixtureHandler, directory=str(STATIC_DIR)))
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, f"http://127.0.0.1:{httpd.server_address[1]}/fixture_page.html"
+
+
+def _tree_rss_kb(root_pid: int) -> int:
+    """RSS (KB) do processo + descendentes via `ps` (macOS/Linux)."""
+    try:
+        out = subprocess.run(
+            ["ps", "-A", "-o", "pid=,ppid=,rss="], capture_output=True, text=True, check=True
+        ).stdout
+    except Exception:
+        return 0
+    children, rss = {}, {}
+    for line in out.splitlines():
+        parts = line.split()
+        if len(parts) != 3:
+            continue
+        pid, ppid, kb = (int(x) for x in parts)
+        children.setdefault(ppid, []).append(pid)
+        rss[pid] = kb
+    total, stack = 0, [root_pid]
+    while stack:
+        pid = stack.pop()
+        total += rss.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total
+
+
+def _run_once(browser_name, fast, url, resolver):
+    t0 = time.perf_counter()
+    drv = create_browser(browser_name, "allow", resolver.service(browser_name), fast=fast)
+    launch = time.perf_counter() - t0
+    try:
+        t1 = time.perf_counter()
+        drv.get(url)
+        nav = time.perf_counter() - t1
+
+        search = WebSearchResultsPage(drv)
+        product = WebProductPage(drv)
+        ok = (
+            search.find_card_by_exact_name("Produto Fixture 3") is not None
+            and product.get_product_title() == "Produto Fixture 0"
+            and bool(product.get_product_price())
+        )
+        rss_kb = _tree_rss_kb(drv.service.process.pid)
+    finally:
+        drv.quit()
+    return launch, nav, rss_kb, ok
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark perfil padrão vs --fast-profile")
+    ap.add_argument("--browser", action="append", choices=["chrome", "firefox"])
+    ap.add_argument("--runs", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    httpd, url = _start_server()
+    resolver = DriverResolver()
+    print(f"\nBrowser profile benchmark ({url})")
+    print(f"{'browser':<8} {'profile':<8} {'launch':>10} {'nav':>10} {'rss':>10}  selectors")
+    try:
+        for browser_name in args.browser or ["chrome"]:
+            for fast in (False, True):
+                runs = [_run_once(browser_name, fast, url, resolver) for _ in range(args.runs)]
+                launch = statistics.median(r[0] for r in runs)
+                nav = statistics.median(r[1] for r in runs)
+                rss = statistics.median(r[2] for r in runs)
+                ok = all(r[3] for r in runs)
+                print(
+                    f"{browser_name:<8} {'fast' if fast else 'default':<8} "
+                    f"{launch * 1000:8.0f}ms {nav * 1000:8.0f}ms {rss / 1024:8.1f}MB  "
+                    f"{'ok' if ok else 'FAILED'}"
+                )
+    finally:
+        httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# benchmarks/bench_dashboard.py
+# Gera uma sessão sintética (journal com N resultados, ~10% falhas com traceback
+# longo, timings, screenshots) e mede a reconstrução dos relatórios a partir dele:
+#   summary   → session_summary.json (streaming, teste a teste)
+#   dashboard → dashboard.html (data island JSON + erros num bloco separado)
+#   clusters  → só o agrupamento das falhas por assinatura (utils/signatures.py)
+# com tempo, tamanho dos arquivos e, com --trace-memory, o pico de memória
+# Python (tracemalloc; roda de novo à parte porque o tracing deixa tudo mais lento).
+#
+# Uso (na raiz do repo):
+#   python -m benchmarks.bench_dashboard --results 50000 --trace-memory
+#   python -m benchmarks.bench_dashboard --results 50000 --keep   # mantém a pasta p/ abrir no navegador
+
+import argparse
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils import journal as J  # noqa: E402
+from utils import reporting as R  # noqa: E402
+from utils import signatures as S  # noqa: E402
+
+_MODULES = ("auth", "wishlists", "products", "search", "checkout", "profile")
+_TRACEBACK = "\n".join(
+    [f"tests/tests_api/test_{{module}}.py:{n}: in test_{{name}}\n    resp = api.post(url, json=payload)" for n in range(40, 400, 12)]
+    + ["E   AssertionError: expected status 201, got {status} (session {sid})", "E   assert {status} == 201"]
+)
+
+
+def _synthetic_session(session_dir: Path, total: int, seed: int) -> None:
+    rnd = random.Random(seed)
+    writer = J.JournalWriter(J.journal_path(session_dir))
+    writer.append({"t": "session", "worker": "main", "started_at": "2026-01-01 00:00:00"})
+    clock = 1_700_000_000.0
+    for order in range(1, total + 1):
+        module = rnd.choice(_MODULES)
+        name = f"test_{module}_case_{order}[param{order % 7}]"
+        nodeid = f"tests/tests_api/test_{module}.py::{name}"
+        roll = rnd.random()
+        outcome = "failed" if roll < 0.1 else "skipped" if roll < 0.15 else "passed"
+        duration = rnd.lognormvariate(-1.5, 0.8)
+        result = {
+            "t": "result", "nodeid": nodeid, "name": name, "when": "call", "outcome": outcome,
+            "duration": duration, "start": clock, "stop": clock + duration, "error": "",
+            "timings": {"request": round(duration * 0.6, 3)}, "order": order,
+            "dir": f"{order:03d}_{name}_{outcome.upper()}",
+        }
+        if outcome == "failed":
+            result["error"] = _TRACEBACK.format(
+                module=module, name=name, status=rnd.choice((400, 409, 500)), sid=rnd.getrandbits(64)
+            )
+            result["screenshot"] = f"{result['dir']}/screenshot_{name}.png"
+        writer.append(result)
+        writer.append({"t": "phase", "nodeid": nodeid, "name": name, "when": "teardown",
+                       "outcome": "passed", "duration": 0.001, "order": order})
+        clock += duration
+    writer.append({"t": "finish", "exitstatus": 1})
+    writer.close()
+
+
+def _measure(label: str, func, trace_memory: bool) -> None:
+    t0 = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - t0
+    peak = ""
+    if trace_memory:
+        tracemalloc.start()
+        func()
+        peak = f"{tracemalloc.get_traced_memory()[1] / 2**20:.1f}MB"
+        tracemalloc.stop()
+    print(f"{label:<10} {elapsed:9.2f}s {peak:>11}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark: relatórios a partir de um journal sintético")
+    ap.add_argument("--results", type=int, default=50000)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--trace-memory", action="store_true", help="mede o pico de memória (tracemalloc)")
+    ap.add_argument("--keep", action="store_true", help="não apaga a pasta da sessão sintética")
+    args = ap.parse_args(argv)
+
+    session_dir = Path(tempfile.mkdtemp(prefix="bench_dashboard_"))
+    try:
+        t0 = time.perf_counter()
+        _synthetic_session(session_dir, args.results, args.seed)
+        journal = J.journal_path(session_dir)
+        print(f"\nDashboard benchmark ({args.results} results, journal {journal.stat().st_size / 2**20:.1f}MB "
+              f"in {time.perf_counter() - t0:.2f}s)")
+        print(f"{'step':<10} {'time':>10} {'peak mem':>11}")
+
+        html_path = session_dir / "dashboard.html"
+
+        def _dashboard():
+            # direto no arquivo: write_dashboard() também copiaria para output/dashboard_latest.html
+            with html_path.open("w", encoding="utf-8") as fh:
+                R._write_dashboard_html(fh, session_dir)
+
+        _measure("summary", lambda: R.write_session_summary(session_dir), args.trace_memory)
+        _measure("dashboard", _dashboard, args.trace_memory)
+        clusters = S.FailureClusters()
+        failures = [r for r in J.iter_results(session_dir) if r.get("error")]
+        _measure("clusters", lambda: [clusters.add(r) for r in failures], args.trace_memory)
+
+        html = html_path.read_text(encoding="utf-8")
+        blocks = dict(re.findall(r'<script type="application/json" id="([\w-]+)">(.*?)</script>', html, re.S))
+        print(f"\n{len(failures)} failure(s) → {len(clusters.clusters)} signature(s)")
+        print(f"session_summary.json {(session_dir / 'session_summary.json').stat().st_size / 2**20:8.1f}MB")
+        print(f"dashboard.html       {len(html.encode()) / 2**20:8.1f}MB")
+        for name, body in blocks.items():
+            print(f"  #{name:<18} {len(body.encode()) / 2**20:8.1f}MB")
+        if args.keep:
+            print(f"\nSession kept: {html_path}")
+    finally:
+        if not args.keep:
+            shutil.rmtree(session_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# benchmarks/bench_driver_resolution.py
+# Compara o custo de resolver o driver do navegador:
+#   legacy  → ChromeDriverManager().install() a cada chamada (comportamento antigo;
+#             cache do webdriver_manager próprio, vazio só antes da 1ª chamada)
+#   cold    → DriverResolver com cache vazio: manifest E cache do webdriver_manager
+#             apagados antes de cada execução (download + instalação de verdade)
+#   warm    → DriverResolver novo com manifest populado (sem webdriver_manager)
+#   offline → warm + offline=True e proxy inválido (garante zero rede)
+#   memo    → segunda chamada na mesma sessão (memória)
+#
+# Uso (na raiz do repo):
+#   python -m benchmarks.bench_driver_resolution --browser chrome --runs 5
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.driver_resolver import DriverResolver, _install_driver  # noqa: E402
+
+
+def _timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def _fmt(name, samples):
+    return (
+        f"{name:<8} runs={len(samples):<3} "
+        f"median={statistics.median(samples) * 1000:9.1f}ms "
+        f"min={min(samples) * 1000:9.1f}ms max={max(samples) * 1000:9.1f}ms"
+    )
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark de resolução do driver do navegador")
+    ap.add_argument("--browser", default="chrome", choices=["chrome", "firefox"])
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # nada de ~/.wdm: cada caso tem o próprio cache do webdriver_manager
+        cache, legacy_wdm, cold_wdm = Path(tmp) / "drivers", Path(tmp) / "wdm-legacy", Path(tmp) / "wdm-cold"
+        results.append(("legacy", _timed(lambda: _install_driver(args.browser, legacy_wdm), args.runs)))
+
+        def cold():
+            shutil.rmtree(cache, ignore_errors=True)
+            shutil.rmtree(cold_wdm, ignore_errors=True)
+            DriverResolver(cache_dir=cache, offline=False, wdm_root=cold_wdm).resolve(args.browser)
+
+        results.append(("cold", _timed(cold, args.runs)))
+        results.append((
+            "warm",
+            _timed(lambda: DriverResolver(cache_dir=cache, offline=False).resolve(args.browser), args.runs),
+        ))
+
+        saved = {k: os.environ.get(k) for k in ("HTTPS_PROXY", "HTTP_PROXY")}
+        os.environ["HTTPS_PROXY"] = os.environ["HTTP_PROXY"] = "http://127.0.0.1:9"
+        try:
+            results.append((
+                "offline",
+                _timed(lambda: DriverResolver(cache_dir=cache, offline=True).resolve(args.browser), args.runs),
+            ))
+        finally:
+            for k, v in saved.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+
+        session = DriverResolver(cache_dir=cache, offline=True)
+        session.resolve(args.browser)
+        results.append(("memo", _timed(lambda: session.resolve(args.browser), args.runs)))
+
+    print(f"\nDriver resolution benchmark ({args.browser})")
+    for name, samples in results:
+        print(_fmt(name, samples))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# benchmarks/bench_history.py
+# Gera N sessões sintéticas (session_summary.json com M testes cada; alguns
+# testes instáveis e alguns ficando mais lentos) e mede o histórico (utils/history.py):
+#   ingest   → primeira ingestão de todas as sessões
+#   reingest → segunda passada (nada mudou: só stat + SELECT por sessão)
+#   consultas do card Trends (session_trend, flaky_tests, slowest_movers, test_trend, trends)
+#
+# Uso (na raiz do repo):
+#   python -m benchmarks.bench_history --sessions 300 --tests 500
+
+import argparse
+import json
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.history import History  # noqa: E402
+
+
+def _synthetic_sessions(root: Path, sessions: int, tests: int, seed: int) -> None:
+    rnd = random.Random(seed)
+    base = {f"tests/tests_api/test_mod{i % 20}.py::test_case_{i}": rnd.lognormvariate(-1.5, 0.8) for i in range(tests)}
+    flaky = set(rnd.sample(sorted(base), max(1, tests // 50)))
+    slower = set(rnd.sample(sorted(base), max(1, tests // 50)))
+    start = datetime(2026, 1, 1)
+    for s in range(sessions):
+        ts = start + timedelta(hours=6 * s)
+        name = f"{ts.strftime('%Y-%m-%d_%H-%M-%S')}_api"
+        results = []
+        for order, (nodeid, dur) in enumerate(base.items(), 1):
+            if nodeid in slower and s > sessions * 0.8:
+                dur *= 2
+            outcome = "failed" if (nodeid in flaky and rnd.random() < 0.3) or rnd.random() < 0.002 else "passed"
+            results.append({"nodeid": nodeid, "name": nodeid.split("::")[-1], "when": "call",
+                            "outcome": outcome, "duration": dur * rnd.uniform(0.9, 1.1), "order": order})
+        passed = sum(r["outcome"] == "passed" for r in results)
+        summary = {
+            "session_info": {
+                "timestamp": name, "started_at": ts.strftime("%Y-%m-%d %H:%M:%S"),
+                "finished_at": (ts + timedelta(minutes=5)).strftime("%Y-%m-%d %H:%M:%S"),
+                "pytest_exitstatus": 0 if passed == tests else 1, "total_tests": tests, "passed": passed,
+                "failed": tests - passed, "skipped": 0, "pass_rate": round(passed / tests * 100, 2),
+            },
+            "tests": results,
+        }
+        (root / name).mkdir()
+        (root / name / "session_summary.json").write_text(json.dumps(summary), encoding="utf-8")
+
+
+def _timed(label: str, func, repeat: int = 1):
+    times, result = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - t0)
+    print(f"{label:<16} {statistics.median(times) * 1000:10.1f}ms")
+    return result
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark do histórico entre sessões (SQLite)")
+    ap.add_argument("--sessions", type=int, default=300)
+    ap.add_argument("--tests", type=int, default=500)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    root = Path(tempfile.mkdtemp(prefix="bench_history_"))
+    try:
+        _synthetic_sessions(root, args.sessions, args.tests, args.seed)
+        print(f"\nHistory benchmark ({args.sessions} sessions x {args.tests} tests)")
+        print(f"{'step':<16} {'median':>12}")
+        with History(root / "history.sqlite") as h:
+            n = _timed("ingest", lambda: h.ingest_dir(root))
+            _timed("reingest", lambda: h.ingest_dir(root))
+            last = sorted(p.name for p in root.iterdir() if p.is_dir())[-1]
+            _timed("session_trend", lambda: h.session_trend("api"), repeat=5)
+            flaky = _timed("flaky_tests", lambda: h.flaky_tests("api"), repeat=5)
+            movers = _timed("slowest_movers", lambda: h.slowest_movers("api"), repeat=5)
+            nodeid = (flaky or movers or [{"nodeid": ""}])[0]["nodeid"]
+            _timed("test_trend", lambda: h.test_trend(nodeid), repeat=5)
+            _timed("trends (card)", lambda: h.trends(last), repeat=5)
+        size = (root / "history.sqlite").stat().st_size
+        print(f"\n{n} session(s) ingested; db {size / 2**20:.1f}MB; {len(flaky)} flaky, {len(movers)} mover(s) found")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
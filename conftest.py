@@ -1,27 +1,68 @@
-import base64
+import contextlib
+import hashlib
+import inspect
 import json
 import os
-import selenium.webdriver as swd
+import sqlite3
+import time
 import pytest
-import requests
 
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
 
-from appium import webdriver as appwd
-from appium.options.common.base import AppiumOptions
-
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FFOptions
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.service import Service as FirefoxService
-
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-
 from utils import reporting as R
+from utils.api_client import DEFAULT_POOL_SIZE, DEFAULT_RETRIES, DEFAULT_TIMEOUT, ApiClient, build_session
+from utils.api_reader import DEFAULT_CATALOG_TTL_S, WishlistCatalog
+from utils.artifacts import ArtifactWriter
+from utils.async_api_client import AsyncApiClient, run as run_async
+from utils.cassette import CASSETTE_MODES, DEFAULT_CASSETTE_PATH, DEFAULT_MAX_AGE_DAYS, Cassette
+from utils.csv_collector import DEFAULT_CSV_WORKERS, CsvCaseItem, CsvFile, is_csv_case_file, plan_csv_runs
+from utils.appium_session import (
+    APPIUM_URL,
+    RESET_STRATEGIES,
+    AppiumSessionManager,
+    create_appium_driver,
+    merge_stats,
+)
+from utils.device_pool import DeviceRegistry, build_capabilities, parse_devices
+from utils.fake_api import API_BACKENDS, FakeApiServer, parse_latency
+from utils.history import DEFAULT_HISTORY_PATH, DEFAULT_SESSIONS_ROOT, History
+from utils.latency import (
+    DEFAULT_BASELINE_PATH,
+    LATENCY_BUDGET_MODES,
+    RequestTimings,
+    compare as compare_latency,
+    load_baseline,
+    regression_lines,
+    updated_baseline,
+)
+from utils.load import DEFAULT_LOAD_DURATION_S, DEFAULT_LOAD_USERS, Flow, LoadRunner, report_lines
+from utils.recording import VIDEO_POLICIES, recording_options, should_record
+from utils.browser_factory import create_browser
+from utils.browser_pool import BrowserPool
+from utils.driver_resolver import DriverResolver
 from utils.logger import setup_logger
+from utils.parallel import SharedCounter, file_lock, is_xdist_controller, worker_id
+from utils.scheduler import (
+    DEFAULT_SHARD_DURATIONS,
+    SCHEDULE_MODES,
+    expected_durations,
+    fingerprint,
+    parse_shard,
+    pinned_durations,
+    plan,
+    plan_lines,
+)
+from utils.resource_tracker import (
+    CLEANUP_MODES,
+    CLEANUP_ORDER,
+    DEFAULT_CLEANUP_WORKERS,
+    ResourceTracker,
+    group_by_owner,
+)
+from utils.startup_profile import StartupProfile
+from utils.user_pool import DEFAULT_POOL_SIZE as DEFAULT_USER_POOL_SIZE, UserPool
 
 # novo: pytest -m "web or api" --suite=mixed --browser all
 
@@ -51,6 +92,32 @@ LOG = None
 SESSION_DIR: Optional[Path] = None
 TEST_COUNTER = 0
 NODEID_TO_TESTDIR = {}
+# xdist: id do worker (gw0, gw1...) e contador global compartilhado entre processos
+WORKER_ID: Optional[str] = None
+EXEC_COUNTER: Optional[SharedCounter] = None
+# screenshots/vídeos gravados em background (ver utils/artifacts.py)
+ARTIFACTS: Optional[ArtifactWriter] = None
+# --startup-profile: tempos de import/coleta
+STARTUP_PROFILE: Optional[StartupProfile] = None
+# pastas de teste → marker da suíte (usado p/ pular pastas inteiras com -m)
+SUITE_DIRS = {"tests_web": "web", "tests_mobile": "mobile", "tests_api": "api", "tests_utils": "unit"}
+# origens do site testado: o pool de navegadores limpa estas a cada teste (ver utils/browser_pool.py)
+WEB_HOME_ORIGINS = ("https://www.americanas.com.br",)
+# API local (--api-backend=live); memory/sqlite sobem a API fake numa porta livre
+API_BASE_URL = "http://127.0.0.1:8000"
+FAKE_API: Optional[FakeApiServer] = None
+# client com pool p/ quem roda fora de fixture (casos CSV, prefetch do catálogo)
+SHARED_API_CLIENT: Optional[ApiClient] = None
+# produtos da wishlist projeto_final + token do usuário padrão (um por processo)
+CATALOG: Optional[WishlistCatalog] = None
+# --load: resultado da carga (terminal summary)
+LOAD_REPORT: Optional[dict] = None
+# endpoints acima do budget de latência (terminal summary)
+LATENCY_REGRESSIONS: list = []
+# --cassette record|replay: gravação/replay das chamadas HTTP (um por processo)
+CASSETTE: Optional[Cassette] = None
+# --schedule/--shard: resumo do plano (terminal summary / session_meta.json)
+SCHEDULE_INFO: Optional[dict] = None
 
 
 # ==========================================================
@@ -75,6 +142,292 @@ def pytest_addoption(parser):
         default=os.getenv("BROWSER", "chrome"),
         help="chrome | firefox | all (default: env BROWSER ou 'chrome')",
     )
+    parser.addoption(
+        "--browser-pool",
+        action="store_true",
+        default=False,
+        help="Reaproveita navegadores entre testes (pool por sessão, estado zerado a cada teste)",
+    )
+    parser.addoption(
+        "--browser-lanes",
+        action="store_true",
+        default=False,
+        help="Com --browser all: roda cada navegador em uma 'lane' paralela (xdist, um worker por navegador)",
+    )
+    parser.addoption(
+        "--fast-profile",
+        action="store_true",
+        default=False,
+        help="Navegador headless 'enxuto' p/ regressão: eager page load, sem imagens/fontes/extensões/GPU",
+    )
+    parser.addoption(
+        "--offline-drivers",
+        action="store_true",
+        default=False,
+        help="Usa apenas chromedriver/geckodriver já em cache, sem rede (default: env DRIVERS_OFFLINE)",
+    )
+    parser.addoption(
+        "--appium-reuse",
+        action="store_true",
+        default=False,
+        help="Reaproveita uma sessão Appium por worker e reseta o app entre testes",
+    )
+    parser.addoption(
+        "--app-reset",
+        action="store",
+        default="terminate",
+        choices=RESET_STRATEGIES,
+        help="Reset do app entre testes com --appium-reuse: terminate (terminate/activate) | clear (limpa dados) (default: terminate)",
+    )
+    parser.addoption(
+        "--devices",
+        action="store",
+        default=os.getenv("APPIUM_DEVICES", ""),
+        help="Devices Appium: arquivo .json ou 'udid@url[#systemPort],...' (default: env APPIUM_DEVICES ou emulator-5554)",
+    )
+    parser.addoption(
+        "--device-lease",
+        action="store",
+        default="worker",
+        choices=("worker", "test"),
+        help="Escopo do lease de device: worker (um device fixo por processo) | test (a cada teste)",
+    )
+    parser.addoption(
+        "--video",
+        action="store",
+        default="always",
+        choices=VIDEO_POLICIES,
+        help="Gravação de tela (mobile): always | on-retry | marked (slow/critical) | never (default: always)",
+    )
+    parser.addoption(
+        "--video-time-limit",
+        action="store",
+        type=int,
+        default=180,
+        help="Duração máxima de cada vídeo em segundos (timeLimit do Appium) (default: 180)",
+    )
+    parser.addoption(
+        "--video-bitrate",
+        action="store",
+        type=int,
+        default=None,
+        help="Bitrate do vídeo em bits/s, ex.: 1000000 (default: do Appium, 4 Mbps)",
+    )
+    parser.addoption(
+        "--video-size",
+        action="store",
+        default=None,
+        help="Resolução do vídeo LARGURAxALTURA, ex.: 720x1280 (default: tela do device)",
+    )
+    parser.addoption(
+        "--artifact-workers",
+        action="store",
+        type=int,
+        default=2,
+        help="Threads que gravam screenshots/vídeos fora da thread do teste (0 = grava na hora) (default: 2)",
+    )
+    parser.addoption(
+        "--api-pool-size",
+        action="store",
+        type=int,
+        default=DEFAULT_POOL_SIZE,
+        help=f"Conexões keep-alive por host no cliente da API (default: {DEFAULT_POOL_SIZE})",
+    )
+    parser.addoption(
+        "--api-timeout",
+        action="store",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help=f"Timeout padrão (s) das chamadas da API (default: {DEFAULT_TIMEOUT:g})",
+    )
+    parser.addoption(
+        "--api-retries",
+        action="store",
+        type=int,
+        default=DEFAULT_RETRIES,
+        help=f"Retries em erro de conexão/502/503/504, só métodos idempotentes (default: {DEFAULT_RETRIES})",
+    )
+    parser.addoption(
+        "--api-backend",
+        action="store",
+        default="live",
+        choices=API_BACKENDS,
+        help="live = API em 127.0.0.1:8000; memory/sqlite = API fake em processo, porta livre (default: live)",
+    )
+    parser.addoption(
+        "--api-latency",
+        action="store",
+        default="0",
+        help="API fake: latência por requisição em ms, fixa (20) ou faixa (10-50)",
+    )
+    parser.addoption(
+        "--api-error-rate",
+        action="store",
+        type=float,
+        default=0.0,
+        help="API fake: fração das requisições respondidas com 503 (0-1)",
+    )
+    parser.addoption(
+        "--csv-workers",
+        action="store",
+        type=int,
+        default=DEFAULT_CSV_WORKERS,
+        help=f"Linhas de um CSV (csv_tests/*.csv) disparadas em paralelo; 1 = sequencial (default: {DEFAULT_CSV_WORKERS})",
+    )
+    parser.addoption(
+        "--catalog-ttl",
+        action="store",
+        type=float,
+        default=DEFAULT_CATALOG_TTL_S,
+        help=f"Segundos que os produtos da wishlist projeto_final ficam em cache; 0 = sempre busca (default: {DEFAULT_CATALOG_TTL_S:.0f})",
+    )
+    parser.addoption(
+        "--catalog-prefetch",
+        action="store_true",
+        default=False,
+        help="Busca a wishlist projeto_final em background logo após a coleta",
+    )
+    parser.addoption(
+        "--user-pool-size",
+        action="store",
+        type=int,
+        default=DEFAULT_USER_POOL_SIZE,
+        help=f"Usuários da API cadastrados de uma vez por worker p/ a fixture new_user_token (default: {DEFAULT_USER_POOL_SIZE})",
+    )
+    parser.addoption(
+        "--cleanup",
+        action="store",
+        default="test",
+        choices=CLEANUP_MODES,
+        help="Limpeza dos recursos criados na API: test (no teardown de cada teste) | deferred (tudo no fim da sessão)",
+    )
+    parser.addoption(
+        "--cleanup-workers",
+        action="store",
+        type=int,
+        default=DEFAULT_CLEANUP_WORKERS,
+        help=f"DELETEs simultâneos na limpeza (default: {DEFAULT_CLEANUP_WORKERS})",
+    )
+    parser.addoption(
+        "--startup-profile",
+        action="store_true",
+        default=False,
+        help="Mostra o tempo de coleta por arquivo e o custo de import por pacote (grava startup_profile.json)",
+    )
+    parser.addoption(
+        "--cassette",
+        action="store",
+        default="off",
+        choices=CASSETTE_MODES,
+        help="API: record (grava requisições/respostas) | replay (responde do arquivo, sem rede) | off (default: off)",
+    )
+    parser.addoption(
+        "--cassette-path",
+        action="store",
+        default=str(DEFAULT_CASSETTE_PATH),
+        help=f"Arquivo SQLite do cassete (default: {DEFAULT_CASSETTE_PATH})",
+    )
+    parser.addoption(
+        "--cassette-max-age",
+        action="store",
+        type=float,
+        default=DEFAULT_MAX_AGE_DAYS,
+        help=f"Replay: gravações mais velhas que N dias são marcadas como velhas (0 = nunca) (default: {DEFAULT_MAX_AGE_DAYS:.0f})",
+    )
+    parser.addoption(
+        "--latency-baseline",
+        action="store",
+        default=str(DEFAULT_BASELINE_PATH),
+        help=f"Baseline de latência por endpoint da API (default: {DEFAULT_BASELINE_PATH})",
+    )
+    parser.addoption(
+        "--latency-budget",
+        action="store",
+        default="warn",
+        choices=LATENCY_BUDGET_MODES,
+        help="Endpoint acima do budget/baseline: off | warn (só avisa) | fail (sessão falha) (default: warn)",
+    )
+    parser.addoption(
+        "--latency-tolerance",
+        action="store",
+        type=float,
+        default=None,
+        help="Folga sobre o p95 do baseline, ex.: 0.3 = +30% (default: a do arquivo de baseline, ou 0.25)",
+    )
+    parser.addoption(
+        "--update-latency-baseline",
+        action="store_true",
+        default=False,
+        help="Grava a latência desta sessão como novo baseline (mantém budget_ms/tolerance do arquivo)",
+    )
+    parser.addoption(
+        "--history-db",
+        action="store",
+        default=str(DEFAULT_HISTORY_PATH),
+        help=f"Histórico entre sessões (SQLite): cada sessão é ingerida no fim e o dashboard ganha o card "
+             f"Trends (default: {DEFAULT_HISTORY_PATH})",
+    )
+    parser.addoption(
+        "--no-history",
+        action="store_true",
+        default=False,
+        help="Não grava a sessão no histórico (e o dashboard sai sem o card Trends)",
+    )
+    parser.addoption(
+        "--schedule",
+        action="store",
+        choices=SCHEDULE_MODES,
+        default="collection",
+        help="Ordem de execução: collection (default) ou longest — mais longos primeiro, pela duração "
+             "esperada do histórico (--history-db) ou dos session_summary.json anteriores",
+    )
+    parser.addoption(
+        "--shard",
+        action="store",
+        default=None,
+        help="Roda só a parte i de N (ex.: 2/4), com as partes equilibradas pelo tempo esperado (CI em paralelo)",
+    )
+    parser.addoption(
+        "--shard-durations",
+        action="store",
+        default=str(DEFAULT_SHARD_DURATIONS),
+        help="--shard: snapshot das durações lido por todos os shards (o 1º grava se não existir; "
+             f"'' = histórico atual, sem snapshot) (default: {DEFAULT_SHARD_DURATIONS})",
+    )
+    parser.addoption(
+        "--load",
+        action="store_true",
+        default=False,
+        help="Modo carga: roda os testes @pytest.mark.load como fluxos ponderados (grava load_report.json)",
+    )
+    parser.addoption(
+        "--load-users",
+        action="store",
+        type=int,
+        default=DEFAULT_LOAD_USERS,
+        help=f"--load: usuários virtuais simultâneos (default: {DEFAULT_LOAD_USERS})",
+    )
+    parser.addoption(
+        "--load-duration",
+        action="store",
+        type=float,
+        default=DEFAULT_LOAD_DURATION_S,
+        help=f"--load: segundos de carga após o ramp-up (default: {DEFAULT_LOAD_DURATION_S:.0f})",
+    )
+    parser.addoption(
+        "--load-iterations",
+        action="store",
+        type=int,
+        default=None,
+        help="--load: total de iterações (somando todos os usuários); se passado, ignora --load-duration",
+    )
+    parser.addoption(
+        "--load-ramp-up",
+        action="store",
+        type=float,
+        default=0.0,
+        help="--load: segundos até todos os usuários virtuais estarem ativos (default: 0)",
+    )
 
 
 # ===== helpers =====
@@ -158,11 +511,338 @@ def pytest_generate_tests(metafunc):
             metafunc.parametrize("browser", browsers, indirect=True, scope="function")
 
 
+def _lanes_enabled(config) -> bool:
+    return bool(config.getoption("--browser-lanes")) and len(
+        _normalize_browsers(config.getoption("--browser"))
+    ) > 1
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_cmdline_main(config):
+    """
+    --browser-lanes: distribui por navegador com xdist (--dist loadgroup) e,
+    se -n não foi passado, abre um worker por navegador.
+    """
+    if not _lanes_enabled(config):
+        return
+    if not config.pluginmanager.hasplugin("xdist"):
+        config.issue_config_time_warning(
+            pytest.PytestConfigWarning("--browser-lanes precisa do pytest-xdist; rodando em sequência."),
+            stacklevel=2,
+        )
+        return
+    if not config.option.numprocesses:
+        config.option.numprocesses = len(_normalize_browsers(config.getoption("--browser")))
+    config.option.dist = "loadgroup"
+
+
+def _selected_suites(config) -> Optional[set]:
+    """
+    Suítes pedidas via -m quando a expressão é só "api", "web or api" etc.
+    Qualquer outra expressão (and/not/parênteses/outros markers) → None (coleta tudo).
+    """
+    expr = (config.getoption("markexpr", "") or "").strip()
+    if not expr:
+        return None
+    names = [t.strip() for t in expr.split(" or ")]
+    if not all(n in SUITE_DIRS.values() for n in names):
+        return None
+    return set(names)
+
+
+def pytest_configure(config):
+    """
+    `-m api` (ou "web or api"...) tira dos caminhos iniciais/testpaths as pastas
+    tests_<suite> que não foram pedidas — senão a coleta importa os testes
+    web/mobile (e com eles selenium/appium) só para depois desmarcá-los.
+    """
+    try:
+        _video_options(config)
+        parse_latency(config.getoption("--api-latency"))
+        parse_shard(config.getoption("--shard"))
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+    if config.getoption("--load") and getattr(config.option, "numprocesses", None):
+        raise pytest.UsageError("--load já roda em paralelo (--load-users): não combine com -n")
+    if config.getoption("--load") and config.getoption("--shard"):
+        raise pytest.UsageError("--load não divide em shards: rode a carga numa máquina só")
+
+    selected = _selected_suites(config)
+    if selected is None:
+        return
+    kept = [
+        a for a in config.args
+        if SUITE_DIRS.get(Path(str(a).split("::")[0]).name, next(iter(selected))) in selected
+    ]
+    if kept and len(kept) != len(config.args):
+        config.args[:] = kept
+
+
+def pytest_ignore_collect(collection_path, config):
+    """
+    `-m api` não importa os testes web/mobile (e com eles selenium/appium):
+    as pastas tests_web/tests_mobile são puladas sem coletar. Convenção: cada
+    pasta tests_<suite> só tem testes marcados com a própria suíte.
+    """
+    suite = SUITE_DIRS.get(collection_path.name)
+    if suite is None or not collection_path.is_dir():
+        return None
+    selected = _selected_suites(config)
+    if selected is None or suite in selected:
+        return None
+    if LOG:
+        LOG.info(f"[STARTUP] -m {config.getoption('markexpr')} → skipping {collection_path.name}/")
+    return True
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_collection(session):
+    t0 = time.perf_counter()
+    yield
+    if STARTUP_PROFILE is None:
+        return
+    STARTUP_PROFILE.stop()
+    STARTUP_PROFILE.collection_s = time.perf_counter() - t0
+    name = f"startup_profile_{WORKER_ID}.json" if WORKER_ID else "startup_profile.json"
+    STARTUP_PROFILE.write(SESSION_DIR / name)
+    for line in STARTUP_PROFILE.lines():
+        LOG.info(f"[STARTUP] {line}")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_make_collect_report(collector):
+    if STARTUP_PROFILE is None or not isinstance(collector, pytest.Module):
+        yield
+        return
+    t0 = time.perf_counter()
+    yield
+    STARTUP_PROFILE.record_file(collector.nodeid, time.perf_counter() - t0)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if CASSETTE is not None and CASSETTE.stale():
+        terminalreporter.section("stale cassette")
+        for scope, reason in sorted(CASSETTE.stale().items()):
+            terminalreporter.write_line(f"{scope}: {reason}")
+        terminalreporter.write_line(f"re-record with: pytest ... --cassette record --cassette-path {CASSETTE.path}")
+    if LATENCY_REGRESSIONS:
+        terminalreporter.section("latency regressions", red=config.getoption("--latency-budget") == "fail")
+        for line in regression_lines(LATENCY_REGRESSIONS):
+            terminalreporter.write_line(line)
+    # com xdist o controller não coleta: o plano vem do session_meta.json (gravado pelo gw0)
+    schedule = SCHEDULE_INFO or (R._read_session_meta(SESSION_DIR).get("schedule") if SESSION_DIR else None)
+    if schedule:
+        terminalreporter.section("schedule")
+        for line in plan_lines(schedule, schedule["source"]):
+            terminalreporter.write_line(line)
+    if LOAD_REPORT is not None:
+        terminalreporter.section("load")
+        for line in report_lines(LOAD_REPORT):
+            terminalreporter.write_line(line)
+    if STARTUP_PROFILE is None or STARTUP_PROFILE.collection_s is None:
+        return
+    terminalreporter.section("startup profile")
+    for line in STARTUP_PROFILE.lines():
+        terminalreporter.write_line(line)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(session, config, items):
+    """
+    Guarda a posição de coleta (igual em todos os workers) e, com --browser-lanes,
+    agrupa os testes parametrizados por navegador na mesma lane.
+    """
+    if config.getoption("--load"):
+        # --load: só os cenários marcados como fluxo de carga
+        deselected = [item for item in items if item.get_closest_marker("load") is None]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item in items if item.get_closest_marker("load") is not None]
+    else:
+        _schedule(config, items)
+    lanes = _lanes_enabled(config)
+    for idx, item in enumerate(items, start=1):
+        item._collection_index = idx
+        browser_name = getattr(getattr(item, "callspec", None), "params", {}).get("browser")
+        if lanes and browser_name:
+            item.add_marker(pytest.mark.xdist_group(name=f"lane-{browser_name}"))
+    plan_csv_runs(items, config)
+    if (
+        config.getoption("--catalog-prefetch")
+        and not is_xdist_controller(config)
+        and any("wishlist_catalog" in getattr(item, "fixturenames", ()) for item in items)
+    ):
+        # busca a wishlist enquanto browser pool/Appium sobem
+        _wishlist_catalog(config).prefetch()
+
+
+def _schedule(config, items) -> None:
+    """
+    --schedule longest / --shard i/N (utils/scheduler.py). Determinístico: cada
+    worker do xdist coleta e reordena igual, senão o controller aborta a sessão.
+    """
+    global SCHEDULE_INFO
+    mode, shard = config.getoption("--schedule"), parse_shard(config.getoption("--shard"))
+    if (mode == "collection" and shard is None) or not items:
+        return
+    history_db = None if config.getoption("--no-history") else Path(config.getoption("--history-db"))
+    sessions_root = SESSION_DIR.parent if SESSION_DIR is not None else DEFAULT_SESSIONS_ROOT
+    snapshot_path = config.getoption("--shard-durations")
+    try:
+        if shard is not None and snapshot_path:
+            # todos os shards (e workers) leem o mesmo snapshot: partição garantida
+            with file_lock(Path(snapshot_path).with_name(".shard_durations.lock")):
+                snapshot, created = pinned_durations(Path(snapshot_path), history_db, sessions_root)
+            durations = snapshot["durations"]
+            source = f"{snapshot_path} ({'created now' if created else 'snapshot of ' + snapshot['created_at']})"
+        else:
+            durations, source = expected_durations(history_db, sessions_root)
+    except sqlite3.Error as exc:
+        LOG.warning(f"[SCHEDULE] could not read {history_db}: {exc}")
+        durations, source = expected_durations(None, sessions_root)
+    # linhas de um CSV são disparadas juntas pelo runner: não separa entre shards
+    kept, deselected, info = plan(
+        items, durations, mode, shard,
+        group_key=lambda item: item.parent if isinstance(item, CsvCaseItem) else None,
+    )
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = kept
+    SCHEDULE_INFO = dict(info, source=source, fingerprint=fingerprint(durations))
+    for line in plan_lines(SCHEDULE_INFO, source):
+        LOG.info(f"[SCHEDULE] {line}")
+    if WORKER_ID in (None, "gw0"):
+        _update_session_meta({"schedule": SCHEDULE_INFO})
+
+
+def pytest_collect_file(file_path, parent):
+    """Cada linha de csv_tests/*.csv vira um teste (ver utils/csv_collector.py)."""
+    if not is_csv_case_file(file_path):
+        return None
+    return CsvFile.from_parent(
+        parent,
+        path=file_path,
+        client_factory=lambda: _shared_api_client(parent.config),
+        base_url=lambda: _api_base_url(parent.config),
+        # com cassete cada linha roda dentro do próprio teste (escopo da gravação determinístico)
+        workers=1 if parent.config.getoption("--cassette") != "off" else parent.config.getoption("--csv-workers"),
+    )
+
+
+def _cassette(config) -> Optional[Cassette]:
+    global CASSETTE
+    mode = config.getoption("--cassette")
+    if mode != "off" and CASSETTE is None:
+        path = Path(config.rootpath) / config.getoption("--cassette-path")
+        CASSETTE = Cassette(path, mode, max_age_days=config.getoption("--cassette-max-age"), logger=LOG)
+    return CASSETTE
+
+
+def _test_fingerprint(item) -> Optional[str]:
+    """Hash do código do teste: mudou depois da gravação → cassete velho para ele."""
+    func = getattr(item, "function", None)
+    if func is None:
+        return None
+    try:
+        return hashlib.sha1(inspect.getsource(func).encode("utf-8")).hexdigest()
+    except (OSError, TypeError):
+        return None
+
+
+def _shared_api_client(config) -> ApiClient:
+    global SHARED_API_CLIENT
+    if SHARED_API_CLIENT is None:
+        workers = config.getoption("--csv-workers")
+        SHARED_API_CLIENT = ApiClient(
+            build_session(
+                pool_size=max(workers, config.getoption("--api-pool-size")),
+                retries=config.getoption("--api-retries"),
+                cassette=_cassette(config),
+            ),
+            timeout=config.getoption("--api-timeout"),
+        )
+    return SHARED_API_CLIENT
+
+
+def _api_base_url(config) -> str:
+    """URL da API dos testes; com --api-backend memory/sqlite sobe a API fake (uma por processo)."""
+    global FAKE_API
+    backend = config.getoption("--api-backend")
+    if backend == "live" or config.getoption("--cassette") == "replay":
+        # replay não usa rede: a chave do cassete ignora host/porta
+        return API_BASE_URL
+    if FAKE_API is None:
+        wid = WORKER_ID or "main"
+        db_path = str(SESSION_DIR / f"fake_api_{wid}.sqlite") if backend == "sqlite" else ":memory:"
+        FAKE_API = FakeApiServer(
+            backend=backend,
+            db_path=db_path,
+            latency=parse_latency(config.getoption("--api-latency")),
+            error_rate=config.getoption("--api-error-rate"),
+        ).start()
+        LOG.info(f"[API] fake API ({backend}) on {FAKE_API.url} ({wid})")
+    return FAKE_API.url
+
+
+def _wishlist_catalog(config) -> WishlistCatalog:
+    global CATALOG
+    if CATALOG is None:
+        CATALOG = WishlistCatalog(
+            _shared_api_client(config), _api_base_url(config), ttl=config.getoption("--catalog-ttl"), logger=LOG,
+            check_token_exp=config.getoption("--cassette") != "replay",
+        )
+    return CATALOG
+
+
+def _build_artifact_writer(config) -> ArtifactWriter:
+    workers = config.getoption("--artifact-workers")
+    return ArtifactWriter(workers=workers, max_queue=max(1, workers) * 4, logger=LOG)
+
+
+def _save_artifact(item, kind: str, path: Path, b64_data: str) -> None:
+    """Enfileira o artefato; link no dashboard/test_log só depois de gravado."""
+    tag = "[WEB ARTIFACT]" if kind == "screenshot" and "browser" in item.fixturenames else "[ARTIFACT]"
+    add = R.add_video if kind == "video" else R.add_screenshot
+
+    def _done(p: Path) -> None:
+        LOG.info(f"{tag} {kind} -> {p}")
+        add(item, _rel_to_session(p))
+        _write_test_log_line(p.parent, f"ARTIFACT {kind}: {p.name}")
+
+    ARTIFACTS.submit_b64(path, b64_data, on_done=_done)
+
+
 # ===== pytest lifecycle =====
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """xdist (controller): todos os workers escrevem no mesmo 'paizinho'."""
+    node.workerinput["session_dir"] = str(SESSION_DIR)
+    node.workerinput["dist"] = node.config.getoption("dist")
+
+
 @pytest.hookimpl(tryfirst=True)
 def pytest_sessionstart(session):
     """Cria o 'paizinho' da sessão e inicializa o logger de sessão dentro dele."""
-    global LOG, SESSION_DIR
+    global LOG, SESSION_DIR, WORKER_ID, EXEC_COUNTER, STARTUP_PROFILE, ARTIFACTS
+
+    if session.config.getoption("--startup-profile") and not is_xdist_controller(session.config):
+        # controller do xdist não coleta: o perfil sai de cada worker
+        STARTUP_PROFILE = StartupProfile()
+        STARTUP_PROFILE.start()
+
+    WORKER_ID = worker_id(session.config)
+    if WORKER_ID:
+        # worker do xdist: reaproveita o diretório criado pelo controller
+        SESSION_DIR = Path(session.config.workerinput["session_dir"])
+        EXEC_COUNTER = SharedCounter(SESSION_DIR / ".exec_counter")
+        if SAVE_EXEC_LOGS:
+            LOG = setup_logger(SESSION_DIR / f"session_log_{WORKER_ID}.txt")
+        else:
+            LOG = _build_console_logger()
+        LOG.info(f"=== Pytest worker {WORKER_ID} STARTED (output dir: {SESSION_DIR}) ===")
+        ARTIFACTS = _build_artifact_writer(session.config)
+        R.open_journal(SESSION_DIR, WORKER_ID)
+        return
 
     # 1) via CLI (--suite=mobile|web|api)
     cli_suite = session.config.getoption("--suite")
@@ -184,6 +864,7 @@ def pytest_sessionstart(session):
     timestamp = _timestamp()
     SESSION_DIR = Path("tests_compiled_info") / f"{timestamp}_{suite_name}"
     _ensure_dir(SESSION_DIR)
+    EXEC_COUNTER = SharedCounter(SESSION_DIR / ".exec_counter")
 
     # Logger: arquivo + console (SAVE_EXEC_LOGS=True) ou somente console (False)
     if SAVE_EXEC_LOGS:
@@ -194,17 +875,91 @@ def pytest_sessionstart(session):
     LOG.info("=== Pytest session STARTED ===")
     LOG.info(f"Output dir: {SESSION_DIR}")
     LOG.info(f"Suite: {suite_name}")
+    ARTIFACTS = _build_artifact_writer(session.config)
+    if not is_xdist_controller(session.config):
+        # controller do xdist não roda testes: só os workers têm journal
+        R.open_journal(SESSION_DIR)
+
+
+def _check_latency(config) -> bool:
+    """
+    Soma a latência por endpoint da sessão, compara com o baseline e (opcional)
+    grava o novo baseline. True = há regressão e --latency-budget=fail.
+    """
+    global LATENCY_REGRESSIONS
+    endpoints = R.latency_summary(SESSION_DIR)
+    if not endpoints:
+        return False
+    mode = config.getoption("--latency-budget")
+    path = Path(config.rootpath) / config.getoption("--latency-baseline")
+    baseline = load_baseline(path)
+    if mode != "off":
+        LATENCY_REGRESSIONS = compare_latency(endpoints, baseline, config.getoption("--latency-tolerance"))
+    R.set_latency_report({
+        "baseline": str(path) if baseline else None,
+        "mode": mode,
+        "endpoints": endpoints,
+        "regressions": LATENCY_REGRESSIONS,
+    })
+    for line in regression_lines(LATENCY_REGRESSIONS):
+        LOG.warning(f"[LATENCY] {line}")
+    if config.getoption("--update-latency-baseline"):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(updated_baseline(endpoints, baseline), indent=2) + "\n", encoding="utf-8")
+        LOG.info(f"[LATENCY] baseline updated: {path} ({len(endpoints)} endpoint(s))")
+    return bool(LATENCY_REGRESSIONS) and mode == "fail"
+
+
+def _ingest_history(config) -> Optional[Path]:
+    """Ingere as sessões novas/alteradas (esta inclusive) no histórico. None = sem card Trends."""
+    if config.getoption("--no-history"):
+        return None
+    path = Path(config.getoption("--history-db"))
+    try:
+        t0 = time.perf_counter()
+        with History(path) as history:
+            n = history.ingest_dir(SESSION_DIR.parent)
+        LOG.info(f"[HISTORY] {n} session(s) ingested into {path} in {time.perf_counter() - t0:.2f}s")
+    except sqlite3.Error as exc:
+        LOG.warning(f"[HISTORY] could not update {path}: {exc}")
+        return None
+    return path
+
 
 @pytest.hookimpl(trylast=True)
 def pytest_sessionfinish(session, exitstatus):
     """Gera dashboard e session_summary.json dentro do paizinho."""
+    # barreira: artefatos em background precisam estar no disco (e no report) antes do summary
+    if ARTIFACTS is not None:
+        ARTIFACTS.close()
+    if SHARED_API_CLIENT is not None:
+        SHARED_API_CLIENT.session.close()
+    if CASSETTE is not None:
+        stats = CASSETTE.close()
+        stats["stale_tests"] = CASSETTE.stale()
+        LOG.info(f"[CASSETTE] {stats}")
+        _update_session_meta({"cassette": {WORKER_ID or "main": stats}})
+    if FAKE_API is not None:
+        FAKE_API.stop()
+        _update_session_meta({"fake_api": {WORKER_ID or "main": FAKE_API.stats()}})
+
+    if WORKER_ID:
+        # worker: só fecha o próprio journal; o controller lê todos
+        R.close_journal(exitstatus)
+        LOG.info(f"=== Pytest worker {WORKER_ID} FINISHED (journal closed) ===")
+        return
+
+    if _check_latency(session.config) and session.exitstatus == pytest.ExitCode.OK:
+        session.exitstatus = exitstatus = pytest.ExitCode.TESTS_FAILED
+    R.close_journal(exitstatus)
     R.write_session_summary(SESSION_DIR, exitstatus)
+    history_db = _ingest_history(session.config)
 
     if OPEN_DASHBOARD:
-        R.write_and_open_dashboard(SESSION_DIR)
+        R.write_and_open_dashboard(SESSION_DIR, history_db)
         LOG.info("[DASHBOARD] auto-open enabled → abrindo no navegador...")
     else:
-        R.write_dashboard(SESSION_DIR)
+        R.write_dashboard(SESSION_DIR, history_db)
         LOG.info("[DASHBOARD] auto-open desativado → apenas gerado no diretório")
 
     LOG.info(f"=== Pytest session FINISHED (exitstatus={exitstatus}) ===")
@@ -215,13 +970,160 @@ def pytest_sessionfinish(session, exitstatus):
         LOG.info("Session log: (não gravado em arquivo — SAVE_EXEC_LOGS=False)")
 
 
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """Testes `async def`: um event loop por teste (clientes async fechados no fim)."""
+    if not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return None
+    funcargs = pyfuncitem.funcargs
+    kwargs = {name: funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+    run_async(pyfuncitem.obj(**kwargs))
+    return True
+
+
+# --load: fixtures que os fluxos podem pedir (montadas por iteração em _load_prepare)
+LOAD_ARGS = (
+    "api_client", "async_api_client", "base_api_url", "json_data", "pytestconfig", "new_user_token",
+    "resource_tracker", "cleanup_wishlists", "cleanup_products", "cleanup_users",
+)
+
+
+def _load_flows(items) -> list:
+    flows = []
+    for item in items:
+        marker = item.get_closest_marker("load")
+        if marker is None or not isinstance(item, pytest.Function):
+            continue
+        argnames = tuple(item._fixtureinfo.argnames)
+        params = getattr(getattr(item, "callspec", None), "params", {})
+        missing = [a for a in argnames if a not in LOAD_ARGS and a not in params]
+        if missing:
+            raise pytest.UsageError(f"--load: {item.nodeid} uses unsupported fixture(s) {missing}")
+        weight = marker.kwargs.get("weight", marker.args[0] if marker.args else 1)
+        flows.append(Flow(item.name, item.obj, weight, argnames, params))
+    return flows
+
+
+def _load_prepare(config, api_session, pool: UserPool, base_url: str, json_data: dict):
+    """prepare(flow, recorder) do LoadRunner: argumentos de uma iteração + teardown (limpeza e devolução de usuários)."""
+    timeout = config.getoption("--api-timeout")
+    cleanup_client = ApiClient(api_session, timeout=timeout)  # DELETEs da limpeza fora das latências
+
+    def _prepare(flow, recorder):
+        client = ApiClient(api_session, timeout=timeout)
+        tracker = ResourceTracker(owner=flow.name, logger=None)
+        client.listeners.extend([recorder.on_response, tracker.on_response])
+        leased = []
+
+        def _lease() -> str:
+            user = pool.lease()
+            leased.append(user)
+            return client.set_token(user.token)
+
+        available = {
+            "api_client": client,
+            "base_api_url": base_url,
+            "json_data": json_data,
+            "pytestconfig": config,
+            "new_user_token": _lease,
+            "resource_tracker": tracker,
+            "cleanup_wishlists": None,
+            "cleanup_products": None,
+            "cleanup_users": None,
+        }
+        if "async_api_client" in flow.argnames:
+            available["async_api_client"] = AsyncApiClient(
+                base_url=base_url, timeout=timeout, pool_size=config.getoption("--api-pool-size"),
+                retries=config.getoption("--api-retries"), headers=client.headers, listeners=client.listeners,
+            )
+        kwargs = {name: flow.params[name] if name in flow.params else available[name] for name in flow.argnames}
+
+        def _teardown() -> None:
+            try:
+                tracker.cleanup(cleanup_client, workers=1)
+            finally:
+                for user in leased:
+                    pool.release(user)
+
+        return kwargs, _teardown
+
+    return _prepare
+
+
+def _run_load(session) -> dict:
+    config = session.config
+    flows = _load_flows(session.items)
+    users = max(1, config.getoption("--load-users"))
+    api_session = build_session(pool_size=max(users, config.getoption("--api-pool-size")),
+                                retries=config.getoption("--api-retries"))
+    base_url = _api_base_url(config)
+    json_path = Path(config.rootpath) / "data" / "testing.json"
+    json_data = json.loads(json_path.read_text(encoding="utf-8"))
+    pool = UserPool(ApiClient(api_session, timeout=config.getoption("--api-timeout")), base_url,
+                    size=users, owner=f"load-{WORKER_ID or 'main'}", logger=LOG)
+    pool.release(pool.lease())  # cadastra os `users` usuários antes da carga começar
+    runner = LoadRunner(
+        flows,
+        _load_prepare(config, api_session, pool, base_url, json_data),
+        users=users,
+        duration_s=config.getoption("--load-duration"),
+        iterations=config.getoption("--load-iterations"),
+        ramp_up_s=config.getoption("--load-ramp-up"),
+        run_coroutine=run_async,
+        logger=LOG,
+    )
+    try:
+        # os cenários dão print() a cada passo: em carga isso só afoga o terminal
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            report = runner.run()
+    finally:
+        stats = pool.close()
+        api_session.close()
+    report["user_pool"] = stats
+    return report
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtestloop(session):
+    """--load: em vez de rodar cada teste uma vez, roda os fluxos @pytest.mark.load como carga."""
+    global LOAD_REPORT
+    if not session.config.getoption("--load") or session.config.option.collectonly:
+        return None
+    if not session.items:
+        raise pytest.UsageError("--load: no test marked with @pytest.mark.load was selected")
+    LOAD_REPORT = _run_load(session)
+    (SESSION_DIR / "load_report.json").write_text(json.dumps(LOAD_REPORT, indent=2), encoding="utf-8")
+    R.set_load_report(LOAD_REPORT)
+    LOG.info(f"[LOAD] {LOAD_REPORT['iterations']} iteration(s), {LOAD_REPORT['failures']} failed, "
+             f"{LOAD_REPORT['rps']} req/s → {SESSION_DIR / 'load_report.json'}")
+    session.testsfailed = LOAD_REPORT["failures"]
+    return True
+
+
 @pytest.hookimpl(tryfirst=True)
 def pytest_runtest_setup(item):
-    """Numera os testes pela ordem REAL de execução."""
+    """
+    Numera os testes pela ordem REAL de execução (global entre workers).
+    Com --browser-lanes as lanes correm em paralelo: usa a ordem de coleta para
+    que numeração e diretórios de artefatos sejam determinísticos.
+    """
     global TEST_COUNTER
-    TEST_COUNTER += 1
-    item._exec_index = TEST_COUNTER
+    TEST_COUNTER = EXEC_COUNTER.next()
+    if _lanes_enabled(item.config):
+        item._exec_index = getattr(item, "_collection_index", TEST_COUNTER)
+    else:
+        item._exec_index = TEST_COUNTER
     LOG.info(f"=== START test {item._exec_index:03d}: {item.nodeid} ===")
+    if _cassette(item.config) is not None:
+        # requisições do setup/teste/teardown ficam no escopo do teste
+        stale = CASSETTE.begin(item.nodeid, _test_fingerprint(item))
+        if stale:
+            LOG.warning(f"[CASSETTE] {item.nodeid}: stale ({stale})")
+
+
+def pytest_runtest_logfinish(nodeid, location):
+    if CASSETTE is not None:
+        CASSETTE.end()
 
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
@@ -231,6 +1133,7 @@ def pytest_runtest_makereport(item, call):
     rep = outcome.get_result()
 
     setattr(item, f"rep_{rep.when}", rep)
+    R.record_phase(item, rep)
 
     should_create_dir = (rep.when == "call") or (rep.when == "setup" and rep.failed)
     if should_create_dir:
@@ -265,54 +1168,163 @@ def pytest_runtest_makereport(item, call):
         if test_dir:
             driver = item.funcargs.get("driver")
             if driver:
-                shot_name = f"screenshot_{_sanitize(item.name)}.png"
-                shot_path = test_dir / shot_name
-                driver.get_screenshot_as_file(str(shot_path))
-                LOG.info(f"[ARTIFACT] screenshot -> {shot_path}")
-                R.add_screenshot(item, _rel_to_session(shot_path))
-                _write_test_log_line(test_dir, f"ARTIFACT screenshot: {shot_name}")
+                shot_path = test_dir / f"screenshot_{_sanitize(item.name)}.png"
+                _save_artifact(item, "screenshot", shot_path, driver.get_screenshot_as_base64())
 
 
 # ==========================================================
 # FIXTURE PARA TESTES MOBILE (APPIUM)
 # ==========================================================
+APPIUM_CAPABILITIES = {
+    "platformName": "Android",
+    "deviceName": "emulator-5554",
+    "automationName": "UiAutomator2",
+    "appPackage": "com.b2w.americanas",
+    "noReset": False,
+    "fullReset": False,
+    "appWaitActivity": "com.b2w.americanas.MainActivity",
+    "appWaitDuration": 30000,
+    "unicodeKeyboard": True,
+    "resetKeyboard": True,
+    "autoGrantPermissions": True,
+}
+
+
+def _merge_meta(dst: dict, src: dict) -> dict:
+    """Merge recursivo: dicts são combinados, listas viram união (ordem preservada)."""
+    for key, value in src.items():
+        if isinstance(value, dict) and isinstance(dst.get(key), dict):
+            _merge_meta(dst[key], value)
+        elif isinstance(value, list) and isinstance(dst.get(key), list):
+            dst[key] = dst[key] + [v for v in value if v not in dst[key]]
+        else:
+            dst[key] = value
+    return dst
+
+
+def _update_session_meta(extra: dict) -> None:
+    """Atualiza session_meta.json (com lock: vários workers escrevem no mesmo arquivo)."""
+    meta_path = SESSION_DIR / "session_meta.json"
+    with file_lock(SESSION_DIR / ".session_meta.lock"):
+        meta = {}
+        if meta_path.exists():
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            except Exception:
+                meta = {}
+        if "appium_reuse" in extra:
+            extra = dict(extra, appium_reuse=merge_stats(meta.pop("appium_reuse", {}), extra["appium_reuse"]))
+        _merge_meta(meta, extra)
+        meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+
+@pytest.fixture(scope="session")
+def device_registry(request):
+    """Devices disponíveis p/ este processo (lease compartilhado entre workers)."""
+    devices = parse_devices(request.config.getoption("--devices")) or [
+        {"udid": APPIUM_CAPABILITIES["deviceName"], "url": APPIUM_URL}
+    ]
+    registry = DeviceRegistry(
+        devices, SESSION_DIR / "device_leases", owner=WORKER_ID or "main", logger=LOG
+    )
+    yield registry
+    registry.release_all()
+
+
+@pytest.fixture(scope="session")
+def appium_sessions(request):
+    """Sessões Appium reaproveitadas por device (somente com --appium-reuse)."""
+    if not request.config.getoption("--appium-reuse"):
+        yield None
+        return
+    managers = {}
+    yield managers
+    for udid, manager in managers.items():
+        stats = manager.stats()
+        LOG.info(f"[DRIVER] reuse stats ({udid}): {stats}")
+        _update_session_meta({"appium_reuse": stats})
+        manager.close()
+
+
+def _video_options(config) -> dict:
+    return recording_options(
+        time_limit=config.getoption("--video-time-limit"),
+        bit_rate=config.getoption("--video-bitrate"),
+        video_size=config.getoption("--video-size"),
+    )
+
+
 @pytest.fixture(scope="function")
-def driver(request):
-    options = AppiumOptions()
-    options.load_capabilities(
+def driver(request, device_registry, appium_sessions):
+    try:
+        if request.config.getoption("--device-lease") == "test":
+            device = device_registry.lease()
+        else:
+            device = device_registry.lease_for_worker()
+    except RuntimeError as e:
+        LOG.error(f"[DEVICES] {e}")
+        pytest.skip(f"No Appium device available: {e}")
+
+    caps = build_capabilities(APPIUM_CAPABILITIES, device)
+    R.add_meta(request.node, "device", device["udid"])
+    _update_session_meta(
         {
-            "platformName": "Android",
-            "deviceName": "emulator-5554",
-            "automationName": "UiAutomator2",
-            "appPackage": "com.b2w.americanas",
-            "noReset": False,
-            "fullReset": False,
-            "appWaitActivity": "com.b2w.americanas.MainActivity",
-            "appWaitDuration": 30000,
-            "unicodeKeyboard": True,
-            "resetKeyboard": True,
-            "autoGrantPermissions": True,
+            "devices": {
+                device["udid"]: {
+                    "url": device["url"],
+                    **{k: device[k] for k in ("systemPort", "mjpegServerPort", "chromedriverPort") if k in device},
+                    "workers": [WORKER_ID or "main"],
+                }
+            }
         }
     )
-    try:
-        _driver = appwd.Remote("http://127.0.0.1:4723", options=options)
-        if SAVE_ARTIFACTS:
-            _driver.start_recording_screen()
-
-        meta = {
-            "session_id": getattr(_driver, "session_id", ""),
-            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "capabilities": getattr(_driver, "capabilities", {}) or {},
-        }
-        (SESSION_DIR / "session_meta.json").write_text(
-            json.dumps(meta, indent=2), encoding="utf-8"
-        )
 
-        LOG.info(f"[DRIVER] session started: {getattr(_driver, 'session_id', 'n/a')}")
+    try:
+        if appium_sessions is not None:
+            manager = appium_sessions.get(device["udid"])
+            if manager is None:
+                manager = appium_sessions[device["udid"]] = AppiumSessionManager(
+                    device["url"],
+                    caps,
+                    reset_strategy=request.config.getoption("--app-reset"),
+                    logger=LOG,
+                )
+            _driver, created = manager.acquire()
+            R.record_timing(request.node, "session_create", manager.last_create_s)
+            R.record_timing(request.node, "app_reset", manager.last_reset_s)
+        else:
+            t0 = time.perf_counter()
+            _driver = create_appium_driver(device["url"], caps)
+            R.record_timing(request.node, "session_create", time.perf_counter() - t0)
+            created = True
+
+        recording = SAVE_ARTIFACTS and should_record(request.config.getoption("--video"), request.node)
+        if recording:
+            # forceRestart: numa sessão reaproveitada cada teste tem o próprio vídeo
+            t0 = time.perf_counter()
+            try:
+                _driver.start_recording_screen(**_video_options(request.config))
+            except Exception as e:
+                LOG.warning(f"[DRIVER] screen recording not started: {type(e).__name__}: {e}")
+                recording = False
+            video_overhead = time.perf_counter() - t0
+
+        if created:
+            _update_session_meta(
+                {
+                    "session_id": getattr(_driver, "session_id", ""),
+                    "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "capabilities": getattr(_driver, "capabilities", {}) or {},
+                }
+            )
+            LOG.info(
+                f"[DRIVER] session started on {device['udid']}: {getattr(_driver, 'session_id', 'n/a')}"
+            )
     except Exception as e:
+        device_registry.release(device)
         LOG.error(f"[DRIVER] failed to create Appium driver: {type(e).__name__}: {e}")
         LOG.error(
-            "Dica: verifique se o Appium Server está on em http://127.0.0.1:4723 e se o emulator-5554 está rodando (adb devices)."
+            f"Dica: verifique se o Appium Server está on em {device['url']} e se o {device['udid']} está rodando (adb devices)."
         )
         pytest.skip(f"Failed to create Appium driver: {e}")
 
@@ -324,34 +1336,64 @@ def driver(request):
         failed = (rep_call and rep_call.failed) or (rep_setup and rep_setup.failed)
         test_dir = NODEID_TO_TESTDIR.get(request.node.nodeid)
 
-        if failed and test_dir and SAVE_ARTIFACTS:
-            vid_name = f"video_{_sanitize(request.node.name)}.mp4"
-            video_path = test_dir / vid_name
-            data = None
+        if recording:
+            t0 = time.perf_counter()
             try:
                 data = _driver.stop_recording_screen()
             except Exception:
                 data = None
-            if data:
-                video_path.write_bytes(base64.b64decode(data))
-                LOG.info(f"[ARTIFACT] video -> {video_path}")
-                R.add_video(request.node, _rel_to_session(video_path))
-                _write_test_log_line(test_dir, f"ARTIFACT video: {vid_name}")
-        else:
-            try:
-                _ = _driver.stop_recording_screen()
-            except Exception:
-                pass
+            video_overhead += time.perf_counter() - t0
+            R.record_timing(request.node, "video_overhead", video_overhead)
+            if data and failed and test_dir:
+                # decode + escrita do vídeo ficam com o writer em background
+                video_path = test_dir / f"video_{_sanitize(request.node.name)}.mp4"
+                _save_artifact(request.node, "video", video_path, data)
     finally:
-        LOG.info("[DRIVER] quitting session")
-        _driver.quit()
+        if appium_sessions is None:
+            LOG.info("[DRIVER] quitting session")
+            _driver.quit()
+        device_registry.release(device)
 
 
 # ==========================================================
 # FIXTURE PARA TESTES WEB (SELENIUM) — Chrome / Firefox
 # ==========================================================
+def _create_browser(browser_name: str, notif_mode: str, services: DriverResolver, fast: bool = False):
+    """Abre um Chrome/Firefox novo com a política de notificações pedida."""
+    # 👉 driver resolvido 1x por sessão (cache local → webdriver_manager)
+    drv = create_browser(browser_name, notif_mode, services.service(browser_name), fast=fast)
+    LOG.info(
+        f"[WEB] Browser session started ({browser_name}). notifications={notif_mode}"
+        f"{' profile=fast' if fast else ''}"
+    )
+    return drv
+
+
+@pytest.fixture(scope="session")
+def driver_services(request):
+    """Resolve chromedriver/geckodriver uma vez por sessão e entrega os Services."""
+    offline = request.config.getoption("--offline-drivers") or None
+    return DriverResolver(offline=offline, logger=LOG)
+
+
+@pytest.fixture(scope="session")
+def browser_pool(request, driver_services):
+    """Pool de navegadores da sessão (somente com --browser-pool)."""
+    if not request.config.getoption("--browser-pool"):
+        yield None
+        return
+    fast = request.config.getoption("--fast-profile")
+    pool = BrowserPool(
+        lambda name, notif: _create_browser(name, notif, driver_services, fast=fast), logger=LOG,
+        home_origins=WEB_HOME_ORIGINS,
+    )
+    yield pool
+    LOG.info("[WEB] Closing browser pool.")
+    pool.close()
+
+
 @pytest.fixture(scope="function")
-def browser(request):
+def browser(request, browser_pool, driver_services):
     """Inicializa Chrome ou Firefox para testes WEB e integra ao dashboard."""
     # prioridade: param indireto > --browser > env BROWSER > 'chrome'
     browser_name = getattr(request, "param", None)
@@ -363,36 +1405,18 @@ def browser(request):
         browser_name = str(browser_name).lower()
 
     notif_mode = (request.config.getoption("--notif") or "allow").lower()
-    notif_map = {"allow": 1, "block": 2, "ask": 0}
-    notif_value = notif_map.get(notif_mode, 1)
-
-    if browser_name == "firefox":
-        opts = FFOptions()
-        opts.set_preference("permissions.default.desktop-notification", notif_value)
-        opts.set_preference("permissions.default.geo", notif_value)
-        opts.set_preference("dom.webnotifications.enabled", True)
-        opts.set_preference("dom.push.enabled", True)
-
-        service = FirefoxService(GeckoDriverManager().install())
-        drv = swd.Firefox(service=service, options=opts)
-        drv.set_window_size(1920, 1080)
+    R.add_meta(request.node, "browser", browser_name)
+
+    if browser_pool is not None:
+        drv = browser_pool.acquire(browser_name, notif_mode)
     else:
-        # default: chrome
-        opts = ChromeOptions()
-        opts.add_argument("--window-size=1920,1080")
-        opts.add_experimental_option(
-            "prefs",
-            {"profile.default_content_setting_values.notifications": notif_value},
+        drv = _create_browser(
+            browser_name,
+            notif_mode,
+            driver_services,
+            fast=request.config.getoption("--fast-profile"),
         )
 
-        # 👉 usando ChromeDriverManager (funciona no Mac e no Jenkins)
-        service = ChromeService(ChromeDriverManager().install())
-        drv = swd.Chrome(service=service, options=opts)
-
-    LOG.info(
-        f"[WEB] Browser session started ({browser_name}). notifications={notif_mode}"
-    )
-
     yield drv
 
     try:
@@ -402,29 +1426,118 @@ def browser(request):
         test_dir = NODEID_TO_TESTDIR.get(request.node.nodeid)
 
         if failed and test_dir and SAVE_ARTIFACTS:
-            shot_name = f"screenshot_{_sanitize(request.node.name)}.png"
-            shot_path = test_dir / shot_name
-            drv.save_screenshot(str(shot_path))
-            LOG.info(f"[WEB ARTIFACT] screenshot -> {shot_path}")
-            R.add_screenshot(request.node, _rel_to_session(shot_path))
-            _write_test_log_line(test_dir, f"ARTIFACT screenshot: {shot_name}")
+            shot_path = test_dir / f"screenshot_{_sanitize(request.node.name)}.png"
+            _save_artifact(request.node, "screenshot", shot_path, drv.get_screenshot_as_base64())
     finally:
-        LOG.info("[WEB] Quitting browser.")
-        drv.quit()
+        if browser_pool is not None:
+            LOG.info("[WEB] Returning browser to pool.")
+            browser_pool.release(browser_name, notif_mode, drv)
+        else:
+            LOG.info("[WEB] Quitting browser.")
+            drv.quit()
 
 # ==========================================================
 # Fixtures auxiliares para APIs
 # ==========================================================
 @pytest.fixture(scope="session")
-def base_api_url():
-    """Base URL da sua API local."""
-    return "http://127.0.0.1:8000"
+def base_api_url(pytestconfig):
+    """Base URL da API: a local (live) ou a fake em processo (--api-backend memory/sqlite)."""
+    return _api_base_url(pytestconfig)
+
+
+@pytest.fixture(scope="session")
+def api_session(request):
+    """requests.Session compartilhado (pool de conexões keep-alive + retry)."""
+    session = build_session(
+        pool_size=request.config.getoption("--api-pool-size"),
+        retries=request.config.getoption("--api-retries"),
+        cassette=_cassette(request.config),
+    )
+    yield session
+    session.close()
 
 
 @pytest.fixture(scope="function")
-def api_client():
-    """Cliente HTTP para testes de API (requests)."""
-    return requests
+def api_client(request, api_session):
+    """Cliente HTTP do teste (get/post/put/delete/patch); token e headers não vazam entre testes."""
+    client = ApiClient(api_session, timeout=request.config.getoption("--api-timeout"))
+    timings = RequestTimings()
+    client.listeners.append(timings.on_response)
+    yield client
+    api_session.cookies.clear()
+    if len(timings):
+        # histograma por endpoint/status do teste (somado no fim da sessão, ver _check_latency)
+        R.add_meta(request.node, "latency", timings.to_dict())
+
+
+@pytest.fixture(scope="function")
+def async_api_client(request, api_client, base_api_url):
+    """
+    Cliente httpx assíncrono p/ testes `async def` (fan-out com gather/fan_out).
+    Mesmo base_url, headers, timeout/pool/retries e listeners do api_client.
+    """
+    return AsyncApiClient(
+        base_url=base_api_url,
+        timeout=request.config.getoption("--api-timeout"),
+        pool_size=request.config.getoption("--api-pool-size"),
+        retries=request.config.getoption("--api-retries"),
+        headers=api_client.headers,
+        listeners=api_client.listeners,
+        cassette=CASSETTE,
+    )
+
+
+@pytest.fixture(scope="session")
+def user_pool(request, api_session, base_api_url):
+    """Usuários pré-cadastrados (em lote, no primeiro uso) emprestados aos testes."""
+    pool = UserPool(
+        ApiClient(api_session, timeout=request.config.getoption("--api-timeout")),
+        base_api_url,
+        size=request.config.getoption("--user-pool-size"),
+        owner=WORKER_ID or "main",
+        logger=LOG,
+        # replay: token gravado nunca "expira" (o exp é do relógio da gravação; 401 ainda renova)
+        check_token_exp=request.config.getoption("--cassette") != "replay",
+    )
+    yield pool
+    stats = pool.close()
+    if stats.get("leases"):
+        _update_session_meta({"user_pool": {WORKER_ID or "main": stats}})
+
+
+@pytest.fixture
+def new_user_token(api_client, user_pool):
+    """
+    new_user_token() → token de um usuário limpo do pool (sem wishlists).
+    Pode ser chamada mais de uma vez no teste (ex.: cenários com 2 usuários);
+    o último token fica em api_client.last_token para os cleanups.
+    """
+    leased = []
+
+    def _lease() -> str:
+        user = user_pool.lease()
+        leased.append(user)
+        return api_client.set_token(user.token)
+
+    yield _lease
+    for user in leased:
+        user_pool.release(user)
+
+
+@pytest.fixture(scope="session")
+def wishlist_catalog(request):
+    """
+    Produtos da wishlist projeto_final (usuário padrão), buscados uma vez por
+    processo e reaproveitados por todas as parametrizações:
+      wishlist_catalog.products() / .token() / .invalidate()
+    Na primeira vez já dispara a busca em background: declarada antes de
+    `browser`/`driver` na assinatura, a leitura corre junto com o setup deles.
+    """
+    catalog = _wishlist_catalog(request.config)
+    catalog.prefetch()
+    yield catalog
+    if catalog.fetches:
+        _update_session_meta({"wishlist_catalog": {WORKER_ID or "main": catalog.stats()}})
 
 
 @pytest.fixture(scope="session")
@@ -440,89 +1553,59 @@ def json_data(pytestconfig):
         return json.load(f)
 
 
+@pytest.fixture(scope="session")
+def session_tracker(request, api_session):
+    """--cleanup=deferred: recursos de todos os testes, apagados de uma vez no fim da sessão."""
+    tracker = ResourceTracker(owner="session", logger=LOG)
+    yield tracker
+    if len(tracker):
+        client = ApiClient(api_session, timeout=request.config.getoption("--api-timeout"))
+        total = len(tracker)
+        failures = tracker.cleanup(client, workers=request.config.getoption("--cleanup-workers"))
+        LOG.info(f"[CLEANUP] deferred: {total} resource(s) cleaned up at session end, {len(failures)} failed")
+        for nodeid, items in group_by_owner(failures).items():
+            R.add_cleanup_failures(nodeid, items)
+
+
 @pytest.fixture
-def cleanup_wishlists(api_client, base_api_url):
-    """
-    Limpa todas as wishlists do usuário autenticado após o teste.
-    """
-    yield
-    url = f"{base_api_url}/wishlists"
-    token = getattr(api_client, "last_token", None)
-    if token:
-        headers = {"Authorization": f"Bearer {token}"}
-        resp = api_client.get(url, headers=headers)
-        if resp.status_code == 200:
-            for w in resp.json():
-                wid = w.get("id")
-                if wid:
-                    api_client.delete(f"{url}/{wid}", headers=headers)
+def resource_tracker(request, api_client):
+    """Registra o que o api_client cria (wishlists/produtos/usuários) durante o teste."""
+    tracker = ResourceTracker(owner=request.node.nodeid, logger=LOG)
+    api_client.listeners.append(tracker.on_response)
+    yield tracker
+    api_client.listeners.remove(tracker.on_response)
+
+
+def _cleanup_tracked(request, api_client, tracker: ResourceTracker, session_tracker, kinds) -> None:
+    if request.config.getoption("--cleanup") == "deferred":
+        session_tracker.absorb(tracker, kinds)
+        return
+    failures = tracker.cleanup(api_client, kinds, workers=request.config.getoption("--cleanup-workers"))
+    R.add_cleanup_failures(request.node.nodeid, failures)
 
 
 @pytest.fixture
-def cleanup_products(api_client, base_api_url):
-    """
-    Limpa todos os produtos de todas as wishlists do usuário autenticado após o teste.
-    """
+def cleanup_wishlists(request, api_client, resource_tracker, session_tracker):
+    """Apaga as wishlists (e produtos) criadas pelo teste."""
     yield
-    base_wishlist_url = f"{base_api_url}/wishlists"
-    token = getattr(api_client, "last_token", None)
-    if not token:
-        return
-    headers = {"Authorization": f"Bearer {token}"}
+    _cleanup_tracked(request, api_client, resource_tracker, session_tracker, ("product", "wishlist"))
 
-    w_resp = api_client.get(base_wishlist_url, headers=headers)
-    if w_resp.status_code != 200:
-        return
 
-    for wishlist in w_resp.json():
-        wid = wishlist.get("id")
-        if not wid:
-            continue
-        p_resp = api_client.get(f"{base_wishlist_url}/{wid}/products", headers=headers)
-        if p_resp.status_code == 200:
-            for product in p_resp.json():
-                pid = product.get("id")
-                if pid:
-                    api_client.delete(f"{base_api_url}/products/{pid}", headers=headers)
+@pytest.fixture
+def cleanup_products(request, api_client, resource_tracker, session_tracker):
+    """Apaga os produtos criados pelo teste."""
+    yield
+    _cleanup_tracked(request, api_client, resource_tracker, session_tracker, ("product",))
 
 
 @pytest.fixture
-def cleanup_users(api_client, base_api_url):
+def cleanup_users(request, api_client, resource_tracker, session_tracker):
     """
-    Limpa todos os dados associados ao usuário autenticado:
+    Apaga tudo que o teste criou, na ordem de dependência:
     - produtos
     - wishlists
-    - o próprio usuário (opcional)
+    - usuários cadastrados pelo teste (se a API tiver DELETE /users/me)
+    Usuários do pool (new_user_token) não são rastreados: o pool os limpa no próximo lease.
     """
     yield
-    token = getattr(api_client, "last_token", None)
-    if not token:
-        return
-
-    headers = {"Authorization": f"Bearer {token}"}
-
-    # 1. Apagar produtos dentro de cada wishlist
-    wl_resp = api_client.get(f"{base_api_url}/wishlists", headers=headers)
-    if wl_resp.status_code == 200:
-        for w in wl_resp.json() or []:
-            wid = w.get("id")
-            if not wid:
-                continue
-            prod_resp = api_client.get(
-                f"{base_api_url}/wishlists/{wid}/products", headers=headers
-            )
-            if prod_resp.status_code == 200:
-                for p in prod_resp.json() or []:
-                    pid = p.get("id")
-                    if pid:
-                        api_client.delete(
-                            f"{base_api_url}/products/{pid}", headers=headers
-                        )
-
-            api_client.delete(f"{base_api_url}/wishlists/{wid}", headers=headers)
-
-    # 2. Apagar o próprio usuário (se a API tiver esse endpoint)
-    try:
-        api_client.delete(f"{base_api_url}/users/me", headers=headers)
-    except Exception:
-        pass
+    _cleanup_tracked(request, api_client, resource_tracker, session_tracker, CLEANUP_ORDER)
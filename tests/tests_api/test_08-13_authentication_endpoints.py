@@ -21,6 +21,7 @@ def generate_unique_email_from_username(username):
 #   - The API should respond with a `200 OK` status code.
 #   - The response body should contain the user's data, including their ID and the email they registered with, but not the password.
 @pytest.mark.api
+@pytest.mark.load(weight=1)
 def test_register_success(
     api_client, base_api_url, json_data, pytestconfig, cleanup_users
 ):
@@ -129,6 +130,7 @@ def test_register_invalid_data(api_client, base_api_url, json_data, cleanup_user
 #   - The API should respond with a `200 OK` status code.
 #   - The response body should contain an `access_token` (JWT) and a `token_type` of "bearer".
 @pytest.mark.api
+@pytest.mark.load(weight=2)
 def test_login_valid_credentials(api_client, base_api_url, json_data, cleanup_users):
     url_register = f"{base_api_url}/auth/register"
     user = json_data["api"]["user"]
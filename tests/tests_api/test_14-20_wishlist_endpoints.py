@@ -1,30 +1,5 @@
-import time
 import pytest
 
-# helpers
-def get_token_from_new_user(api_client, base_api_url):
-    username = f"test_user_{int(time.time() * 1000)}"
-    email = f"{username}@example.com"
-    password = "password123"
-
-    reg_url = f"{base_api_url}/auth/register"
-    reg_payload = {"username": username, "email": email, "password": password}
-    reg_resp = api_client.post(reg_url, json=reg_payload)
-    assert reg_resp.status_code == 200, f"Failed to register: {reg_resp.text}"
-
-    login_url = f"{base_api_url}/auth/login"
-    login_payload = {"email": email, "password": password}
-    login_resp = api_client.post(login_url, json=login_payload)
-    assert login_resp.status_code in (200, 201), f"Failed to login: {login_resp.text}"
-
-    token = login_resp.json().get("access_token")
-    assert token, "Token not returned by the API"
-
-    # cleanups
-    api_client.last_token = token
-
-    return token
-
 # # Test Cases for Wishlist Endpoints
 
 # ### Endpoint: POST /wishlists
@@ -39,8 +14,9 @@ def get_token_from_new_user(api_client, base_api_url):
 #   - The API should respond with a `200 OK` status code.
 #   - The response body should contain the newly created wishlist object, including its `id`, `name`, and the `owner_id`.
 @pytest.mark.api
-def test_wishlist_create_success(api_client, base_api_url, json_data, cleanup_users):
-    login_token = get_token_from_new_user(api_client, base_api_url)
+@pytest.mark.load(weight=2)
+def test_wishlist_create_success(api_client, base_api_url, json_data, cleanup_users, new_user_token):
+    login_token = new_user_token()
     headers = {"Authorization": f"Bearer {login_token}"}
     url_wishlists = f"{base_api_url}/wishlists"
     payload_wishlists = {
@@ -68,9 +44,9 @@ def test_wishlist_create_success(api_client, base_api_url, json_data, cleanup_us
 #   - A new wishlist should not be created with a different `id`.
 @pytest.mark.api
 def test_wishlist_create_duplicate_name(
-    api_client, base_api_url, json_data, cleanup_users
+    api_client, base_api_url, json_data, cleanup_users, new_user_token
 ):
-    login_token = get_token_from_new_user(api_client, base_api_url)
+    login_token = new_user_token()
     headers = {"Authorization": f"Bearer {login_token}"}
     url_wishlists = f"{base_api_url}/wishlists"
     payload_wishlists = {"name": "Society Sneakers"}
@@ -121,9 +97,9 @@ def test_wishlist_create_unauthenticated(
 #   - The response should detail the validation error (e.g., "field required").
 @pytest.mark.api
 def test_wishlist_create_invalid_data(
-    api_client, base_api_url, json_data, cleanup_users
+    api_client, base_api_url, json_data, cleanup_users, new_user_token
 ):
-    login_token = get_token_from_new_user(api_client, base_api_url)
+    login_token = new_user_token()
     headers = {"Authorization": f"Bearer {login_token}"}
 
     url_wishlists = f"{base_api_url}/wishlists"
@@ -151,8 +127,9 @@ def test_wishlist_create_invalid_data(
 #   - The API should respond with a `200 OK` status code.
 #   - The response body should be a JSON array containing all wishlists owned by the user.
 @pytest.mark.api
-def test_wishlists_get_all_success(api_client, base_api_url, json_data, cleanup_users):
-    login_token = get_token_from_new_user(api_client, base_api_url)
+@pytest.mark.load(weight=3)
+def test_wishlists_get_all_success(api_client, base_api_url, json_data, cleanup_users, new_user_token):
+    login_token = new_user_token()
     headers = {"Authorization": f"Bearer {login_token}"}
     url_wishlists = f"{base_api_url}/wishlists"
     payload_wishlists1 = {"name": "Society Sneakers"}
@@ -192,8 +169,8 @@ def test_wishlists_get_all_success(api_client, base_api_url, json_data, cleanup_
 #   - The API should respond with a `200 OK` status code.
 #   - The response body should be an empty JSON array [].
 @pytest.mark.api
-def test_wishlists_get_empty(api_client, base_api_url, json_data, cleanup_users):
-    login_token = get_token_from_new_user(api_client, base_api_url)
+def test_wishlists_get_empty(api_client, base_api_url, json_data, cleanup_users, new_user_token):
+    login_token = new_user_token()
     headers = {"Authorization": f"Bearer {login_token}"}
     url_wishlists = f"{base_api_url}/wishlists"
 
@@ -1,31 +1,6 @@
-import time
 import pytest
 
 # helpers
-def get_token_from_new_user(api_client, base_api_url):
-    username = f"test_user_{int(time.time() * 1000)}"
-    email = f"{username}@example.com"
-    password = "password123"
-
-    reg_url = f"{base_api_url}/auth/register"
-    reg_payload = {"username": username, "email": email, "password": password}
-    reg_resp = api_client.post(reg_url, json=reg_payload)
-    assert reg_resp.status_code == 200, f"Failed to register: {reg_resp.text}"
-
-    login_url = f"{base_api_url}/auth/login"
-    login_payload = {"email": email, "password": password}
-    login_resp = api_client.post(login_url, json=login_payload)
-    assert login_resp.status_code in (200, 201), f"Failed to login: {login_resp.text}"
-
-    token = login_resp.json().get("access_token")
-    assert token, "Token not returned by the API"
-
-    # cleanups
-    api_client.last_token = token
-
-    return token
-
-
 def create_default_wishlist(api_client, base_api_url, token, name):
     headers = {"Authorization": f"Bearer {token}"}
     resp = api_client.post(
@@ -104,8 +79,9 @@ def add_four_products_on_wishlist(api_client, base_api_url, token, wishlist_id):
 #   - The response body should contain the created product object, including its new `id` and the `wishlist_id`.
 #   - The `is_purchased` field should be `false`.
 @pytest.mark.api
-def test_product_add_success(api_client, base_api_url, cleanup_users):
-    token = get_token_from_new_user(api_client, base_api_url)
+@pytest.mark.load(weight=3)
+def test_product_add_success(api_client, base_api_url, cleanup_users, new_user_token):
+    token = new_user_token()
     wishlist_id = create_default_wishlist(api_client, base_api_url, token, "Default Wishlist")
     headers = {"Authorization": f"Bearer {token}"}
 
@@ -138,8 +114,8 @@ def test_product_add_success(api_client, base_api_url, cleanup_users):
 #   - The API should respond with a `404 Not Found` status code.
 #   - The response body should contain an error message like "Wishlist not found".
 @pytest.mark.api
-def test_product_add_nonexistent_wishlist(api_client, base_api_url, cleanup_users):
-    token = get_token_from_new_user(api_client, base_api_url)
+def test_product_add_nonexistent_wishlist(api_client, base_api_url, cleanup_users, new_user_token):
+    token = new_user_token()
     wishlist_id = 9382170397
     headers = {"Authorization": f"Bearer {token}"}
 
@@ -167,13 +143,13 @@ def test_product_add_nonexistent_wishlist(api_client, base_api_url, cleanup_user
 # - **Expected Result:**
 #   - The API should respond with a `404 Not Found` status code (as the wishlist is not found for that specific user).
 @pytest.mark.api
-def test_product_add_other_user_wishlist(api_client, base_api_url, cleanup_users):
-    token_user1 = get_token_from_new_user(api_client, base_api_url)
+def test_product_add_other_user_wishlist(api_client, base_api_url, cleanup_users, new_user_token):
+    token_user1 = new_user_token()
     wishlist_id = create_default_wishlist(
         api_client, base_api_url, token_user1, "User 1 wishlist"
     )
 
-    token_user2 = get_token_from_new_user(api_client, base_api_url)
+    token_user2 = new_user_token()
     headers_user2 = {"Authorization": f"Bearer {token_user2}"}
     url = f"{base_api_url}/wishlists/{wishlist_id}/products"
     payload = {
@@ -200,8 +176,8 @@ def test_product_add_other_user_wishlist(api_client, base_api_url, cleanup_users
 #   - The API should respond with a `422 Unprocessable Entity` status code.
 #   - The response should detail the missing fields.
 @pytest.mark.api
-def test_product_add_incomplete_data(api_client, base_api_url, cleanup_users):
-    token = get_token_from_new_user(api_client, base_api_url)
+def test_product_add_incomplete_data(api_client, base_api_url, cleanup_users, new_user_token):
+    token = new_user_token()
     wishlist_id = create_default_wishlist(
         api_client, base_api_url, token, "Default Wishlist"
     )
@@ -232,8 +208,8 @@ def test_product_add_incomplete_data(api_client, base_api_url, cleanup_users):
 #   - The API should respond with a `200 OK` status code.
 #   - The response body should be a JSON array of product objects belonging to that wishlist.
 @pytest.mark.api
-def test_product_get_all(api_client, base_api_url, cleanup_users):
-    token = get_token_from_new_user(api_client, base_api_url)
+def test_product_get_all(api_client, base_api_url, cleanup_users, new_user_token):
+    token = new_user_token()
     wishlist_id = create_default_wishlist(
         api_client, base_api_url, token, "Default Wishlist"
     )
@@ -286,8 +262,8 @@ def test_product_get_all(api_client, base_api_url, cleanup_users):
 #   - The API should respond with a `200 OK` status code.
 #   - The response body should contain only products whose name contains "iPhone".
 @pytest.mark.api
-def test_product_get_filter_name(api_client, base_api_url, cleanup_users):
-    token = get_token_from_new_user(api_client, base_api_url)
+def test_product_get_filter_name(api_client, base_api_url, cleanup_users, new_user_token):
+    token = new_user_token()
     wishlist_id = create_default_wishlist(
         api_client, base_api_url, token, "Default Wishlist"
     )
@@ -355,8 +331,9 @@ def test_product_get_filter_name(api_client, base_api_url, cleanup_users):
 #   - The API should respond with a `200 OK` status code.
 #   - The response body should only contain products that have been marked as purchased.
 @pytest.mark.api
-def test_product_get_filter_purchased(api_client, base_api_url, cleanup_users):
-    token = get_token_from_new_user(api_client, base_api_url)
+@pytest.mark.load(weight=2)
+def test_product_get_filter_purchased(api_client, base_api_url, cleanup_users, new_user_token):
+    token = new_user_token()
     wishlist_id = create_default_wishlist(
         api_client, base_api_url, token, "Default Wishlist"
     )
@@ -451,8 +428,8 @@ def test_product_get_filter_purchased(api_client, base_api_url, cleanup_users):
 # - **Expected Result:**
 #   - The API should respond with a `404 Not Found` status code.
 @pytest.mark.api
-def test_product_get_other_user(api_client, base_api_url, cleanup_users):
-    token_user1 = get_token_from_new_user(api_client, base_api_url)
+def test_product_get_other_user(api_client, base_api_url, cleanup_users, new_user_token):
+    token_user1 = new_user_token()
     wishlist_id_user1 = create_default_wishlist(
         api_client, base_api_url, token_user1, "Default Wishlist"
     )
@@ -480,7 +457,7 @@ def test_product_get_other_user(api_client, base_api_url, cleanup_users):
     post_resp2 = api_client.post(url_post, headers=headers1, json=payload_product2)
     assert post_resp2.status_code == 200, post_resp2.text
 
-    token_user2 = get_token_from_new_user(api_client, base_api_url)
+    token_user2 = new_user_token()
     headers2 = {"Authorization": f"Bearer {token_user2}"}
 
     url_get = f"{base_api_url}/wishlists/{wishlist_id_user1}/products"
@@ -500,8 +477,9 @@ def test_product_get_other_user(api_client, base_api_url, cleanup_users):
 #   - The API should respond with a `200 OK` status code.
 #   - The response body should contain the full product object with the updated price.
 @pytest.mark.api
-def test_product_update_success(api_client, base_api_url, cleanup_users):
-    token = get_token_from_new_user(api_client, base_api_url)
+@pytest.mark.load(weight=2)
+def test_product_update_success(api_client, base_api_url, cleanup_users, new_user_token):
+    token = new_user_token()
     wishlist_id = create_default_wishlist(
         api_client, base_api_url, token, "Default Wishlist"
     )
@@ -549,8 +527,8 @@ def test_product_update_success(api_client, base_api_url, cleanup_users):
 # - **Expected Result:**
 #   - The API should respond with a `404 Not Found` status code.
 @pytest.mark.api
-def test_product_update_nonexistent(api_client, base_api_url, cleanup_users):
-    token = get_token_from_new_user(api_client, base_api_url)
+def test_product_update_nonexistent(api_client, base_api_url, cleanup_users, new_user_token):
+    token = new_user_token()
     headers = {"Authorization": f"Bearer {token}"}
     unexisting_product_id = 21839621873698127
     url_put_1 = f"{base_api_url}/products/{unexisting_product_id}"
@@ -573,8 +551,8 @@ def test_product_update_nonexistent(api_client, base_api_url, cleanup_users):
 # - **Expected Result:**
 #   - The API should respond with a `404 Not Found` status code.
 @pytest.mark.api
-def test_product_update_other_user(api_client, base_api_url, cleanup_users):
-    token_user1 = get_token_from_new_user(api_client, base_api_url)
+def test_product_update_other_user(api_client, base_api_url, cleanup_users, new_user_token):
+    token_user1 = new_user_token()
     wishlist_user1_id = create_default_wishlist(
         api_client, base_api_url, token_user1, "Default Wishlist"
     )
@@ -597,7 +575,7 @@ def test_product_update_other_user(api_client, base_api_url, cleanup_users):
     product1 = post_resp1.json()
     product1_id = product1["id"]
 
-    token_user2 = get_token_from_new_user(api_client, base_api_url)
+    token_user2 = new_user_token()
     headers2 = {"Authorization": f"Bearer {token_user2}"}
 
     # user 2 trying to update user 1 product
@@ -623,8 +601,9 @@ def test_product_update_other_user(api_client, base_api_url, cleanup_users):
 # - **Expected Result:**
 #   - The API should respond with a `204 No Content` status code.
 @pytest.mark.api
-def test_product_delete_success(api_client, base_api_url, cleanup_users):
-    token = get_token_from_new_user(api_client, base_api_url)
+@pytest.mark.load(weight=1)
+def test_product_delete_success(api_client, base_api_url, cleanup_users, new_user_token):
+    token = new_user_token()
     wishlist_id = create_default_wishlist(
         api_client, base_api_url, token, "Default Wishlist"
     )
@@ -663,8 +642,8 @@ def test_product_delete_success(api_client, base_api_url, cleanup_users):
 # - **Expected Result:**
 #   - The API should respond with a `404 Not Found` status code.
 @pytest.mark.api
-def test_product_delete_nonexistent(api_client, base_api_url, cleanup_users):
-    token = get_token_from_new_user(api_client, base_api_url)
+def test_product_delete_nonexistent(api_client, base_api_url, cleanup_users, new_user_token):
+    token = new_user_token()
     headers = {"Authorization": f"Bearer {token}"}
     unexisting_product_id = 322549382890
 
@@ -682,8 +661,8 @@ def test_product_delete_nonexistent(api_client, base_api_url, cleanup_users):
 # - **Expected Result:**
 #   - The API should respond with a `404 Not Found` status code.
 @pytest.mark.api
-def test_product_delete_other_user(api_client, base_api_url, cleanup_users):
-    token_user1 = get_token_from_new_user(api_client, base_api_url)
+def test_product_delete_other_user(api_client, base_api_url, cleanup_users, new_user_token):
+    token_user1 = new_user_token()
     wishlist_id = create_default_wishlist(
         api_client, base_api_url, token_user1, "Default Wishlist"
     )
@@ -692,7 +671,7 @@ def test_product_delete_other_user(api_client, base_api_url, cleanup_users):
     )
     user1_product1_id = product1["id"]
 
-    token_user2 = get_token_from_new_user(api_client, base_api_url)
+    token_user2 = new_user_token()
     headers2 = {"Authorization": f"Bearer {token_user2}"}
 
     # user 2 trying to delete product from user 1 wishlist
@@ -1,5 +1,7 @@
 import pytest
 
+from utils.async_api_client import Call, expect_status, fan_out
+
 # # Test Cases for Authenticated Endpoints - General
 
 # ## Scenario 35: Accessing Endpoint without Authentication Token
@@ -18,27 +20,14 @@ import pytest
 #   - The API should respond with a `401 Unauthorized` status code.
 #   - The response body should contain a detail message like "Not authenticated".
 @pytest.mark.api
-def test_protected_endpoints_without_token(api_client, base_api_url):
-    # POST wishlists
-    url_post_wishlist = f"{base_api_url}/wishlists"
-    payload_wishlist = {"name": "Should Not Be Created"}
-    resp = api_client.post(url_post_wishlist, json=payload_wishlist)
-    assert resp.status_code == 401, resp.text
-    body = resp.json()
-    assert body.get("detail") == "Not authenticated"
-
-    # GET wishlists
-    url_get_wishlists = f"{base_api_url}/wishlists"
-    resp = api_client.get(url_get_wishlists)
-    assert resp.status_code == 401, resp.text
-    body = resp.json()
-    assert body.get("detail") == "Not authenticated"
+async def test_protected_endpoints_without_token(async_api_client, base_api_url):
+    client = async_api_client
+    unauthenticated = expect_status(401, "Not authenticated")
 
     unexisting_wishlist_id = 32189738
     unexisting_product_id = 95802841
 
-    # POST product
-    url_post_product = f"{base_api_url}/wishlists/{unexisting_wishlist_id}/products"
+    payload_wishlist = {"name": "Should Not Be Created"}
     payload_product = {
         "Product": "Glasses that don't work",
         "Price": "16.00",
@@ -46,37 +35,34 @@ def test_protected_endpoints_without_token(api_client, base_api_url):
         "delivery_estimate": "5 days",
         "shipping_fee": "11.00",
     }
-    resp = api_client.post(url_post_product, json=payload_product)
-    assert resp.status_code == 401, resp.text
-    body = resp.json()
-    assert body.get("detail") == "Not authenticated"
-
-    # GET product
-    url_get_products = f"{base_api_url}/wishlists/{unexisting_wishlist_id}/products"
-    resp = api_client.get(url_get_products)
-    assert resp.status_code == 401, resp.text
-    body = resp.json()
-    assert body.get("detail") == "Not authenticated"
-
-    # PUT product
-    url_put_product = f"{base_api_url}/products/{unexisting_product_id}"
     payload_update = {
         "Product": "Updated Name for Glasses that don't work",
         "Price": "25.00",
         "delivery_estimate": "3 days",
         "is_purchased": True,
     }
-    resp = api_client.put(url_put_product, json=payload_update)
-    assert resp.status_code == 401, resp.text
-    body = resp.json()
-    assert body.get("detail") == "Not authenticated"
 
-    # DELETE product
-    url_delete_product = f"{base_api_url}/products/{unexisting_product_id}"
-    resp = api_client.delete(url_delete_product)
-    assert resp.status_code == 401, resp.text
-    body = resp.json()
-    assert body.get("detail") == "Not authenticated"
+    # as 6 chamadas são independentes: disparadas juntas
+    await fan_out(
+        Call("POST wishlists", client.post(f"{base_api_url}/wishlists", json=payload_wishlist), unauthenticated),
+        Call("GET wishlists", client.get(f"{base_api_url}/wishlists"), unauthenticated),
+        Call(
+            "POST product",
+            client.post(f"{base_api_url}/wishlists/{unexisting_wishlist_id}/products", json=payload_product),
+            unauthenticated,
+        ),
+        Call(
+            "GET product",
+            client.get(f"{base_api_url}/wishlists/{unexisting_wishlist_id}/products"),
+            unauthenticated,
+        ),
+        Call(
+            "PUT product",
+            client.put(f"{base_api_url}/products/{unexisting_product_id}", json=payload_update),
+            unauthenticated,
+        ),
+        Call("DELETE product", client.delete(f"{base_api_url}/products/{unexisting_product_id}"), unauthenticated),
+    )
 
 # ## Scenario 36: Accessing Endpoint with an Invalid or Expired Token
 # - **Objective:** Verify that all endpoints requiring authentication return a `401 Unauthorized` error when an invalid, malformed, or expired token is provided.
@@ -97,31 +83,15 @@ def test_protected_endpoints_without_token(api_client, base_api_url):
 #   - The API should respond with a `401 Unauthorized` status code.
 #   - The response body should contain a detail message like "Could not validate credentials" or "Token has expired".
 @pytest.mark.api
-def test_protected_endpoints_with_invalid_token(api_client, base_api_url):
+async def test_protected_endpoints_with_invalid_token(async_api_client, base_api_url):
+    client = async_api_client
     invalid_headers = {"Authorization": "Bearer invalidtoken"}
-
-    # POST wishlists
-    url_post_wishlist = f"{base_api_url}/wishlists"
-    payload_wishlist = {"name": "Wishlist That Shouldn't Be Created"}
-    resp = api_client.post(
-        url_post_wishlist, headers=invalid_headers, json=payload_wishlist
-    )
-    assert resp.status_code == 401, resp.text
-    body = resp.json()
-    assert body.get("detail") == "Could not validate credentials"
-
-    # GET wishlists
-    url_get_wishlists = f"{base_api_url}/wishlists"
-    resp = api_client.get(url_get_wishlists, headers=invalid_headers)
-    assert resp.status_code == 401, resp.text
-    body = resp.json()
-    assert body.get("detail") == "Could not validate credentials"
+    invalid_credentials = expect_status(401, "Could not validate credentials")
 
     unexisting_wishlist_id = 1
     unexisting_product_id = 1
 
-    # POST product
-    url_post_product = f"{base_api_url}/wishlists/{unexisting_wishlist_id}/products"
+    payload_wishlist = {"name": "Wishlist That Shouldn't Be Created"}
     payload_product = {
         "Product": "Product That Shouldn't Work",
         "Price": "10.00",
@@ -129,36 +99,44 @@ def test_protected_endpoints_with_invalid_token(api_client, base_api_url):
         "delivery_estimate": "1 day",
         "shipping_fee": "1.00",
     }
-    resp = api_client.post(
-        url_post_product, headers=invalid_headers, json=payload_product
-    )
-    assert resp.status_code == 401, resp.text
-    body = resp.json()
-    assert body.get("detail") == "Could not validate credentials"
-
-    # GET product
-    url_get_products = f"{base_api_url}/wishlists/{unexisting_wishlist_id}/products"
-    resp = api_client.get(url_get_products, headers=invalid_headers)
-    assert resp.status_code == 401, resp.text
-    body = resp.json()
-    assert body.get("detail") == "Could not validate credentials"
-
-    # PUT product
-    url_put_product = f"{base_api_url}/products/{unexisting_product_id}"
     payload_update = {
         "Product": "Updated Name",
         "Price": "20.00",
         "delivery_estimate": "5 days",
         "is_purchased": True,
     }
-    resp = api_client.put(url_put_product, headers=invalid_headers, json=payload_update)
-    assert resp.status_code == 401, resp.text
-    body = resp.json()
-    assert body.get("detail") == "Could not validate credentials"
 
-    # DELETE product
-    url_delete_product = f"{base_api_url}/products/{unexisting_product_id}"
-    resp = api_client.delete(url_delete_product, headers=invalid_headers)
-    assert resp.status_code == 401, resp.text
-    body = resp.json()
-    assert body.get("detail") == "Could not validate credentials"
+    await fan_out(
+        Call(
+            "POST wishlists",
+            client.post(f"{base_api_url}/wishlists", headers=invalid_headers, json=payload_wishlist),
+            invalid_credentials,
+        ),
+        Call("GET wishlists", client.get(f"{base_api_url}/wishlists", headers=invalid_headers), invalid_credentials),
+        Call(
+            "POST product",
+            client.post(
+                f"{base_api_url}/wishlists/{unexisting_wishlist_id}/products",
+                headers=invalid_headers,
+                json=payload_product,
+            ),
+            invalid_credentials,
+        ),
+        Call(
+            "GET product",
+            client.get(f"{base_api_url}/wishlists/{unexisting_wishlist_id}/products", headers=invalid_headers),
+            invalid_credentials,
+        ),
+        Call(
+            "PUT product",
+            client.put(
+                f"{base_api_url}/products/{unexisting_product_id}", headers=invalid_headers, json=payload_update
+            ),
+            invalid_credentials,
+        ),
+        Call(
+            "DELETE product",
+            client.delete(f"{base_api_url}/products/{unexisting_product_id}", headers=invalid_headers),
+            invalid_credentials,
+        ),
+    )
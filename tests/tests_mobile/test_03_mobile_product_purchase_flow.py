@@ -2,7 +2,6 @@ import time
 import pytest
 from pages.pages_mobile.mobile_home_page import MobileHome
 from pages.pages_mobile.mobile_results_page import MobileSearchResultsPage
-from utils.api_reader import return_objects_from_wishlist
 
 ### Scenario 3: Product Purchase Flow
 #### Use the 3 products from wishlist projeto_final as an argument for loop execution
@@ -33,11 +32,11 @@ from utils.api_reader import return_objects_from_wishlist
 # 10. **Validate Redirect:** Check if the login/checkout screen is displayed with the message "Enter your email to continue".
 @pytest.mark.mobile
 @pytest.mark.parametrize("product_index", [0, 1, 2])
-def test_mobile_popup_title(driver, api_client, base_api_url, product_index):
+def test_mobile_popup_title(wishlist_catalog, driver, product_index):
     # 1
     home = MobileHome(driver)
     results = MobileSearchResultsPage(driver)
-    products = return_objects_from_wishlist(api_client, base_api_url)
+    products = wishlist_catalog.products()
     assert isinstance(products, list)
     assert len(products) > 0
 
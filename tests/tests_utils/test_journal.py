@@ -0,0 +1,124 @@
+import json
+
+import pytest
+
+from utils.journal import INTERRUPTED_ERROR, JournalWriter, iter_results, journal_path
+
+# # Unit tests for utils/journal.py (crash-safe results journal)
+# Journals are written by hand, line by line, the same way reporting.py writes them.
+
+pytestmark = pytest.mark.unit
+
+
+def _phase(nodeid, when, order, outcome="passed", worker=None):
+    rec = {"t": "phase", "nodeid": nodeid, "name": nodeid.split("::")[-1], "when": when,
+           "outcome": outcome, "duration": 0.01, "start": 1.0, "stop": 1.01, "order": order}
+    if worker:
+        rec["worker"] = worker
+    return rec
+
+
+def _result(nodeid, order, outcome="passed", worker=None):
+    rec = {"t": "result", "nodeid": nodeid, "name": nodeid.split("::")[-1], "when": "call",
+           "outcome": outcome, "duration": 0.1, "start": 1.0, "stop": 1.1, "error": "", "order": order}
+    if worker:
+        rec["worker"] = worker
+    return rec
+
+
+def _test(nodeid, order, worker=None):
+    return [_phase(nodeid, "setup", order, worker=worker), _result(nodeid, order, worker=worker),
+            _phase(nodeid, "teardown", order, worker=worker)]
+
+
+def _write(session_dir, worker, records, tail=""):
+    path = journal_path(session_dir, worker)
+    writer = JournalWriter(path)
+    for rec in records:
+        writer.append(rec)
+    writer.close()
+    if tail:
+        with path.open("a", encoding="utf-8") as fh:
+            fh.write(tail)
+    return path
+
+
+# ### Scenario 1: Truncated last line
+# - **Objective:** A process killed in the middle of a write leaves half a JSON line; everything
+#   before it is still read and the broken line is ignored.
+def test_journal_tolerates_truncated_last_line(tmp_path):
+    records = [{"t": "session", "worker": "main", "started_at": "2026-01-01 10:00:00"},
+               *_test("t.py::test_a", 1), *_test("t.py::test_b", 2)]
+    broken = json.dumps(_result("t.py::test_c", 3))[:40]
+    _write(tmp_path, None, records, tail=broken)
+
+    info = {}
+    results = list(iter_results(tmp_path, info))
+
+    assert [r["nodeid"] for r in results] == ["t.py::test_a", "t.py::test_b"]
+    assert all(r["outcome"] == "passed" for r in results)
+    assert info["started_at"] == "2026-01-01 10:00:00"
+    assert info["unfinished"] == ["results_main.jsonl"]
+
+
+# ### Scenario 2: Process died during a test
+# - **Objective:** A test whose setup passed but has no call result (and the journal has no
+#   finish record) comes back as an interrupted failure instead of disappearing.
+def test_journal_reports_test_without_result_as_interrupted(tmp_path):
+    records = [*_test("t.py::test_a", 1), _phase("t.py::test_hang", "setup", 2, worker="gw0")]
+    _write(tmp_path, "gw0", records)
+
+    results = list(iter_results(tmp_path))
+
+    assert [r["nodeid"] for r in results] == ["t.py::test_a", "t.py::test_hang"]
+    hung = results[-1]
+    assert hung["when"] == "interrupted"
+    assert hung["outcome"] == "failed"
+    assert hung["error"] == INTERRUPTED_ERROR
+    assert hung["order"] == 2
+    assert hung["worker"] == "gw0"
+
+
+def test_journal_finished_run_has_no_interrupted_test(tmp_path):
+    # setup passou, o teste foi pulado antes do call e a sessão terminou normalmente
+    records = [*_test("t.py::test_a", 1), _phase("t.py::test_b", "setup", 2),
+               {"t": "finish", "exitstatus": 0}]
+    _write(tmp_path, None, records)
+
+    info = {}
+    results = list(iter_results(tmp_path, info))
+
+    assert [r["nodeid"] for r in results] == ["t.py::test_a"]
+    assert info["exitstatus"] == 0
+    assert "unfinished" not in info
+
+
+# ### Scenario 3: Worker files merged with late updates
+# - **Objective:** Two worker journals are interleaved by the global execution order, and
+#   updates written after a test finished (add_meta/add_screenshot from teardown or a
+#   background writer) land on the right test.
+def test_journal_merges_workers_in_order_with_late_updates(tmp_path):
+    gw0 = [*_test("t.py::test_1", 1, "gw0"), *_test("t.py::test_3", 3, "gw0"),
+           {"t": "update", "nodeid": "t.py::test_3", "op": "set", "key": "device", "value": "emulator-5554"},
+           *_test("t.py::test_6", 6, "gw0"),
+           # screenshot do test_1 só termina de gravar aqui (ArtifactWriter em background)
+           {"t": "update", "nodeid": "t.py::test_1", "op": "set", "key": "screenshot", "value": "001/shot.png"},
+           {"t": "finish", "exitstatus": 1}]
+    gw1 = [*_test("t.py::test_2", 2, "gw1"), *_test("t.py::test_4", 4, "gw1"), *_test("t.py::test_5", 5, "gw1"),
+           {"t": "update", "nodeid": "t.py::test_2", "op": "set", "key": "device", "value": "emulator-5556"},
+           {"t": "update", "nodeid": "t.py::test_2", "op": "timing", "key": "app_reset", "value": 0.5},
+           {"t": "update", "nodeid": "t.py::test_4", "op": "extend", "key": "cleanup_failures",
+            "value": [{"kind": "wishlist", "id": 7}]},
+           {"t": "finish", "exitstatus": 1}]
+    _write(tmp_path, "gw0", gw0)
+    _write(tmp_path, "gw1", gw1)
+
+    results = {r["nodeid"]: r for r in iter_results(tmp_path)}
+
+    assert [r["order"] for r in results.values()] == [1, 2, 3, 4, 5, 6]
+    assert results["t.py::test_1"]["screenshot"] == "001/shot.png"
+    assert results["t.py::test_2"]["device"] == "emulator-5556"
+    assert results["t.py::test_2"]["timings"] == {"app_reset": 0.5}
+    assert results["t.py::test_3"]["device"] == "emulator-5554"
+    assert results["t.py::test_4"]["cleanup_failures"] == [{"kind": "wishlist", "id": 7}]
+    assert "screenshot" not in results["t.py::test_6"]
@@ -0,0 +1,119 @@
+import pytest
+
+from utils.scheduler import (build_units, fingerprint, lpt_partition, parse_shard, pinned_durations, plan,
+                             write_snapshot)
+
+# # Unit tests for utils/scheduler.py (--schedule / --shard)
+# Every shard of a run must see the same split: together the N shards run each test
+# exactly once and the rows of one CSV file always stay in the same shard.
+
+pytestmark = pytest.mark.unit
+
+
+class _Item:
+    """Só o que o scheduler lê de um item do pytest."""
+
+    def __init__(self, nodeid, group=None):
+        self.nodeid = nodeid
+        self.group = group
+
+    def __repr__(self):
+        return self.nodeid
+
+
+def _group(item):
+    return item.group
+
+
+def _suite():
+    """30 testes soltos com durações variadas + 2 CSVs (4 e 6 linhas) + 3 testes sem histórico."""
+    items = [_Item(f"tests/test_a.py::test_{i:02d}") for i in range(30)]
+    items += [_Item(f"tests/csv_tests/smoke.csv::row_{i}", group="smoke.csv") for i in range(4)]
+    items += [_Item(f"tests/csv_tests/full.csv::row_{i}", group="full.csv") for i in range(6)]
+    items += [_Item(f"tests/test_new.py::test_{i}") for i in range(3)]
+    durations = {it.nodeid: round(0.1 + (i * 7 % 13) * 0.37, 2) for i, it in enumerate(items[:40])}
+    return items, durations
+
+
+def _shards(items, durations, total):
+    return [plan(items, durations, "longest", (i, total), group_key=_group) for i in range(1, total + 1)]
+
+
+@pytest.mark.parametrize("total", [1, 2, 3, 4, 7])
+def test_shards_are_disjoint_and_cover_every_item(total):
+    items, durations = _suite()
+
+    shards = _shards(items, durations, total)
+
+    ran = [it.nodeid for kept, _, _ in shards for it in kept]
+    assert len(ran) == len(set(ran)), "a test ran in more than one shard"
+    assert sorted(ran) == sorted(it.nodeid for it in items)
+    for kept, deselected, info in shards:
+        assert len(kept) + len(deselected) == len(items)
+        assert {it.nodeid for it in kept}.isdisjoint(it.nodeid for it in deselected)
+        assert info["shard_tests"] == len(kept)
+
+
+@pytest.mark.parametrize("total", [2, 3, 5, 12])
+def test_shards_never_split_a_csv_file(total):
+    items, durations = _suite()
+
+    shards = _shards(items, durations, total)
+
+    for group in ("smoke.csv", "full.csv"):
+        owners = [n for n, (kept, _, _) in enumerate(shards) if any(it.group == group for it in kept)]
+        assert len(owners) == 1, f"{group} split across shards {owners}"
+        kept = shards[owners[0]][0]
+        assert sum(it.group == group for it in kept) == sum(it.group == group for it in items)
+
+
+def test_plan_is_deterministic_for_a_snapshot(tmp_path):
+    items, durations = _suite()
+    snapshot = write_snapshot(tmp_path / "shard_durations.json", durations, "history.sqlite")
+    reread, created = pinned_durations(tmp_path / "shard_durations.json", None, tmp_path)
+
+    # mesma entrada lida de novo (outra máquina / outro shard), dict em outra ordem
+    shuffled = dict(reversed(list(reread["durations"].items())))
+    first = _shards(items, durations, 3)
+    second = _shards(list(items), shuffled, 3)
+
+    assert not created
+    assert reread["fingerprint"] == snapshot["fingerprint"] == fingerprint(shuffled)
+    assert [[it.nodeid for it in kept] for kept, _, _ in first] == [[it.nodeid for it in kept] for kept, _, _ in second]
+    assert [info for _, _, info in first] == [info for _, _, info in second]
+
+
+def test_lpt_partition_balances_and_keeps_every_unit():
+    items = [_Item(f"t.py::test_{i}") for i in range(6)]
+    durations = dict(zip((it.nodeid for it in items), [8.0, 7.0, 6.0, 5.0, 4.0, 2.0]))
+    units, unknown = build_units(items, durations)
+
+    parts = lpt_partition(units, 2)
+
+    assert unknown == 0
+    assert sorted(id(u) for p in parts for u in p) == sorted(id(u) for u in units)
+    loads = sorted(sum(u.cost for u in p) for p in parts)
+    # LPT: 8→A, 7→B, 6→B, 5→A, 4→A, 2→B
+    assert loads == [15.0, 17.0]
+    # o último bloco foi para a parte mais leve: diferença nunca passa do maior bloco
+    assert loads[-1] - loads[0] <= max(u.cost for u in units)
+
+
+def test_collection_mode_keeps_collection_order_inside_the_shard():
+    items, durations = _suite()
+
+    kept, _, _ = plan(items, durations, "collection", (2, 3), group_key=_group)
+
+    positions = [items.index(it) for it in kept]
+    assert positions == sorted(positions)
+
+
+@pytest.mark.parametrize("value, expected", [(None, None), ("", None), ("1/1", (1, 1)), ("3/4", (3, 4))])
+def test_parse_shard(value, expected):
+    assert parse_shard(value) == expected
+
+
+@pytest.mark.parametrize("value", ["0/3", "4/3", "1/0", "2", "a/b", "1/2/3"])
+def test_parse_shard_rejects_invalid_values(value):
+    with pytest.raises(ValueError):
+        parse_shard(value)
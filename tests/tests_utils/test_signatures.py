@@ -0,0 +1,150 @@
+import pytest
+
+from utils.signatures import FailureClusters, normalize, parse_error, signature
+
+# # Unit tests for utils/signatures.py (failure clusters in the dashboard)
+# The clustering is only as good as the masking: values that change from run to run must
+# disappear from the message, and the frames must point at project code only.
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.parametrize("raw, expected", [
+    # locators
+    ('Unable to locate element: {"method":"css selector","selector":"#busca"}',
+     'Unable to locate element: {"method":"css selector","selector":"<locator>"}'),
+    ('could not be located using {"using":"accessibility id","value":"Carrinho"}',
+     'could not be located using {"using":"accessibility id","value":"<locator>"}'),
+    ("waiting for ('css selector', '#btn-buy')", "waiting for ('css selector', <locator>)"),
+    ('element (By.ID, "login") not clickable', "element (By.ID, <locator>) not clickable"),
+    ("(AppiumBy.ACCESSIBILITY_ID, 'Comprar') not found", "(AppiumBy.ACCESSIBILITY_ID, <locator>) not found"),
+    ("locator='//div[@id=\"x\"]' not visible", "locator=<locator> not visible"),
+    ("xpath: '//a[1]' missing", "xpath: <locator> missing"),
+    # timestamps
+    ("failed at 2026-10-18T09:00:44.123Z", "failed at <ts>"),
+    ("failed at 2026-10-18 09:00:44,5", "failed at <ts>"),
+    ("expired 2026-10-18T09:00:44-03:00 ok", "expired <ts> ok"),
+    ("day 2026-10-18", "day <ts>"),
+    ("at 09:00:44 done", "at <ts> done"),
+    # session ids
+    ("session 3fa85f64-5717-4562-b3fc-2c963f66afa6 gone", "session <id> gone"),
+    ("session_id=7f3a9c2b1e", "session_id=<id>"),
+    ('{"sessionId": "e2b1c0f9-aa"}', '{"sessionId": "<id>"}'),
+    ('invalid session id: sessionId="abc123def"', 'invalid session id: sessionId="<id>"'),
+    ("invalid session id: Session with given id not found",
+     "invalid session id: Session with given id not found"),
+    ("token 9f8e7d6c5b4a39281706f5e4 rejected", "token <id> rejected"),
+    # addresses
+    ("<WebElement at 0x7f3a2b1c0d90>", "<WebElement at <addr>>"),
+    # long numbers
+    ("took 10.2345s", "took <n>s"),
+    ("order 1234567 missing", "order <n> missing"),
+    # kept: small numbers, versions, status codes
+    ("status 404 != 200", "status 404 != 200"),
+    ("expected 12 items, got 1234", "expected 12 items, got 1234"),
+    ("chrome 1.2.3 line 42", "chrome 1.2.3 line 42"),
+    ("deadbeef", "deadbeef"),
+    # whitespace
+    ("a\n   b\tc  ", "a b c"),
+])
+def test_normalize(raw, expected):
+    assert normalize(raw) == expected
+
+
+_SHORT = """tests/tests_web/test_05_web_check_product_info.py:30: in test_check_product_info
+    home.search("notebook")
+pages/pages_web/home_page.py:42: in search
+    self.find(self.SEARCH).send_keys(term)
+pages/pages_web/base_page.py:18: in find
+    return WebDriverWait(self.driver, 10).until(EC.visibility_of_element_located(locator))
+/usr/local/lib/python3.11/site-packages/selenium/webdriver/support/wait.py:105: in until
+    raise TimeoutException(message, screen, stacktrace)
+E   selenium.common.exceptions.TimeoutException: Message: ('css selector', '#busca') not visible
+"""
+
+_LONG = """    def test_wishlist_count(api_client):
+        resp = api_client.get("/wishlists")
+>       assert len(resp.json()) == 3
+E       assert 2 == 3
+E        +  where 2 = len([...])
+
+tests/tests_api/test_14-20_wishlist_endpoints.py:55: AssertionError
+"""
+
+_LONG_IN_PAGE = """    def open_cart(self):
+>       self.tap(self.CART)
+E       selenium.common.exceptions.NoSuchElementException: Message: no such element
+
+pages/pages_mobile/cart_page.py:20: NoSuchElementException
+"""
+
+_NATIVE = """Traceback (most recent call last):
+  File "/repo/tests/tests_api/test_x.py", line 10, in test_x
+    helper()
+  File "/repo/utils/api_reader.py", line 88, in products
+    raise ValueError("bad catalog")
+  File "/usr/lib/python3.11/json/decoder.py", line 337, in decode
+    obj, end = self.raw_decode(s, idx=_w(s, 0).end())
+json.decoder.JSONDecodeError: Expecting value: line 1 column 1 (char 0)
+"""
+
+_CHAINED = """pages/pages_mobile/cart_page.py:20: in open_cart
+    self.tap(self.CART)
+E   selenium.common.exceptions.NoSuchElementException: Message: no such element
+
+During handling of the above exception, another exception occurred:
+
+tests/tests_mobile/test_03_mobile_product_purchase_flow.py:40: in test_purchase
+    cart.open_cart()
+pages/pages_mobile/cart_page.py:25: in open_cart
+    raise AssertionError("cart not opened")
+E   AssertionError: cart not opened
+"""
+
+
+@pytest.mark.parametrize("error, exc_type, message, frames", [
+    # test file and selenium frames are left out
+    pytest.param(_SHORT, "TimeoutException", "Message: ('css selector', '#busca') not visible",
+                 ["pages/pages_web/home_page.py::search", "pages/pages_web/base_page.py::find"], id="tb-short"),
+    pytest.param(_LONG, "AssertionError", "assert 2 == 3", [], id="tb-long-in-test"),
+    pytest.param(_LONG_IN_PAGE, "NoSuchElementException", "Message: no such element",
+                 ["pages/pages_mobile/cart_page.py::open_cart"], id="tb-long-in-page"),
+    pytest.param(_NATIVE, "JSONDecodeError", "Expecting value: line 1 column 1 (char 0)",
+                 ["/repo/utils/api_reader.py::products"], id="tb-native"),
+    # last exception of a chain wins
+    pytest.param(_CHAINED, "AssertionError", "cart not opened",
+                 ["pages/pages_mobile/cart_page.py::open_cart", "pages/pages_mobile/cart_page.py::open_cart"],
+                 id="chained"),
+    pytest.param("something broke", "Error", "something broke", [], id="plain-text"),
+])
+def test_parse_error(error, exc_type, message, frames):
+    assert parse_error(error) == (exc_type, message, frames)
+
+
+def test_same_page_object_failure_from_different_tests_is_one_signature():
+    other_test = _SHORT.replace("tests/tests_web/test_05_web_check_product_info.py:30: in test_check_product_info",
+                                "tests/tests_web/test_06_web_login_valid_password.py:12: in test_login")
+    other_run = _SHORT.replace("'#busca'", "'#search-v2'").replace(":42:", ":47:")
+
+    assert signature(_SHORT)[0] == signature(other_test)[0] == signature(other_run)[0]
+    assert signature(_SHORT)[1]["frames"] == ["pages/pages_web/base_page.py::find", "pages/pages_web/home_page.py::search"]
+    assert signature(_SHORT)[0] != signature(_CHAINED)[0]
+
+
+def test_failure_clusters_count_and_order():
+    clusters = FailureClusters()
+    results = [
+        {"nodeid": "a", "order": 1, "outcome": "failed", "error": _CHAINED},
+        {"nodeid": "b", "order": 2, "outcome": "failed", "error": _SHORT},
+        {"nodeid": "c", "order": 3, "outcome": "passed", "error": ""},
+        {"nodeid": "d", "order": 4, "outcome": "failed", "error": _SHORT.replace("'#busca'", "'#q'")},
+        {"nodeid": "e", "order": 5, "outcome": "skipped", "error": "Skipped: needs --browser-pool"},
+    ]
+
+    sigs = [clusters.add(r) for r in results]
+    summary = clusters.summary()
+
+    assert sigs[2] is None and sigs[4] is None
+    assert [(c["count"], c["tests"]) for c in summary] == [(2, ["b", "d"]), (1, ["a"])]
+    assert summary[0]["first"]["nodeid"] == "b" and summary[0]["last"]["nodeid"] == "d"
+    assert clusters.by_nodeid == {"a": sigs[0], "b": sigs[1], "d": sigs[1]}
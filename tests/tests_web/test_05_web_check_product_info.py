@@ -4,7 +4,6 @@ import pytest
 from pages.pages_web.web_home_page import WebHomePage
 from pages.pages_web.web_search_results_page import WebSearchResultsPage
 from pages.pages_web.web_product_page import WebProductPage
-from utils.api_reader import return_objects_from_wishlist
 
 # ### Scenario 5: Search and View Product from Wishlist
 # #### Use the 3 products from wishlist projeto_final as an argument for loop execution
@@ -20,12 +19,12 @@ from utils.api_reader import return_objects_from_wishlist
 # 6.  **Validate Details Page:** Confirm for the last time that the product title and price are correct.
 @pytest.mark.web
 @pytest.mark.parametrize("product_index", [0, 1, 2])
-def test_search_view_product_from_wishlist(api_client, base_api_url, browser, product_index):
+def test_search_view_product_from_wishlist(wishlist_catalog, browser, product_index):
     home = WebHomePage(browser)
     search = WebSearchResultsPage(browser)
     product = WebProductPage(browser)
 
-    products = return_objects_from_wishlist(api_client, base_api_url)
+    products = wishlist_catalog.products()
     assert isinstance(products, list)
     assert len(products) > 0
     product_data = products[product_index]
@@ -0,0 +1,70 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+### Scenario 8: Browser pool isolation
+
+# **Objective:** With --browser-pool, a cookie or localStorage value set by one test on a
+# second origin (one the test left before finishing) must not reach the next test, whether
+# the test ended on another non-home origin or back on a home origin of the pool.
+
+# **Test Steps:**
+
+
+class _Page(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b"<!doctype html><title>pool isolation</title>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_origins():
+    """Duas origens locais: mesmo servidor, hosts diferentes (127.0.0.1 e localhost)."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Page)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    yield f"http://127.0.0.1:{port}", f"http://localhost:{port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.web
+@pytest.mark.parametrize("leave_to", ["other_origin", "home_origin"])
+def test_web_browser_pool_isolation(request, browser_pool, local_origins, leave_to):
+    if browser_pool is None:
+        pytest.skip("needs --browser-pool")
+    if leave_to == "home_origin" and not browser_pool.home_origins:
+        pytest.skip("browser pool has no home origins")
+    browser_name = (request.config.getoption("--browser") or os.getenv("BROWSER", "chrome")).split(",")[0].strip().lower()
+    notif_mode = (request.config.getoption("--notif") or "allow").lower()
+    first, second = local_origins
+
+    # Step 1: **Dirty the second origin:** Set a cookie and a localStorage value there.
+    drv = browser_pool.acquire(browser_name, notif_mode)
+    drv.get(f"{second}/")
+    drv.add_cookie({"name": "pool_leak", "value": "1"})
+    drv.execute_script("window.localStorage.setItem('pool_leak', '1')")
+
+    # Step 2: **Leave it:** Navigate to the first origin (or back to a home origin of the pool,
+    # so no tab ends on a foreign origin) and give the browser back to the pool.
+    drv.get(f"{first}/" if leave_to == "other_origin" else f"{browser_pool.home_origins[0]}/robots.txt")
+    browser_pool.release(browser_name, notif_mode, drv)
+
+    # Step 3: **Next test:** Take a browser from the pool and check the second origin is clean.
+    drv = browser_pool.acquire(browser_name, notif_mode)
+    try:
+        drv.get(f"{second}/")
+        assert drv.get_cookie("pool_leak") is None, "cookie from the previous test survived the reset"
+        assert drv.execute_script("return window.localStorage.getItem('pool_leak')") is None, \
+            "localStorage from the previous test survived the reset"
+    finally:
+        browser_pool.release(browser_name, notif_mode, drv)
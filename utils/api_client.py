@@ -0,0 +1,110 @@
+# utils/api_client.py
+# Cliente HTTP da suíte de API.
+#
+# Um requests.Session por sessão do pytest (pool de conexões keep-alive, retry
+# e timeout padrão) e um ApiClient por teste por cima dele: headers e token
+# (`last_token`, usado pelos cleanups) ficam no objeto do teste, não vazam
+# para o próximo. Mesma superfície do módulo `requests`: get/post/put/delete/patch.
+
+import re
+import time
+from typing import Callable, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_RETRIES = 2
+# retry só para métodos idempotentes (POST nunca é repetido)
+RETRY_METHODS = frozenset({"GET", "PUT", "DELETE", "HEAD", "OPTIONS"})
+RETRY_STATUSES = (502, 503, 504)
+
+Timeout = Union[float, Tuple[float, float]]
+
+# segmentos que são id (número, uuid, hex longo) viram {id} na rota agregada
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F-]{27}|[0-9a-fA-F]{16,})$")
+
+
+def normalize_route(url: str) -> str:
+    """Caminho da URL sem query e com ids trocados por {id}: /wishlists/12/products → /wishlists/{id}/products."""
+    path = urlsplit(url).path or "/"
+    return "/".join("{id}" if _ID_SEGMENT.match(seg) else seg for seg in path.split("/"))
+
+
+def build_session(pool_size: int = DEFAULT_POOL_SIZE, retries: int = DEFAULT_RETRIES, backoff: float = 0.2,
+                  cassette=None):
+    """
+    requests.Session com pool de `pool_size` conexões por host e política de retry.
+    cassette (utils/cassette.py): grava ou responde do arquivo por baixo do pool.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=RETRY_METHODS,
+        raise_on_status=False,
+    )
+    adapter_kwargs = {"pool_connections": pool_size, "pool_maxsize": pool_size, "max_retries": retry}
+    if cassette is not None:
+        from utils.cassette import cassette_adapter
+
+        adapter = cassette_adapter(cassette, **adapter_kwargs)
+    else:
+        adapter = HTTPAdapter(**adapter_kwargs)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class ApiClient:
+    """
+    Cliente de um teste. `headers` são somados aos de cada chamada (os da
+    chamada vencem); `timeout` vale quando a chamada não passa o seu.
+    listeners: chamados após cada resposta com (method, url, kwargs, resp, elapsed_s).
+    """
+
+    def __init__(self, session, timeout: Optional[Timeout] = DEFAULT_TIMEOUT, headers: Optional[dict] = None):
+        self.session = session
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.last_token: Optional[str] = None
+        self.listeners: List[Callable] = []
+
+    def set_token(self, token: str) -> str:
+        """Guarda o token do usuário do teste (os cleanups usam `last_token`)."""
+        self.last_token = token
+        return token
+
+    def request(self, method: str, url: str, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        headers = kwargs.pop("headers", None)
+        if self.headers or headers:
+            kwargs["headers"] = {**self.headers, **(headers or {})}
+        t0 = time.perf_counter()
+        resp = self.session.request(method, url, **kwargs)
+        elapsed = time.perf_counter() - t0
+        for listener in self.listeners:
+            listener(method, url, kwargs, resp, elapsed)
+        return resp
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def patch(self, url: str, **kwargs):
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url: str, **kwargs):
+        return self.request("DELETE", url, **kwargs)
@@ -1,6 +1,17 @@
+import threading
+import time
+
+from utils.user_pool import TOKEN_REFRESH_MARGIN_S, jwt_expiry
+
+DEFAULT_EMAIL = "projeto@example.com"
+DEFAULT_PASSWORD = "Senha123!"
+DEFAULT_WISHLIST = "projeto_final"
+DEFAULT_CATALOG_TTL_S = 300.0
+
+
 def login_default_user_token(api_client, base_api_url):
-    email = "projeto@example.com"
-    password = "Senha123!"
+    email = DEFAULT_EMAIL
+    password = DEFAULT_PASSWORD
 
     login_url = f"{base_api_url}/auth/login"
     payload = {
@@ -38,3 +49,120 @@ def return_objects_from_wishlist(api_client, base_api_url):
     assert product_resp.status_code == 200, product_resp.text
 
     return product_resp.json()
+
+
+# ==========================================================
+# Catálogo em cache (fixture `wishlist_catalog`)
+# ==========================================================
+# Os testes parametrizados (product_index × navegador) liam a mesma wishlist a
+# cada execução: login + GET /wishlists + GET /products, sempre iguais. O
+# catálogo faz isso uma vez por processo/worker e guarda:
+#   - o token do usuário padrão (novo login só perto do exp do JWT ou em 401)
+#   - os produtos da wishlist por `ttl` segundos (invalidate() força nova leitura)
+# prefetch() busca em background; products() espera a busca em andamento.
+
+class WishlistCatalog:
+    """client: ApiClient (ou o módulo requests). ttl <= 0 desliga o cache dos produtos."""
+
+    def __init__(self, client, base_api_url: str, wishlist: str = DEFAULT_WISHLIST,
+                 ttl: float = DEFAULT_CATALOG_TTL_S, logger=None, check_token_exp: bool = True):
+        self.client = client
+        # False no replay do cassete: `exp` do token gravado é do relógio da gravação
+        self.check_token_exp = check_token_exp
+        self.base_api_url = base_api_url
+        self.wishlist = wishlist
+        self.ttl = ttl
+        self._log = logger
+        self._lock = threading.Lock()
+        self._token = None
+        self._token_exp = None
+        self._products = None
+        self._fetched_at = 0.0
+        self._prefetch = None
+        self.hits = 0
+        self.fetches = 0
+        self.logins = 0
+
+    def _info(self, msg: str) -> None:
+        if self._log:
+            self._log.info(msg)
+
+    # ---------- token ----------
+    def _token_valid(self) -> bool:
+        if not self._token:
+            return False
+        return self._token_exp is None or self._token_exp - time.time() >= TOKEN_REFRESH_MARGIN_S
+
+    def token(self, refresh: bool = False) -> str:
+        """Token do usuário padrão (cacheado)."""
+        with self._lock:
+            if refresh or not self._token_valid():
+                self._token = login_default_user_token(self.client, self.base_api_url)
+                self._token_exp = jwt_expiry(self._token) if self.check_token_exp else None
+                self.logins += 1
+            return self._token
+
+    # ---------- produtos ----------
+    def _fresh(self) -> bool:
+        return self._products is not None and time.monotonic() - self._fetched_at < self.ttl
+
+    def _get(self, url: str):
+        resp = self.client.get(url, headers={"Authorization": f"Bearer {self.token()}"})
+        if resp.status_code == 401:
+            resp = self.client.get(url, headers={"Authorization": f"Bearer {self.token(refresh=True)}"})
+        assert resp.status_code == 200, resp.text
+        return resp.json()
+
+    def _fetch(self) -> list:
+        target_id = None
+        for wishlist in self._get(f"{self.base_api_url}/wishlists"):
+            if wishlist.get("name") == self.wishlist:
+                target_id = wishlist.get("id")
+                break
+        assert target_id is not None, f"Wishlist '{self.wishlist}' not found"
+        return self._get(f"{self.base_api_url}/wishlists/{target_id}/products")
+
+    def products(self) -> list:
+        """Produtos da wishlist (cópia rasa: o teste pode mexer na lista à vontade)."""
+        pending = self._prefetch
+        if pending is not None and pending is not threading.current_thread():
+            pending.join()
+        with self._lock:
+            if self._fresh():
+                self.hits += 1
+                return list(self._products)
+        products = self._fetch()
+        with self._lock:
+            self._products, self._fetched_at = products, time.monotonic()
+            self.fetches += 1
+        self._info(f"[CATALOG] '{self.wishlist}': {len(products)} product(s) loaded")
+        return list(products)
+
+    def invalidate(self, token: bool = False) -> None:
+        """Descarta os produtos (e o token, se token=True): a próxima leitura vai à API."""
+        with self._lock:
+            self._products = None
+            if token:
+                self._token, self._token_exp = None, None
+
+    def prefetch(self) -> None:
+        """Busca em background (ex.: enquanto o navegador/Appium sobe). Erros ficam para products()."""
+        with self._lock:
+            if self._prefetch is not None or self._fresh():
+                return
+
+            def _run():
+                try:
+                    self.products()
+                except Exception as e:
+                    self._info(f"[CATALOG] prefetch failed (retried on first use): {e}")
+                finally:
+                    self._prefetch = None
+
+            # atribui e inicia sob o lock: products() nunca vê (e faz join em) thread não iniciada;
+            # _run só avança depois que o lock é solto
+            self._prefetch = threading.Thread(target=_run, name="catalog-prefetch", daemon=True)
+            self._prefetch.start()
+
+    def stats(self) -> dict:
+        return {"fetches": self.fetches, "hits": self.hits, "logins": self.logins}
@@ -0,0 +1,144 @@
+# utils/appium_session.py
+# Reaproveitamento de sessão Appium: UMA sessão por worker e o app é
+# resetado entre os testes (terminate/activate ou limpeza de dados do app).
+# Criar sessão UiAutomator2 é o passo mais caro da suíte mobile.
+
+import time
+from typing import List, Optional
+
+APPIUM_URL = "http://127.0.0.1:4723"
+RESET_STRATEGIES = ("terminate", "clear")
+
+
+def create_appium_driver(url: str, capabilities: dict):
+    """Cria uma sessão Appium nova (import tardio do client)."""
+    from appium import webdriver as appwd
+    from appium.options.common.base import AppiumOptions
+
+    options = AppiumOptions()
+    options.load_capabilities(dict(capabilities))
+    return appwd.Remote(url, options=options)
+
+
+def merge_stats(a: dict, b: dict) -> dict:
+    """Soma as estatísticas de reuso de dois processos/devices (médias recalculadas)."""
+    if not a:
+        return dict(b)
+    if not b:
+        return dict(a)
+    out = dict(a)
+    for count_key, total_key, avg_key in (
+        ("sessions_created", "session_create_total_s", "session_create_avg_s"),
+        ("app_resets", "app_reset_total_s", "app_reset_avg_s"),
+    ):
+        count = (a.get(count_key) or 0) + (b.get(count_key) or 0)
+        total = round((a.get(total_key) or 0) + (b.get(total_key) or 0), 3)
+        out[count_key] = count
+        out[total_key] = total
+        out[avg_key] = round(total / count, 3) if count else None
+    return out
+
+
+class AppiumSessionManager:
+    """
+    Mantém a sessão Appium viva entre testes.
+
+    acquire() devolve (driver, created): created=True quando a sessão acabou de
+    ser criada (app já vem limpo); senão o app é resetado com a estratégia
+    escolhida antes de devolver.
+    """
+
+    def __init__(self, url: str, capabilities: dict, reset_strategy: str = "terminate", logger=None):
+        if reset_strategy not in RESET_STRATEGIES:
+            raise ValueError(
+                f"Invalid reset strategy '{reset_strategy}' (use: {', '.join(RESET_STRATEGIES)})"
+            )
+        self.url = url
+        self.capabilities = dict(capabilities)
+        self.reset_strategy = reset_strategy
+        self.app_package = self.capabilities.get("appPackage", "")
+        self._log = logger
+        self._driver = None
+        self.create_times: List[float] = []
+        self.reset_times: List[float] = []
+        self.last_create_s: Optional[float] = None
+        self.last_reset_s: Optional[float] = None
+
+    def _info(self, msg: str) -> None:
+        if self._log:
+            self._log.info(msg)
+
+    @staticmethod
+    def is_alive(drv) -> bool:
+        try:
+            _ = drv.current_package
+            return True
+        except Exception:
+            return False
+
+    def _create(self):
+        t0 = time.perf_counter()
+        drv = create_appium_driver(self.url, self.capabilities)
+        self.last_create_s = time.perf_counter() - t0
+        self.create_times.append(self.last_create_s)
+        self._info(
+            f"[DRIVER] session created in {self.last_create_s:.2f}s: {getattr(drv, 'session_id', 'n/a')}"
+        )
+        return drv
+
+    def reset_app(self, drv) -> float:
+        t0 = time.perf_counter()
+        if self.reset_strategy == "clear":
+            # limpa dados do app (equivalente a `pm clear`) e abre de novo
+            drv.execute_script("mobile: clearApp", {"appId": self.app_package})
+        else:
+            drv.terminate_app(self.app_package)
+        drv.activate_app(self.app_package)
+        self.last_reset_s = time.perf_counter() - t0
+        self.reset_times.append(self.last_reset_s)
+        self._info(f"[DRIVER] app reset ({self.reset_strategy}) in {self.last_reset_s:.2f}s")
+        return self.last_reset_s
+
+    def acquire(self):
+        self.last_create_s = self.last_reset_s = None
+        if self._driver is not None and not self.is_alive(self._driver):
+            self._info("[DRIVER] reused session is dead → creating a new one")
+            self.discard()
+        if self._driver is None:
+            self._driver = self._create()
+            return self._driver, True
+        try:
+            self.reset_app(self._driver)
+        except Exception as e:
+            self._info(f"[DRIVER] app reset failed ({type(e).__name__}: {e}) → new session")
+            self.discard()
+            self._driver = self._create()
+            return self._driver, True
+        return self._driver, False
+
+    def discard(self) -> None:
+        drv, self._driver = self._driver, None
+        if drv is not None:
+            try:
+                drv.quit()
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        if self._driver is not None:
+            self._info("[DRIVER] quitting reused session")
+        self.discard()
+
+    def stats(self) -> dict:
+        def avg(xs):
+            return round(sum(xs) / len(xs), 3) if xs else None
+
+        return {
+            "reset_strategy": self.reset_strategy,
+            "sessions_created": len(self.create_times),
+            "session_create_avg_s": avg(self.create_times),
+            "session_create_total_s": round(sum(self.create_times), 3),
+            "app_resets": len(self.reset_times),
+            "app_reset_avg_s": avg(self.reset_times),
+            "app_reset_total_s": round(sum(self.reset_times), 3),
+        }
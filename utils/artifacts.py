@@ -0,0 +1,126 @@
+# utils/artifacts.py
+# Gravação de artefatos (screenshots/vídeos) fora da thread do teste.
+#
+# O teste só captura o conteúdo (base64 vindo do driver) e enfileira; um pool
+# pequeno de threads decodifica e grava em disco. A fila é limitada: se encher,
+# submit() bloqueia (back-pressure) em vez de acumular vídeos na memória.
+# flush() é a barreira do fim da sessão — tudo gravado antes do summary/dashboard.
+
+import base64
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+_STOP = object()
+
+
+class ArtifactWriter:
+    """
+    workers=0 → modo síncrono (grava na hora, como antes).
+    on_done(path) roda na thread que gravou, só se a gravação deu certo.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 8, logger=None):
+        self.workers = max(0, int(workers))
+        self._log = logger
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, max_queue))
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.written = 0
+        self.failed = 0
+        self.bytes_written = 0
+        self.write_s = 0.0
+        self.blocked_s = 0.0
+        for i in range(self.workers):
+            t = threading.Thread(target=self._run, name=f"artifact-writer-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _info(self, msg: str) -> None:
+        if self._log:
+            self._log.info(msg)
+
+    def _error(self, msg: str) -> None:
+        if self._log:
+            self._log.error(msg)
+
+    def submit_b64(self, path: Path, data: str, on_done: Optional[Callable[[Path], None]] = None) -> None:
+        """Enfileira base64 (screenshot/vídeo do driver); decodifica na thread de escrita."""
+        self._submit(Path(path), data, True, on_done)
+
+    def submit_bytes(self, path: Path, data: bytes, on_done: Optional[Callable[[Path], None]] = None) -> None:
+        self._submit(Path(path), data, False, on_done)
+
+    def _submit(self, path: Path, data, is_b64: bool, on_done) -> None:
+        job = (path, data, is_b64, on_done)
+        if not self._threads:
+            self._write(job)
+            return
+        t0 = time.perf_counter()
+        self._queue.put(job)  # bloqueia quando a fila está cheia
+        waited = time.perf_counter() - t0
+        if waited > 0.001:
+            with self._lock:
+                self.blocked_s += waited
+
+    def _write(self, job) -> None:
+        path, data, is_b64, on_done = job
+        t0 = time.perf_counter()
+        try:
+            raw = base64.b64decode(data) if is_b64 else data
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(raw)
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+            self._error(f"[ARTIFACT] failed to write {path}: {type(e).__name__}: {e}")
+            return
+        with self._lock:
+            self.written += 1
+            self.bytes_written += len(raw)
+            self.write_s += time.perf_counter() - t0
+        if on_done:
+            try:
+                on_done(path)
+            except Exception as e:
+                self._error(f"[ARTIFACT] callback failed for {path}: {type(e).__name__}: {e}")
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                self._write(job)
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """Barreira: espera a fila esvaziar (tudo gravado ou falhado)."""
+        if self._threads:
+            self._queue.join()
+
+    def close(self) -> None:
+        self.flush()
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for t in self._threads:
+            t.join(timeout=5)
+        self._threads = []
+        self._info(
+            f"[ARTIFACT] {self.written} file(s) written ({self.bytes_written / 1024 / 1024:.1f}MB, "
+            f"{self.write_s:.2f}s writing, {self.workers} worker(s)), {self.failed} failed, "
+            f"back-pressure waits {self.blocked_s:.2f}s"
+        )
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "written": self.written,
+            "failed": self.failed,
+            "bytes": self.bytes_written,
+            "write_s": round(self.write_s, 3),
+            "blocked_s": round(self.blocked_s, 3),
+        }
@@ -0,0 +1,169 @@
+# utils/async_api_client.py
+# Cliente assíncrono (httpx) para cenários com várias chamadas independentes,
+# disparadas juntas com asyncio.gather / fan_out().
+#
+# Mesmo contrato do ApiClient síncrono (utils/api_client.py): URLs absolutas
+# (ou relativas ao base_url), headers/token por teste e os mesmos listeners
+# (method, url, kwargs, resp, elapsed_s) — o ResourceTracker e a medição de
+# tempo funcionam igual nos dois.
+#
+# Testes `async def` rodam via pytest_pyfunc_call do conftest, com run():
+# um event loop por teste, e os clientes abertos nele são fechados no fim.
+
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Optional
+
+from utils.api_client import DEFAULT_POOL_SIZE, DEFAULT_RETRIES, DEFAULT_TIMEOUT
+
+# clientes com conexão aberta no loop atual (fechados por run())
+_LIVE: List["AsyncApiClient"] = []
+
+
+class AsyncApiClient:
+    def __init__(
+        self,
+        base_url: str = "",
+        timeout: float = DEFAULT_TIMEOUT,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        retries: int = DEFAULT_RETRIES,
+        headers: Optional[dict] = None,
+        listeners: Optional[List[Callable]] = None,
+        cassette=None,
+    ):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.retries = retries
+        self.headers = dict(headers or {})
+        self.listeners: List[Callable] = listeners if listeners is not None else []
+        self.cassette = cassette
+        self.last_token: Optional[str] = None
+        self._client = None
+
+    def set_token(self, token: str) -> str:
+        self.last_token = token
+        return token
+
+    def _http(self):
+        # criado dentro do loop que vai usá-lo (um loop por teste)
+        if self._client is None:
+            import httpx
+
+            limits = httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size)
+            # retries do transport = só falha de conexão (igual ao "connect" do sync)
+            transport = httpx.AsyncHTTPTransport(retries=self.retries, limits=limits)
+            if self.cassette is not None:
+                from utils.cassette import async_cassette_transport
+
+                transport = async_cassette_transport(self.cassette, transport)
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url, timeout=self.timeout, limits=limits, transport=transport
+            )
+            _LIVE.append(self)
+        return self._client
+
+    async def request(self, method: str, url: str, **kwargs):
+        headers = kwargs.pop("headers", None)
+        if self.headers or headers:
+            kwargs["headers"] = {**self.headers, **(headers or {})}
+        t0 = time.perf_counter()
+        resp = await self._http().request(method, url, **kwargs)
+        elapsed = time.perf_counter() - t0
+        for listener in self.listeners:
+            listener(method, str(resp.request.url), kwargs, resp, elapsed)
+        return resp
+
+    async def get(self, url: str, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs):
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs):
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs):
+        return await self.request("DELETE", url, **kwargs)
+
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+
+async def close_live_clients() -> None:
+    while _LIVE:
+        await _LIVE.pop().aclose()
+
+
+def run(coro):
+    """Roda um teste/corrotina num loop novo e fecha os clientes abertos nele."""
+
+    async def _main():
+        try:
+            return await coro
+        finally:
+            await close_live_clients()
+
+    return asyncio.run(_main())
+
+
+# ==========================================================
+# fan-out: várias chamadas independentes ao mesmo tempo
+# ==========================================================
+class Call:
+    """Uma chamada do fan_out: nome legível, a corrotina e a checagem da resposta."""
+
+    def __init__(self, name: str, request: Awaitable, check: Optional[Callable] = None):
+        self.name = name
+        self.request = request
+        self.check = check
+
+
+def expect_status(status: int, detail: Optional[str] = None) -> Callable:
+    """Checagem padrão: status code e, opcionalmente, o campo `detail` do corpo."""
+
+    def _check(resp) -> None:
+        assert resp.status_code == status, f"expected {status}, got {resp.status_code}: {resp.text[:300]}"
+        if detail is not None:
+            got = resp.json().get("detail")
+            assert got == detail, f"expected detail {detail!r}, got {got!r}"
+
+    return _check
+
+
+async def fan_out(*calls: Call, concurrency: Optional[int] = None) -> list:
+    """
+    Dispara as chamadas juntas (no máximo `concurrency` ao mesmo tempo), roda a
+    checagem de cada uma e, se alguma falhar, levanta UM AssertionError com todas
+    as falhas. Devolve as respostas na ordem das chamadas.
+    """
+    sem = asyncio.Semaphore(concurrency) if concurrency else None
+
+    async def _one(call: Call):
+        if sem is None:
+            return await call.request
+        async with sem:
+            return await call.request
+
+    responses = await asyncio.gather(*(_one(c) for c in calls), return_exceptions=True)
+    failures = []
+    for call, resp in zip(calls, responses):
+        if isinstance(resp, BaseException):
+            failures.append(f"{call.name}: {type(resp).__name__}: {resp}")
+            continue
+        if call.check is None:
+            continue
+        try:
+            call.check(resp)
+        except AssertionError as e:
+            failures.append(f"{call.name}: {e}")
+    if failures:
+        raise AssertionError(
+            f"{len(failures)} of {len(calls)} request(s) failed:\n" + "\n".join(f"  - {f}" for f in failures)
+        )
+    return list(responses)
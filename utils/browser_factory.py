@@ -0,0 +1,77 @@
+# utils/browser_factory.py
+# Criação de Chrome/Firefox para a suíte WEB.
+#
+# Perfil padrão: navegador "cheio" (com janela) 1920x1080.
+# Perfil rápido (--fast-profile): headless, page load "eager", sem imagens e
+# fontes baixáveis, sem extensões e sem composição por GPU. O tamanho da janela
+# continua 1920x1080 para o layout (e os seletores) serem os mesmos.
+
+WINDOW_SIZE = (1920, 1080)
+NOTIF_VALUES = {"allow": 1, "block": 2, "ask": 0}
+
+# fontes baixáveis bloqueadas no Chrome via CDP (não existe pref equivalente)
+_FONT_URL_PATTERNS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"]
+
+
+def build_options(browser_name: str, notif_mode: str, fast: bool = False):
+    """Options do Selenium para o navegador/perfil pedidos."""
+    notif_value = NOTIF_VALUES.get(notif_mode, 1)
+
+    if browser_name == "firefox":
+        from selenium.webdriver.firefox.options import Options as FFOptions
+
+        opts = FFOptions()
+        opts.set_preference("permissions.default.desktop-notification", notif_value)
+        opts.set_preference("permissions.default.geo", notif_value)
+        opts.set_preference("dom.webnotifications.enabled", True)
+        opts.set_preference("dom.push.enabled", True)
+        if fast:
+            opts.add_argument("-headless")
+            opts.add_argument(f"--width={WINDOW_SIZE[0]}")
+            opts.add_argument(f"--height={WINDOW_SIZE[1]}")
+            opts.page_load_strategy = "eager"
+            opts.set_preference("permissions.default.image", 2)
+            opts.set_preference("gfx.downloadable_fonts.enabled", False)
+            opts.set_preference("browser.display.use_document_fonts", 0)
+            opts.set_preference("extensions.enabledScopes", 0)
+            opts.set_preference("extensions.autoDisableScopes", 15)
+            opts.set_preference("layers.acceleration.disabled", True)
+            opts.set_preference("gfx.webrender.software", True)
+            opts.set_preference("media.autoplay.default", 5)
+        return opts
+
+    from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+    opts = ChromeOptions()
+    opts.add_argument(f"--window-size={WINDOW_SIZE[0]},{WINDOW_SIZE[1]}")
+    prefs = {"profile.default_content_setting_values.notifications": notif_value}
+    if fast:
+        opts.add_argument("--headless=new")
+        opts.add_argument("--disable-extensions")
+        opts.add_argument("--disable-gpu")
+        opts.add_argument("--disable-gpu-compositing")
+        opts.add_argument("--blink-settings=imagesEnabled=false")
+        opts.page_load_strategy = "eager"
+        prefs["profile.managed_default_content_settings.images"] = 2
+    opts.add_experimental_option("prefs", prefs)
+    return opts
+
+
+def create_browser(browser_name: str, notif_mode: str, service, fast: bool = False):
+    """Abre o navegador com o Service já resolvido (ver utils/driver_resolver.py)."""
+    import selenium.webdriver as swd
+
+    opts = build_options(browser_name, notif_mode, fast=fast)
+    if browser_name == "firefox":
+        drv = swd.Firefox(service=service, options=opts)
+        drv.set_window_size(*WINDOW_SIZE)
+        return drv
+
+    drv = swd.Chrome(service=service, options=opts)
+    if fast:
+        try:
+            drv.execute_cdp_cmd("Network.enable", {})
+            drv.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _FONT_URL_PATTERNS})
+        except Exception:
+            pass
+    return drv
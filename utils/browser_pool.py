@@ -0,0 +1,182 @@
+# utils/browser_pool.py
+# Pool de navegadores (Selenium) reaproveitados durante a sessão inteira.
+# Chave do pool: (browser_name, notif_mode). Entre um teste e outro o estado
+# é zerado (cookies, localStorage/sessionStorage, abas e tamanho da janela) e
+# um health check troca navegadores que caíram por novos.
+#
+# Só navegadores com CDP (Chrome) voltam para o pool:
+#   Chrome  → Network.clearBrowserCookies + Storage.clearDataForOrigin ("all")
+#             para cada origem visitada (URL atual e histórico de cada aba, via
+#             Page.getNavigationHistory) e as origens da casa
+#   Firefox → sem limpeza do perfil inteiro: delete_all_cookies() só enxerga o
+#             documento atual, e a URL das abas não mostra uma origem de fora que
+#             o teste visitou e deixou para trás (ex.: temp-mail → americanas).
+#             O navegador é descartado a cada devolução (um novo por teste).
+# As abas do teste são todas fechadas (sessionStorage é por aba) e o navegador
+# segue numa aba nova em about:blank.
+
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+DEFAULT_WINDOW_SIZE = (1920, 1080)
+
+_CLEAR_STORAGE_JS = """
+try { window.localStorage && window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage && window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+def origin_of(url: str) -> Optional[str]:
+    """'https://www.americanas.com.br/login' → 'https://www.americanas.com.br'; about:/data: → None."""
+    parts = urlsplit(url or "")
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def is_browser_alive(drv) -> bool:
+    """Health check barato: se o driver não responde, o navegador morreu."""
+    try:
+        _ = drv.window_handles
+        drv.execute_script("return 1")
+        return True
+    except Exception:
+        return False
+
+
+def _cdp(drv, cmd: str, params: dict, log: Callable[[str], None]):
+    """Um comando CDP; falha vira log (não some), resultado None."""
+    try:
+        return drv.execute_cdp_cmd(cmd, params)
+    except Exception as e:
+        log(f"[POOL] CDP {cmd} {params or ''} failed: {type(e).__name__}: {e}")
+        return None
+
+
+def _tab_origins(drv, log: Callable[[str], None]) -> Set[str]:
+    """Origens da aba atual: a URL de agora e todo o histórico da aba (CDP)."""
+    urls = [drv.current_url]
+    history = _cdp(drv, "Page.getNavigationHistory", {}, log) or {}
+    urls.extend(e.get("url", "") for e in history.get("entries") or [])
+    return {o for o in map(origin_of, urls) if o}
+
+
+def reset_browser_state(drv, window_size=DEFAULT_WINDOW_SIZE, home_origins: Iterable[str] = (),
+                        log: Callable[[str], None] = None) -> bool:
+    """
+    Deixa o navegador como "recém-aberto". False = não dá para garantir a
+    limpeza (navegador sem CDP, ex.: Firefox): descarte o navegador.
+    """
+    log = log or (lambda msg: None)
+    if not hasattr(drv, "execute_cdp_cmd"):
+        log("[POOL] no CDP to clear the whole profile")
+        return False
+    visited: Set[str] = set()
+    old_handles = list(drv.window_handles)
+    for handle in old_handles:
+        drv.switch_to.window(handle)
+        visited |= _tab_origins(drv, log)
+        # documento atual: storage + cookies do domínio dele
+        drv.execute_script(_CLEAR_STORAGE_JS)
+        drv.delete_all_cookies()
+
+    # aba nova e fecha as do teste: sessionStorage e histórico vão junto
+    drv.switch_to.new_window("tab")
+    fresh = drv.current_window_handle
+    for handle in old_handles:
+        drv.switch_to.window(handle)
+        drv.close()
+    drv.switch_to.window(fresh)
+
+    _cdp(drv, "Network.clearBrowserCookies", {}, log)
+    for origin in sorted(visited | set(home_origins)):
+        _cdp(drv, "Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"}, log)
+
+    drv.get("about:blank")
+    drv.set_window_size(*window_size)
+    return True
+
+
+class BrowserPool:
+    """
+    Mantém navegadores "quentes" por (browser_name, notif_mode).
+
+    factory(browser_name, notif_mode) -> WebDriver é chamada só quando não há
+    navegador ocioso saudável para a chave pedida. home_origins: origens que os
+    testes usam normalmente (limpas a cada devolução mesmo sem aparecer no
+    histórico das abas). Navegador sem CDP não volta para o pool.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str, str], object],
+        window_size: Tuple[int, int] = DEFAULT_WINDOW_SIZE,
+        logger=None,
+        home_origins: Iterable[str] = (),
+    ):
+        self._factory = factory
+        self._window_size = window_size
+        self.home_origins = tuple(home_origins)
+        self._log = logger
+        self._idle: Dict[Tuple[str, str], List[object]] = {}
+        self._all: List[object] = []
+        self._lock = threading.Lock()
+
+    def _info(self, msg: str) -> None:
+        if self._log:
+            self._log.info(msg)
+
+    def acquire(self, browser_name: str, notif_mode: str):
+        key = (browser_name, notif_mode)
+        while True:
+            with self._lock:
+                idle = self._idle.get(key) or []
+                drv = idle.pop() if idle else None
+            if drv is None:
+                break
+            if is_browser_alive(drv):
+                self._info(f"[POOL] reusing {browser_name} browser (notifications={notif_mode})")
+                return drv
+            self._info(f"[POOL] {browser_name} browser failed health check → replacing")
+            self.discard(drv)
+
+        drv = self._factory(browser_name, notif_mode)
+        with self._lock:
+            self._all.append(drv)
+        self._info(f"[POOL] new {browser_name} browser (notifications={notif_mode})")
+        return drv
+
+    def release(self, browser_name: str, notif_mode: str, drv) -> None:
+        """Zera o estado e devolve ao pool; se o reset falhar (ou não garantir a limpeza), descarta."""
+        try:
+            reusable = reset_browser_state(drv, self._window_size, self.home_origins, self._info)
+        except Exception as e:
+            self._info(f"[POOL] reset failed ({type(e).__name__}) → discarding browser")
+            self.discard(drv)
+            return
+        if not reusable:
+            self._info(f"[POOL] {browser_name} browser cannot be fully cleared → discarding")
+            self.discard(drv)
+            return
+        with self._lock:
+            self._idle.setdefault((browser_name, notif_mode), []).append(drv)
+
+    def discard(self, drv) -> None:
+        with self._lock:
+            if drv in self._all:
+                self._all.remove(drv)
+        try:
+            drv.quit()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """Fecha todos os navegadores do pool (fim da sessão)."""
+        with self._lock:
+            drivers, self._all, self._idle = self._all, [], {}
+        for drv in drivers:
+            try:
+                drv.quit()
+            except Exception:
+                pass
@@ -0,0 +1,303 @@
+# utils/cassette.py
+# Gravação/replay das chamadas HTTP da suíte de API (--cassette record|replay).
+#
+# Fica por baixo dos clientes: um HTTPAdapter no requests.Session e um
+# transport no httpx. Em "record" a requisição vai para a rede e o par
+# requisição/resposta é gravado num SQLite (corpo comprimido com zlib); em
+# "replay" a resposta sai do arquivo, sem rede nenhuma.
+#
+# Chave = escopo (nodeid do teste) + n-ésima ocorrência + método + caminho/query
+# + classe de auth + corpo, com os campos dinâmicos trocados por {dynN}:
+#   - sufixo de generate_unique_username (_<ms>) e usernames do UserPool
+#   - token Bearer (JWT) → "bearer"; host/porta não entram (API fake ou real tanto faz)
+# Os mesmos {dynN} são gravados na resposta e, no replay, voltam com os valores
+# gerados AGORA pelo teste (ex.: o email cadastrado aparece na resposta).
+#
+# No replay todo o arquivo vai para um dict na abertura: lookup O(1).
+# Cassete velho: teste alterado depois da gravação (hash do código), gravação
+# mais antiga que --cassette-max-age ou interações gravadas que não foram usadas.
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+CASSETTE_MODES = ("off", "record", "replay")
+DEFAULT_CASSETTE_PATH = Path("data") / "cassettes" / "api.sqlite"
+DEFAULT_MAX_AGE_DAYS = 30.0
+SESSION_SCOPE = "session"
+# valores gerados pelo cliente a cada execução (nunca se repetem entre gravação e replay)
+DYNAMIC_PATTERNS = (
+    re.compile(r"(?<=_)\d{13}(?!\d)"),  # generate_unique_username: <base>_<epoch ms>
+    re.compile(r"pool_[A-Za-z0-9-]+_[0-9a-f]{10}"),  # UserPool: pool_<owner>_<uuid hex>
+)
+# headers de transporte: o corpo gravado já está decodificado
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive", "date"}
+
+
+class CassetteMiss(RuntimeError):
+    """Replay sem gravação para a requisição (cassete velho ou teste novo)."""
+
+
+def dynamic_values(text: str) -> List[str]:
+    """Valores dinâmicos do texto, na ordem da primeira aparição."""
+    found: List[Tuple[int, str]] = []
+    for pattern in DYNAMIC_PATTERNS:
+        found.extend((m.start(), m.group(0)) for m in pattern.finditer(text))
+    values: List[str] = []
+    for _, v in sorted(found):
+        if v not in values:
+            values.append(v)
+    return values
+
+
+def mask(text: str, values: List[str]) -> str:
+    # mais longos primeiro: um valor pode conter outro
+    for i, v in sorted(enumerate(values), key=lambda iv: -len(iv[1])):
+        text = text.replace(v, f"{{dyn{i}}}")
+    return text
+
+
+def unmask(text: str, values: List[str]) -> str:
+    for i, v in enumerate(values):
+        text = text.replace(f"{{dyn{i}}}", v)
+    return text
+
+
+def _auth_class(headers) -> str:
+    auth = (headers or {}).get("Authorization") or (headers or {}).get("authorization")
+    if not auth:
+        return "none"
+    scheme, _, token = auth.partition(" ")
+    # JWT (header.payload.assinatura) muda a cada login; token inválido fixo do teste entra literal
+    return f"{scheme.lower()} jwt" if token.count(".") == 2 else auth
+
+
+def _body_text(body) -> str:
+    if body is None:
+        return ""
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, separators=(",", ":"))
+    except ValueError:
+        return body
+
+
+class Cassette:
+    """
+    mode: "record" | "replay". begin(scope) a cada teste; end() volta para o escopo da sessão.
+    Thread-safe (cleanup paralelo, casos CSV, fan-out async).
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS interactions (
+        key TEXT PRIMARY KEY, scope TEXT NOT NULL, request TEXT NOT NULL,
+        status INTEGER NOT NULL, headers TEXT NOT NULL, body BLOB NOT NULL, recorded_at REAL NOT NULL);
+    CREATE INDEX IF NOT EXISTS ix_interactions_scope ON interactions (scope);
+    CREATE TABLE IF NOT EXISTS scopes (
+        scope TEXT PRIMARY KEY, fingerprint TEXT, recorded_at REAL NOT NULL);
+    """
+
+    def __init__(self, path, mode: str, max_age_days: float = DEFAULT_MAX_AGE_DAYS, logger=None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"cassette mode must be record|replay, got {mode!r}")
+        self.path = Path(path)
+        self.mode = mode
+        self.max_age_s = max_age_days * 86400
+        self._log = logger
+        self._lock = threading.Lock()
+        self._scope = SESSION_SCOPE
+        self._seen: Dict[Tuple[str, str], int] = {}
+        self._index: Dict[str, tuple] = {}
+        self._scope_info: Dict[str, tuple] = {}
+        self._scope_size: Dict[str, int] = {}
+        self._scope_hits: Dict[str, int] = {}
+        self._stale: Dict[str, str] = {}
+        self.hits = self.misses = self.recorded = 0
+        if mode == "replay" and not self.path.exists():
+            raise FileNotFoundError(f"Cassette not found: {self.path} (record it first with --cassette record)")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(self._SCHEMA)
+        if mode == "replay":
+            self._load()
+
+    def _info(self, msg: str) -> None:
+        if self._log:
+            self._log.info(msg)
+
+    def _load(self) -> None:
+        for key, scope, status, headers, body in self._conn.execute(
+            "SELECT key, scope, status, headers, body FROM interactions"
+        ):
+            self._index[key] = (status, headers, body)
+            self._scope_size[scope] = self._scope_size.get(scope, 0) + 1
+        for scope, fingerprint, recorded_at in self._conn.execute("SELECT scope, fingerprint, recorded_at FROM scopes"):
+            self._scope_info[scope] = (fingerprint, recorded_at)
+        self._info(f"[CASSETTE] replaying {len(self._index)} interaction(s) from {self.path}")
+
+    # ---------- escopo (um teste) ----------
+    def begin(self, scope: str, fingerprint: Optional[str] = None) -> Optional[str]:
+        """Abre o escopo do teste. Replay: devolve o motivo se o cassete estiver velho para ele."""
+        self.end()
+        with self._lock:
+            self._scope = scope
+            self._seen = {k: v for k, v in self._seen.items() if k[0] != scope}
+        if self.mode == "record":
+            with self._lock:
+                self._conn.execute("DELETE FROM interactions WHERE scope = ?", (scope,))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO scopes (scope, fingerprint, recorded_at) VALUES (?, ?, ?)",
+                    (scope, fingerprint, time.time()),
+                )
+            return None
+        info = self._scope_info.get(scope)
+        reason = None
+        if info is None:
+            reason = "not recorded"
+        elif fingerprint and info[0] and fingerprint != info[0]:
+            reason = "test changed since recording"
+        elif self.max_age_s and time.time() - info[1] > self.max_age_s:
+            reason = f"recorded {(time.time() - info[1]) / 86400:.0f} day(s) ago"
+        if reason:
+            self._stale[scope] = reason
+        return reason
+
+    def end(self) -> None:
+        with self._lock:
+            scope, self._scope = self._scope, SESSION_SCOPE
+        if self.mode == "replay" and scope != SESSION_SCOPE and scope not in self._stale:
+            unused = self._scope_size.get(scope, 0) - self._scope_hits.get(scope, 0)
+            if unused > 0:
+                self._stale[scope] = f"{unused} recorded interaction(s) not replayed"
+
+    # ---------- chave ----------
+    def _key(self, method: str, url: str, headers, body) -> Tuple[str, str, List[str]]:
+        parts = urlsplit(url)
+        target = parts.path + (f"?{parts.query}" if parts.query else "")
+        text = "\n".join([method.upper(), target, _auth_class(headers), _body_text(body)])
+        values = dynamic_values(text)
+        masked = mask(text, values)
+        with self._lock:
+            scope = self._scope
+            n = self._seen.get((scope, masked), 0)
+            self._seen[(scope, masked)] = n + 1
+        key = hashlib.sha1(f"{scope}\n{n}\n{masked}".encode("utf-8")).hexdigest()
+        method_line, target_line = masked.split("\n", 2)[:2]
+        return key, f"{method_line} {target_line}", values
+
+    # ---------- gravação / replay ----------
+    def lookup(self, method: str, url: str, headers, body) -> Tuple[int, dict, bytes]:
+        key, request, values = self._key(method, url, headers, body)
+        hit = self._index.get(key)
+        with self._lock:
+            scope = self._scope
+            if hit is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._scope_hits[scope] = self._scope_hits.get(scope, 0) + 1
+        if hit is None:
+            stale = self._stale.get(scope)
+            hint = f" — cassette is stale for this test ({stale})" if stale else ""
+            raise CassetteMiss(f"[CASSETTE] no recording for {request} in {scope}{hint}; re-record with --cassette record")
+        status, headers_json, blob = hit
+        content = zlib.decompress(blob)
+        if values and b"{dyn" in content:
+            content = unmask(content.decode("utf-8"), values).encode("utf-8")
+        return status, json.loads(headers_json), content
+
+    def store(self, method: str, url: str, headers, body, status: int, resp_headers, content: bytes) -> None:
+        key, request, values = self._key(method, url, headers, body)
+        if values:
+            content = mask(content.decode("utf-8", errors="replace"), values).encode("utf-8")
+        kept = {k: v for k, v in dict(resp_headers).items() if k.lower() not in _DROP_HEADERS}
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO interactions (key, scope, request, status, headers, body, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, self._scope, request, status, json.dumps(kept), zlib.compress(content), time.time()),
+            )
+            self.recorded += 1
+
+    def stale(self) -> Dict[str, str]:
+        return dict(self._stale)
+
+    def stats(self) -> dict:
+        stats = {"mode": self.mode, "path": str(self.path)}
+        if self.mode == "record":
+            stats["recorded"] = self.recorded
+        else:
+            stats.update({"hits": self.hits, "misses": self.misses, "stale": len(self._stale)})
+        return stats
+
+    def close(self) -> dict:
+        self.end()
+        with self._lock:
+            self._conn.close()
+        return self.stats()
+
+
+# ==========================================================
+# adaptadores: requests (HTTPAdapter) e httpx (transport)
+# ==========================================================
+def cassette_adapter(cassette: Cassette, **adapter_kwargs):
+    """HTTPAdapter do requests que grava ou responde do cassete (mesmos kwargs do HTTPAdapter)."""
+    from requests.adapters import HTTPAdapter
+    from requests.models import Response
+    from requests.structures import CaseInsensitiveDict
+
+    class CassetteAdapter(HTTPAdapter):
+        def send(self, request, **kwargs):
+            if cassette.mode == "replay":
+                status, headers, content = cassette.lookup(request.method, request.url, request.headers, request.body)
+                resp = Response()
+                resp.status_code = status
+                resp.headers = CaseInsensitiveDict(headers)
+                resp._content = content
+                resp.encoding = "utf-8"
+                resp.url = request.url
+                resp.request = request
+                resp.reason = "REPLAYED"
+                resp.connection = self
+                return resp
+            resp = super().send(request, **kwargs)
+            cassette.store(request.method, request.url, request.headers, request.body,
+                           resp.status_code, resp.headers, resp.content)
+            return resp
+
+    return CassetteAdapter(**adapter_kwargs)
+
+
+def async_cassette_transport(cassette: Cassette, inner=None):
+    """Transport do httpx por cima de `inner` (AsyncHTTPTransport) com record/replay."""
+    import httpx
+
+    class AsyncCassetteTransport(httpx.AsyncBaseTransport):
+        async def handle_async_request(self, request):
+            body = request.content
+            if cassette.mode == "replay":
+                status, headers, content = cassette.lookup(request.method, str(request.url), request.headers, body)
+                return httpx.Response(status, headers=headers, content=content, request=request)
+            resp = await inner.handle_async_request(request)
+            content = await resp.aread()
+            await resp.aclose()
+            headers = {k: v for k, v in resp.headers.items() if k.lower() not in _DROP_HEADERS}
+            # o transport devolve o corpo ainda comprimido: o httpx decodifica depois
+            decoded = httpx.Response(resp.status_code, headers=resp.headers, content=content).content
+            cassette.store(request.method, str(request.url), request.headers, body, resp.status_code, headers, decoded)
+            return httpx.Response(resp.status_code, headers=headers, content=decoded, request=request)
+
+        async def aclose(self) -> None:
+            if inner is not None:
+                await inner.aclose()
+
+    return AsyncCassetteTransport()
@@ -0,0 +1,249 @@
+# utils/csv_collector.py
+# Casos de API em CSV (contrato de utils/csv_reader.py) como testes do pytest.
+#
+# Cada linha de um .csv dentro de uma pasta `csv_tests/` vira um item próprio
+# (id = coluna `name`, ou "<arquivo>:<METHOD> <url>"), com marker `api`/`csv`,
+# resultado no dashboard e tempo da requisição em timing.request.
+#
+# Execução: na primeira linha que roda, o arquivo é lido de novo em streaming
+# e as linhas selecionadas neste processo são disparadas em paralelo
+# (`--csv-workers`, client com pool); cada item só espera o próprio resultado.
+# Nem a coleta nem a execução guardam o CSV inteiro na memória: o item só tem
+# o índice da linha, e no máximo 2×workers linhas ficam em voo.
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+import pytest
+
+from utils import reporting as R
+from utils.csv_reader import CSV_DIR, _parse_json_or_none, compile_path, dot_get, iter_csv_cases
+from utils.latency import RequestTimings
+
+DEFAULT_CSV_WORKERS = 8
+# coluna `base` → URL base (vazio/"api" = base da API do projeto)
+CSV_BASE_URLS = {
+    "json": "https://jsonplaceholder.typicode.com",
+    "httpbin": "https://httpbin.org",
+}
+# com xdist, só dá para disparar o arquivo todo se ele inteiro cair no mesmo worker
+_FILE_AFFINE_DISTS = ("loadgroup", "loadfile", "loadscope")
+
+
+class CsvCaseError(AssertionError):
+    """Falha de um caso CSV (mensagem já pronta para o relatório)."""
+
+
+def is_csv_case_file(path: Path) -> bool:
+    return path.suffix == ".csv" and path.parent.name == CSV_DIR.name
+
+
+def _case_url(case: dict, base_url: str) -> str:
+    url = case["url"]
+    if url.startswith(("http://", "https://")):
+        return url
+    base = CSV_BASE_URLS.get(case["base"], base_url)
+    return f"{base.rstrip('/')}/{url.lstrip('/')}"
+
+
+def _matches(got, expected: str) -> bool:
+    # expect_value em JSON (200, true, "x", {...}) compara tipado; senão, como texto
+    parsed = _parse_json_or_none(expected)
+    if parsed is not None and got == parsed:
+        return True
+    return str(got) == expected
+
+
+def run_case(client, case: dict, base_url: str) -> dict:
+    """Faz a requisição da linha e confere status/contains/assert_path. Não levanta."""
+    url = _case_url(case, base_url)
+    kwargs = {k: case[k] for k in ("headers", "params", "json") if case.get(k) is not None}
+    result = {"method": case["method"], "url": url, "status": None, "elapsed": None, "failures": []}
+    t0 = time.perf_counter()
+    try:
+        resp = client.request(case["method"], url, **kwargs)
+    except Exception as e:
+        result["elapsed"] = time.perf_counter() - t0
+        result["failures"].append(f"{type(e).__name__}: {e}")
+        return result
+    result["elapsed"] = time.perf_counter() - t0
+    result["status"] = resp.status_code
+    failures = result["failures"]
+
+    if resp.status_code != case["expect_status"]:
+        failures.append(f"expected status {case['expect_status']}, got {resp.status_code}: {resp.text[:300]}")
+    if case["contains"] and case["contains"] not in resp.text:
+        failures.append(f"body does not contain {case['contains']!r}: {resp.text[:300]}")
+    if case["assert_path"]:
+        try:
+            body = resp.json()
+        except ValueError:
+            failures.append(f"{case['assert_path']}: response is not JSON: {resp.text[:300]}")
+            return result
+        got = dot_get(body, compile_path(case["assert_path"]))
+        if case["expect_value"]:
+            if not _matches(got, case["expect_value"]):
+                failures.append(f"{case['assert_path']}: expected {case['expect_value']!r}, got {got!r}")
+        elif got is None:
+            failures.append(f"{case['assert_path']}: not found in response")
+    return result
+
+
+class CsvFileRunner:
+    """
+    Dispara as linhas selecionadas de um arquivo em paralelo, lendo o CSV em
+    streaming. Sem seleção conhecida (xdist sem afinidade por arquivo), roda
+    cada linha na hora, sequencialmente, com um cursor que avança no arquivo.
+    """
+
+    def __init__(self, path: Path, client_factory: Callable, base_url: Callable, workers: int):
+        self.path = path
+        self._client_factory = client_factory
+        self._base_url = base_url
+        self.workers = max(1, workers)
+        self.selected: Optional[set] = None
+        self._lock = threading.Lock()
+        self._futures: Dict[int, Future] = {}
+        self._started = False
+        self._cursor = None
+        self._cursor_pos = -1
+
+    def select(self, indices: Iterable[int]) -> None:
+        self.selected = set(indices)
+
+    @property
+    def concurrent(self) -> bool:
+        return self.selected is not None and self.workers > 1 and len(self.selected) > 1
+
+    def _start(self) -> None:
+        client, base_url = self._client_factory(), self._base_url()
+        self._futures = {i: Future() for i in self.selected}
+        pending = dict(self._futures)  # result() tira do dict; o dispatch usa a cópia
+        in_flight = threading.BoundedSemaphore(self.workers * 2)
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="csv")
+
+        def _one(case: dict, fut: Future) -> None:
+            try:
+                fut.set_result(run_case(client, case, base_url))
+            except BaseException as e:
+                fut.set_exception(e)
+            finally:
+                in_flight.release()
+
+        def _dispatch() -> None:
+            try:
+                for idx, case in enumerate(iter_csv_cases(self.path)):
+                    fut = pending.pop(idx, None)
+                    if fut is None:
+                        continue
+                    in_flight.acquire()
+                    pool.submit(_one, case, fut)
+            except BaseException as e:
+                for fut in pending.values():
+                    if not fut.done():
+                        fut.set_exception(e)
+            finally:
+                pool.shutdown(wait=False)
+
+        threading.Thread(target=_dispatch, name=f"csv-{self.path.name}", daemon=True).start()
+
+    def _case_at(self, index: int) -> dict:
+        # itens rodam na ordem do arquivo: o cursor só recomeça se voltar
+        if self._cursor is None or index <= self._cursor_pos:
+            self._cursor, self._cursor_pos = iter_csv_cases(self.path), -1
+        for case in self._cursor:
+            self._cursor_pos += 1
+            if self._cursor_pos == index:
+                return case
+        raise IndexError(f"{self.path.name}: row {index} not found")
+
+    def result(self, index: int) -> dict:
+        if self.concurrent and index in self.selected:
+            with self._lock:
+                if not self._started:
+                    self._started = True
+                    try:
+                        self._start()
+                    except Exception:
+                        self.selected = None  # sem client: cada linha tenta (e falha) sozinha
+                        raise
+            return self._futures.pop(index).result()
+        return run_case(self._client_factory(), self._case_at(index), self._base_url())
+
+
+class CsvCaseItem(pytest.Item):
+    fixturenames = ()
+
+    def __init__(self, *, index: int, line: int, case_name: str, **kwargs):
+        super().__init__(**kwargs)
+        self.index = index
+        self.line = line
+        self.case_name = case_name
+        self.add_marker(pytest.mark.api)
+        self.add_marker(pytest.mark.csv)
+        self.add_marker(pytest.mark.xdist_group(name=f"csv-{self.path.name}"))
+
+    def runtest(self) -> None:
+        result = self.parent.runner.result(self.index)
+        if result["elapsed"] is not None:
+            R.record_timing(self, "request", result["elapsed"])
+        if result["status"] is not None:
+            timings = RequestTimings()
+            timings.add(result["method"], result["url"], result["status"], result["elapsed"])
+            R.add_meta(self, "latency", timings.to_dict())
+        R.add_meta(self, "csv", {"line": self.line, "request": f"{result['method']} {result['url']}",
+                                 "status": result["status"]})
+        if result["failures"]:
+            raise CsvCaseError(
+                f"{result['method']} {result['url']} ({self.path.name}:{self.line})\n"
+                + "\n".join(f"  - {f}" for f in result["failures"])
+            )
+
+    def repr_failure(self, excinfo):
+        if isinstance(excinfo.value, CsvCaseError):
+            return str(excinfo.value)
+        return super().repr_failure(excinfo)
+
+    def reportinfo(self):
+        return self.path, self.line - 1, self.case_name
+
+
+class CsvFile(pytest.File):
+    """
+    client_factory: () → client com pool (criado só quando a 1ª linha roda).
+    base_url: () → URL base da API do projeto (lida na execução, não na coleta).
+    """
+
+    def __init__(self, *, client_factory: Callable, base_url: Callable, workers: int, **kwargs):
+        super().__init__(**kwargs)
+        self.runner = CsvFileRunner(self.path, client_factory, base_url, workers)
+
+    def collect(self):
+        seen: Dict[str, int] = {}
+        for idx, case in enumerate(iter_csv_cases(self.path)):
+            name = case["name"]
+            seen[name] = seen.get(name, 0) + 1
+            if seen[name] > 1:
+                name = f"{name} #{seen[name]}"
+            yield CsvCaseItem.from_parent(self, name=name, index=idx, line=case["_line"], case_name=name)
+
+
+def plan_csv_runs(items, config) -> None:
+    """
+    Depois da seleção (-k/-m/--lf): avisa cada arquivo quais linhas rodam neste
+    processo, para que o runner as dispare juntas. Worker do xdist sem afinidade
+    por arquivo não sabe o que vai receber → fica sequencial.
+    """
+    workerinput = getattr(config, "workerinput", None)
+    # o worker zera option.dist: o modo vem do controller via workerinput (conftest)
+    if workerinput is not None and workerinput.get("dist") not in _FILE_AFFINE_DISTS:
+        return
+    by_file: Dict[CsvFile, list] = {}
+    for item in items:
+        if isinstance(item, CsvCaseItem):
+            by_file.setdefault(item.parent, []).append(item.index)
+    for csv_file, indices in by_file.items():
+        csv_file.runner.select(indices)
@@ -1,6 +1,7 @@
 # utils/csv_reader.py
 import csv
 import json
+from functools import lru_cache
 from pathlib import Path
 
 CSV_DIR = Path("csv_tests")
@@ -18,6 +19,42 @@ def _parse_json_or_none(val):
         return None  # mantém “burrinho”: se não for JSON válido, ignora
 
 
+def _normalize_row(row, p: Path, line: int):
+    # normalizações “burrinhas”
+    row["_file"] = p.name
+    row["_line"] = line
+    row["method"] = (row.get("method") or "GET").strip().upper()
+    row["url"] = (row.get("url") or "").strip()
+    row["base"] = (row.get("base") or "").strip().lower()
+    row["headers"] = _parse_json_or_none(row.get("headers"))
+    row["params"] = _parse_json_or_none(row.get("params"))
+    row["json"] = _parse_json_or_none(row.get("json"))
+    try:
+        row["expect_status"] = int(row.get("expect_status") or 200)
+    except ValueError:
+        row["expect_status"] = 200
+    row["assert_path"] = (row.get("assert_path") or "").strip()
+    row["expect_value"] = (row.get("expect_value") or "").strip()
+    row["contains"] = (row.get("contains") or "").strip()
+    row["name"] = (
+        row.get("name") or f"{p.stem}:{row['method']} {row['url']}"
+    ).strip()
+    return row
+
+
+def iter_csv_cases(path):
+    """
+    Lê UM .csv linha a linha (gerador): arquivos grandes não ficam inteiros
+    na memória. Mesmas colunas/normalizações de load_all_csv_cases;
+    `_line` = linha do arquivo onde o caso termina.
+    """
+    p = Path(path)
+    with p.open(newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield _normalize_row(row, p, reader.line_num)
+
+
 def load_all_csv_cases():
     """
     Lê todos os .csv em csv_tests/ e retorna uma lista de dicts.
@@ -38,46 +75,39 @@ def load_all_csv_cases():
     if not CSV_DIR.exists():
         return cases
     for p in sorted(CSV_DIR.glob("*.csv")):
-        with p.open(newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # normalizações “burrinhas”
-                row["_file"] = p.name
-                row["method"] = (row.get("method") or "GET").strip().upper()
-                row["url"] = (row.get("url") or "").strip()
-                row["base"] = (row.get("base") or "").strip().lower()
-                row["headers"] = _parse_json_or_none(row.get("headers"))
-                row["params"] = _parse_json_or_none(row.get("params"))
-                row["json"] = _parse_json_or_none(row.get("json"))
-                try:
-                    row["expect_status"] = int(row.get("expect_status") or 200)
-                except ValueError:
-                    row["expect_status"] = 200
-                row["assert_path"] = (row.get("assert_path") or "").strip()
-                row["expect_value"] = (row.get("expect_value") or "").strip()
-                row["contains"] = (row.get("contains") or "").strip()
-                row["name"] = (
-                    row.get("name") or f"{p.stem}:{row['method']} {row['url']}"
-                ).strip()
-                cases.append(row)
+        cases.extend(iter_csv_cases(p))
     return cases
 
 
+@lru_cache(maxsize=1024)
+def compile_path(path):
+    """
+    "items.0.name" → (("items", None), ("0", 0), ("name", None)): cada parte
+    com o índice inteiro já convertido (None se não for número). Compilado uma
+    vez por caminho distinto (cache), não a cada avaliação.
+    """
+    steps = []
+    for part in path.split("."):
+        try:
+            idx = int(part)
+        except ValueError:
+            idx = None
+        steps.append((part, idx))
+    return tuple(steps)
+
+
 def dot_get(data, path):
     """
     Busca “burrinha” por caminho tipo: "0.title" ou "owner.login" ou "items.0.name"
     Suporta listas e dicts. Se não achar, retorna None.
+    `path` pode ser o texto ou o resultado de compile_path().
     """
     if not path:
         return None
     cur = data
-    for part in path.split("."):
+    for part, idx in (compile_path(path) if isinstance(path, str) else path):
         if isinstance(cur, list):
-            try:
-                idx = int(part)
-            except ValueError:
-                return None
-            if 0 <= idx < len(cur):
+            if idx is not None and 0 <= idx < len(cur):
                 cur = cur[idx]
             else:
                 return None
@@ -88,4 +118,4 @@ def dot_get(data, path):
                 return None
         else:
             return None
-    return cur
\ No newline at end of file
+    return cur
@@ -0,0 +1,157 @@
+# utils/driver_resolver.py
+# Resolve o binário do chromedriver/geckodriver UMA vez por sessão, com um
+# manifest local por versão major do navegador. Se o binário já está em cache,
+# não toca na rede (funciona em runner air-gapped).
+#
+# Uso:
+#   resolver = DriverResolver(offline=False, logger=LOG)
+#   service = resolver.service("chrome")   # selenium Service pronto p/ o driver
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_CACHE_DIR = Path(
+    os.getenv("DRIVER_CACHE_DIR", str(Path.home() / ".cache" / "cesar-automation" / "drivers"))
+)
+MANIFEST_NAME = "manifest.json"
+
+
+def _env_offline() -> bool:
+    return os.getenv("DRIVERS_OFFLINE", "").lower() in ("1", "true", "yes")
+
+
+def detect_browser_version(browser_name: str) -> Optional[str]:
+    """Versão instalada do navegador (comando local `--version`, sem rede)."""
+    from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
+
+    browser_type = "firefox" if browser_name == "firefox" else ChromeType.GOOGLE
+    try:
+        return OperationSystemManager().get_browser_version_from_os(browser_type)
+    except Exception:
+        return None
+
+
+def _install_driver(browser_name: str, wdm_root: Optional[Path] = None) -> str:
+    """
+    Caminho "antigo": webdriver_manager (pode consultar a rede).
+    wdm_root: pasta de cache do webdriver_manager (default: ~/.wdm).
+    """
+    from webdriver_manager.core.driver_cache import DriverCacheManager
+
+    cache_manager = DriverCacheManager(root_dir=str(wdm_root)) if wdm_root else None
+    if browser_name == "firefox":
+        from webdriver_manager.firefox import GeckoDriverManager
+
+        return GeckoDriverManager(cache_manager=cache_manager).install()
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    return ChromeDriverManager(cache_manager=cache_manager).install()
+
+
+class DriverResolver:
+    """
+    Cache de drivers por sessão + manifest em disco:
+
+        {"chrome-131": {"path": ".../chromedriver", "browser_version": "131.0.6778.85",
+                        "resolved_at": "2025-11-10 10:00:00"}}
+
+    Ordem de resolução: memória da sessão → manifest (sem rede) → webdriver_manager.
+    Em modo offline (ou se a instalação falhar) usa a entrada mais recente do
+    mesmo navegador que exista no disco.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, offline: Optional[bool] = None, logger=None,
+                 wdm_root: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.offline = _env_offline() if offline is None else offline
+        self._log = logger
+        self._wdm_root = wdm_root  # cache do webdriver_manager (None = ~/.wdm)
+        self._paths: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    # ----- manifest -----
+    @property
+    def manifest_path(self) -> Path:
+        return self.cache_dir / MANIFEST_NAME
+
+    def _load_manifest(self) -> dict:
+        try:
+            return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+
+    def _save_manifest(self, manifest: dict) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        os.replace(tmp, self.manifest_path)
+
+    def _info(self, msg: str) -> None:
+        if self._log:
+            self._log.info(msg)
+
+    # ----- resolução -----
+    def resolve(self, browser_name: str) -> str:
+        """Caminho do driver para o navegador (chrome | firefox)."""
+        browser_name = "firefox" if browser_name == "firefox" else "chrome"
+        with self._lock:
+            if browser_name not in self._paths:
+                self._paths[browser_name] = self._resolve_uncached(browser_name)
+            return self._paths[browser_name]
+
+    def _resolve_uncached(self, browser_name: str) -> str:
+        version = detect_browser_version(browser_name)
+        major = version.split(".")[0] if version else "unknown"
+        key = f"{browser_name}-{major}"
+
+        manifest = self._load_manifest()
+        entry = manifest.get(key)
+        if entry and Path(entry.get("path", "")).exists():
+            self._info(f"[DRIVERS] {key} → cache hit: {entry['path']}")
+            return entry["path"]
+
+        if self.offline:
+            return self._fallback(browser_name, manifest, reason="offline mode")
+
+        try:
+            path = _install_driver(browser_name, self._wdm_root)
+        except Exception as e:
+            return self._fallback(browser_name, manifest, reason=f"{type(e).__name__}: {e}")
+
+        manifest[key] = {
+            "path": path,
+            "browser_version": version or "",
+            "resolved_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self._save_manifest(manifest)
+        self._info(f"[DRIVERS] {key} → installed: {path}")
+        return path
+
+    def _fallback(self, browser_name: str, manifest: dict, reason: str) -> str:
+        candidates = [
+            e for k, e in manifest.items()
+            if k.startswith(f"{browser_name}-") and Path(e.get("path", "")).exists()
+        ]
+        if not candidates:
+            raise RuntimeError(
+                f"No cached {browser_name} driver in {self.manifest_path} ({reason}). "
+                f"Run once with network access to populate the cache."
+            )
+        entry = max(candidates, key=lambda e: e.get("resolved_at", ""))
+        self._info(f"[DRIVERS] {browser_name} → using cached driver ({reason}): {entry['path']}")
+        return entry["path"]
+
+    def service(self, browser_name: str):
+        """Service novo (um por navegador aberto) apontando p/ o driver resolvido."""
+        path = self.resolve(browser_name)
+        if browser_name == "firefox":
+            from selenium.webdriver.firefox.service import Service as FirefoxService
+
+            return FirefoxService(path)
+        from selenium.webdriver.chrome.service import Service as ChromeService
+
+        return ChromeService(path)
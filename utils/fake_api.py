@@ -0,0 +1,641 @@
+# utils/fake_api.py
+# API de wishlist "de mentira" (mesmo contrato que a suíte exercita) para rodar
+# os testes de API — e o catálogo dos testes web/mobile — sem o serviço real:
+#   /auth/register, /auth/login, /users/me
+#   /wishlists, /wishlists/{id}, /wishlists/{id}/products
+#   /products/{id}, /products/{id}/toggle
+#
+# Backends: "memory" (dicts) ou "sqlite" (arquivo ou :memory:). Sobe em thread
+# numa porta livre, com latência e erro injetáveis (semente fixa → reprodutível).
+# Já nasce com o usuário padrão (projeto@example.com) e a wishlist projeto_final.
+#
+# Uso:
+#   python -m utils.fake_api --port 8000 --backend sqlite --db /tmp/fake_api.sqlite
+#   pytest -m api --api-backend memory
+
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import random
+import re
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+API_BACKENDS = ("live", "memory", "sqlite")
+TOKEN_TTL_S = 30 * 60
+PRODUCT_FIELDS = ("Product", "Price", "Zipcode", "delivery_estimate", "shipping_fee")
+REQUIRED_PRODUCT_FIELDS = ("Product", "Price")
+
+DEFAULT_USER = {"username": "projeto", "email": "projeto@example.com", "password": "Senha123!"}
+DEFAULT_WISHLIST = "projeto_final"
+DEFAULT_PRODUCTS = (
+    {"Product": "Fone de Ouvido Bluetooth JBL Tune 520BT", "Price": "299.00", "Zipcode": "01310100",
+     "delivery_estimate": "5 days", "shipping_fee": "19.90"},
+    {"Product": "Smartwatch Xiaomi Redmi Watch 5 Active", "Price": "349.00", "Zipcode": "01310100",
+     "delivery_estimate": "7 days", "shipping_fee": "0.00"},
+    {"Product": "Caixa de Som Bluetooth JBL Go 4", "Price": "279.00", "Zipcode": "01310100",
+     "delivery_estimate": "3 days", "shipping_fee": "12.50"},
+)
+
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def _hash(password: str) -> str:
+    return hashlib.sha256(password.encode("utf-8")).hexdigest()
+
+
+# ==========================================================
+# tokens (JWT HS256 com exp — o UserPool/catálogo leem o exp)
+# ==========================================================
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _unb64(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def make_token(secret: bytes, sub: str, ttl: float = TOKEN_TTL_S) -> str:
+    header = _b64(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    payload = _b64(json.dumps({"sub": sub, "exp": int(time.time() + ttl)}).encode())
+    sig = hmac.new(secret, f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64(sig)}"
+
+
+def read_token(secret: bytes, token: str) -> Tuple[Optional[str], Optional[str]]:
+    """(sub, None) se válido; (None, "expired"|"invalid") senão."""
+    try:
+        header, payload, sig = token.split(".")
+        expected = hmac.new(secret, f"{header}.{payload}".encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, _unb64(sig)):
+            return None, "invalid"
+        claims = json.loads(_unb64(payload))
+    except Exception:
+        return None, "invalid"
+    if claims.get("exp", 0) < time.time():
+        return None, "expired"
+    return claims.get("sub"), None
+
+
+# ==========================================================
+# backends (mesma interface; devolvem dicts no formato da API)
+# ==========================================================
+class MemoryStore:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._ids = 0
+        self.users = {}
+        self.wishlists = {}
+        self.products = {}
+
+    def _next_id(self) -> int:
+        self._ids += 1
+        return self._ids
+
+    def create_user(self, username: str, email: str, password: str) -> Optional[dict]:
+        with self.lock:
+            if any(u["email"] == email for u in self.users.values()):
+                return None
+            user = {"id": self._next_id(), "username": username, "email": email, "password": _hash(password)}
+            self.users[user["id"]] = user
+            return user
+
+    def user_by_email(self, email: str) -> Optional[dict]:
+        with self.lock:
+            return next((u for u in self.users.values() if u["email"] == email), None)
+
+    def delete_user(self, user_id: int) -> None:
+        with self.lock:
+            for wid in [w["id"] for w in self.wishlists.values() if w["owner_id"] == user_id]:
+                self._delete_wishlist(wid)
+            self.users.pop(user_id, None)
+
+    def create_wishlist(self, owner_id: int, name: str) -> Optional[dict]:
+        with self.lock:
+            if any(w["owner_id"] == owner_id and w["name"] == name for w in self.wishlists.values()):
+                return None
+            wishlist = {"id": self._next_id(), "name": name, "owner_id": owner_id}
+            self.wishlists[wishlist["id"]] = wishlist
+            return dict(wishlist)
+
+    def list_wishlists(self, owner_id: int) -> List[dict]:
+        with self.lock:
+            return [dict(w) for w in self.wishlists.values() if w["owner_id"] == owner_id]
+
+    def get_wishlist(self, wishlist_id: int) -> Optional[dict]:
+        with self.lock:
+            w = self.wishlists.get(wishlist_id)
+            return dict(w) if w else None
+
+    def _delete_wishlist(self, wishlist_id: int) -> None:
+        self.wishlists.pop(wishlist_id, None)
+        for pid in [p["id"] for p in self.products.values() if p["wishlist_id"] == wishlist_id]:
+            self.products.pop(pid)
+
+    def delete_wishlist(self, wishlist_id: int) -> None:
+        with self.lock:
+            self._delete_wishlist(wishlist_id)
+
+    def add_product(self, wishlist_id: int, fields: dict) -> dict:
+        with self.lock:
+            product = {"id": self._next_id(), "wishlist_id": wishlist_id,
+                       **{k: fields.get(k) for k in PRODUCT_FIELDS}, "is_purchased": False}
+            self.products[product["id"]] = product
+            return dict(product)
+
+    def list_products(self, wishlist_id: int) -> List[dict]:
+        with self.lock:
+            return [dict(p) for p in self.products.values() if p["wishlist_id"] == wishlist_id]
+
+    def get_product(self, product_id: int) -> Optional[dict]:
+        with self.lock:
+            p = self.products.get(product_id)
+            return dict(p) if p else None
+
+    def update_product(self, product_id: int, fields: dict) -> Optional[dict]:
+        with self.lock:
+            p = self.products.get(product_id)
+            if p is None:
+                return None
+            p.update(fields)
+            return dict(p)
+
+    def delete_product(self, product_id: int) -> None:
+        with self.lock:
+            self.products.pop(product_id, None)
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteStore:
+    """Uma conexão (check_same_thread=False) serializada por lock: simples e previsível."""
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY, username TEXT, email TEXT UNIQUE NOT NULL, password TEXT NOT NULL);
+    CREATE TABLE IF NOT EXISTS wishlists (
+        id INTEGER PRIMARY KEY, name TEXT NOT NULL,
+        owner_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE, UNIQUE (owner_id, name));
+    CREATE TABLE IF NOT EXISTS products (
+        id INTEGER PRIMARY KEY, wishlist_id INTEGER NOT NULL REFERENCES wishlists(id) ON DELETE CASCADE,
+        product TEXT, price TEXT, zipcode TEXT, delivery_estimate TEXT, shipping_fee TEXT,
+        is_purchased INTEGER NOT NULL DEFAULT 0);
+    CREATE INDEX IF NOT EXISTS ix_wishlists_owner ON wishlists (owner_id);
+    CREATE INDEX IF NOT EXISTS ix_products_wishlist ON products (wishlist_id);
+    """
+    _COLUMNS = {"Product": "product", "Price": "price", "Zipcode": "zipcode",
+                "delivery_estimate": "delivery_estimate", "shipping_fee": "shipping_fee",
+                "is_purchased": "is_purchased"}
+
+    def __init__(self, path: str = ":memory:"):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(self._SCHEMA)
+
+    def _one(self, sql: str, args=()) -> Optional[sqlite3.Row]:
+        with self.lock:
+            return self.conn.execute(sql, args).fetchone()
+
+    def _all(self, sql: str, args=()) -> List[sqlite3.Row]:
+        with self.lock:
+            return self.conn.execute(sql, args).fetchall()
+
+    def _write(self, sql: str, args=()) -> sqlite3.Cursor:
+        with self.lock:
+            return self.conn.execute(sql, args)
+
+    @staticmethod
+    def _product(row) -> Optional[dict]:
+        if row is None:
+            return None
+        return {"id": row["id"], "wishlist_id": row["wishlist_id"], "Product": row["product"],
+                "Price": row["price"], "Zipcode": row["zipcode"], "delivery_estimate": row["delivery_estimate"],
+                "shipping_fee": row["shipping_fee"], "is_purchased": bool(row["is_purchased"])}
+
+    def create_user(self, username: str, email: str, password: str) -> Optional[dict]:
+        try:
+            cur = self._write("INSERT INTO users (username, email, password) VALUES (?, ?, ?)",
+                              (username, email, _hash(password)))
+        except sqlite3.IntegrityError:
+            return None
+        return {"id": cur.lastrowid, "username": username, "email": email, "password": _hash(password)}
+
+    def user_by_email(self, email: str) -> Optional[dict]:
+        row = self._one("SELECT * FROM users WHERE email = ?", (email,))
+        return dict(row) if row else None
+
+    def delete_user(self, user_id: int) -> None:
+        self._write("DELETE FROM users WHERE id = ?", (user_id,))
+
+    def create_wishlist(self, owner_id: int, name: str) -> Optional[dict]:
+        try:
+            cur = self._write("INSERT INTO wishlists (name, owner_id) VALUES (?, ?)", (name, owner_id))
+        except sqlite3.IntegrityError:
+            return None
+        return {"id": cur.lastrowid, "name": name, "owner_id": owner_id}
+
+    def list_wishlists(self, owner_id: int) -> List[dict]:
+        return [dict(r) for r in self._all("SELECT id, name, owner_id FROM wishlists WHERE owner_id = ?", (owner_id,))]
+
+    def get_wishlist(self, wishlist_id: int) -> Optional[dict]:
+        row = self._one("SELECT id, name, owner_id FROM wishlists WHERE id = ?", (wishlist_id,))
+        return dict(row) if row else None
+
+    def delete_wishlist(self, wishlist_id: int) -> None:
+        self._write("DELETE FROM wishlists WHERE id = ?", (wishlist_id,))
+
+    def add_product(self, wishlist_id: int, fields: dict) -> dict:
+        cur = self._write(
+            "INSERT INTO products (wishlist_id, product, price, zipcode, delivery_estimate, shipping_fee)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (wishlist_id, *(fields.get(k) for k in PRODUCT_FIELDS)),
+        )
+        return self.get_product(cur.lastrowid)
+
+    def list_products(self, wishlist_id: int) -> List[dict]:
+        return [self._product(r) for r in self._all("SELECT * FROM products WHERE wishlist_id = ?", (wishlist_id,))]
+
+    def get_product(self, product_id: int) -> Optional[dict]:
+        return self._product(self._one("SELECT * FROM products WHERE id = ?", (product_id,)))
+
+    def update_product(self, product_id: int, fields: dict) -> Optional[dict]:
+        if fields:
+            sets = ", ".join(f"{self._COLUMNS[k]} = ?" for k in fields)
+            self._write(f"UPDATE products SET {sets} WHERE id = ?", (*fields.values(), product_id))
+        return self.get_product(product_id)
+
+    def delete_product(self, product_id: int) -> None:
+        self._write("DELETE FROM products WHERE id = ?", (product_id,))
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+
+def build_store(backend: str, db_path: str = ":memory:"):
+    if backend == "memory":
+        return MemoryStore()
+    if backend == "sqlite":
+        return SqliteStore(db_path)
+    raise ValueError(f"Unknown fake API backend {backend!r} (use memory or sqlite)")
+
+
+def seed_default_user(store) -> None:
+    """Usuário padrão + wishlist projeto_final com 3 produtos (catálogo dos testes web/mobile)."""
+    user = store.create_user(**DEFAULT_USER) or store.user_by_email(DEFAULT_USER["email"])
+    wishlist = store.create_wishlist(user["id"], DEFAULT_WISHLIST)
+    if wishlist is not None:
+        for product in DEFAULT_PRODUCTS:
+            store.add_product(wishlist["id"], product)
+
+
+# ==========================================================
+# regras da API (independentes do HTTP)
+# ==========================================================
+class ApiError(Exception):
+    def __init__(self, status: int, detail: str):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+class FakeApiState:
+    """
+    latency: (min_s, max_s) somado a cada requisição.
+    error_rate: fração das requisições respondidas com error_status (antes de tocar no store).
+    """
+
+    def __init__(self, store, latency: Tuple[float, float] = (0.0, 0.0), error_rate: float = 0.0,
+                 error_status: int = 503, seed: int = 0, token_ttl: float = TOKEN_TTL_S):
+        self.store = store
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.token_ttl = token_ttl
+        self.secret = hashlib.sha256(f"fake-api-{seed}".encode()).digest()
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.requests = 0
+        self.injected_errors = 0
+
+    def chaos(self) -> Tuple[float, bool]:
+        """(atraso, injeta_erro) da próxima requisição."""
+        with self._rng_lock:
+            self.requests += 1
+            lo, hi = self.latency
+            delay = lo if hi <= lo else self._rng.uniform(lo, hi)
+            fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+            self.injected_errors += fail
+        return delay, fail
+
+    # ---------- auth ----------
+    def authenticate(self, authorization: Optional[str]) -> dict:
+        if not authorization or not authorization.lower().startswith("bearer "):
+            raise ApiError(401, "Not authenticated")
+        email, error = read_token(self.secret, authorization[7:].strip())
+        if error == "expired":
+            raise ApiError(401, "Token has expired")
+        user = self.store.user_by_email(email) if email else None
+        if user is None:
+            raise ApiError(401, "Could not validate credentials")
+        return user
+
+    def register(self, body: dict) -> dict:
+        username, email, password = (str(body.get(k) or "").strip() for k in ("username", "email", "password"))
+        if not username or not email or not password:
+            raise ApiError(422, "Missing data")
+        if not _EMAIL_RE.match(email):
+            raise ApiError(422, "Invalid email format")
+        user = self.store.create_user(username, email, password)
+        if user is None:
+            raise ApiError(400, "Email already registered")
+        return {"id": user["id"], "username": user["username"], "email": user["email"]}
+
+    def login(self, body: dict) -> dict:
+        user = self.store.user_by_email(str(body.get("email") or ""))
+        if user is None or user["password"] != _hash(str(body.get("password") or "")):
+            raise ApiError(401, "Incorrect email or password")
+        return {"access_token": make_token(self.secret, user["email"], self.token_ttl), "token_type": "bearer"}
+
+    # ---------- wishlists ----------
+    def create_wishlist(self, user: dict, body: dict) -> dict:
+        name = str(body.get("name") or "").strip()
+        if not name:
+            raise ApiError(422, "Missing name")
+        wishlist = self.store.create_wishlist(user["id"], name)
+        if wishlist is None:
+            raise ApiError(409, "Wishlist already exists")
+        return wishlist
+
+    def own_wishlist(self, user: dict, wishlist_id: int) -> dict:
+        wishlist = self.store.get_wishlist(wishlist_id)
+        if wishlist is None or wishlist["owner_id"] != user["id"]:
+            raise ApiError(404, "Wishlist not found")
+        return wishlist
+
+    def add_product(self, user: dict, wishlist_id: int, body: dict) -> dict:
+        self.own_wishlist(user, wishlist_id)
+        if any(not str(body.get(k) or "").strip() for k in REQUIRED_PRODUCT_FIELDS):
+            raise ApiError(422, "Missing product data")
+        return self.store.add_product(wishlist_id, body)
+
+    def list_products(self, user: dict, wishlist_id: int, query: dict) -> List[dict]:
+        self.own_wishlist(user, wishlist_id)
+        products = self.store.list_products(wishlist_id)
+        name = (query.get("Product") or [""])[0].lower()
+        if name:
+            products = [p for p in products if name in (p["Product"] or "").lower()]
+        purchased = (query.get("is_purchased") or [""])[0].lower()
+        if purchased in ("true", "false"):
+            products = [p for p in products if p["is_purchased"] == (purchased == "true")]
+        return products
+
+    # ---------- produtos ----------
+    def own_product(self, user: dict, product_id: int) -> dict:
+        product = self.store.get_product(product_id)
+        if product is None:
+            raise ApiError(404, "Product not found")
+        wishlist = self.store.get_wishlist(product["wishlist_id"])
+        if wishlist is None or wishlist["owner_id"] != user["id"]:
+            raise ApiError(404, "Product not found")
+        return product
+
+    def update_product(self, user: dict, product_id: int, body: dict) -> dict:
+        self.own_product(user, product_id)
+        fields = {k: body[k] for k in PRODUCT_FIELDS if k in body}
+        if "is_purchased" in body:
+            fields["is_purchased"] = bool(body["is_purchased"])
+        return self.store.update_product(product_id, fields)
+
+    def toggle_product(self, user: dict, product_id: int) -> dict:
+        product = self.own_product(user, product_id)
+        return self.store.update_product(product_id, {"is_purchased": not product["is_purchased"]})
+
+
+# (método, regex do path) → handler(state, user, match, body, query) → (status, corpo)
+_ROUTES = []
+
+
+def _route(method: str, pattern: str, auth: bool = True):
+    def deco(fn):
+        _ROUTES.append((method, re.compile(f"^{pattern}$"), auth, fn))
+        return fn
+    return deco
+
+
+@_route("POST", "/auth/register", auth=False)
+def _register(state, user, m, body, query):
+    return 200, state.register(body)
+
+
+@_route("POST", "/auth/login", auth=False)
+def _login(state, user, m, body, query):
+    return 200, state.login(body)
+
+
+@_route("DELETE", "/users/me")
+def _delete_me(state, user, m, body, query):
+    state.store.delete_user(user["id"])
+    return 204, None
+
+
+@_route("POST", "/wishlists")
+def _create_wishlist(state, user, m, body, query):
+    return 200, state.create_wishlist(user, body)
+
+
+@_route("GET", "/wishlists")
+def _list_wishlists(state, user, m, body, query):
+    return 200, state.store.list_wishlists(user["id"])
+
+
+@_route("DELETE", r"/wishlists/(\d+)")
+def _delete_wishlist(state, user, m, body, query):
+    state.store.delete_wishlist(state.own_wishlist(user, int(m.group(1)))["id"])
+    return 204, None
+
+
+@_route("POST", r"/wishlists/(\d+)/products")
+def _add_product(state, user, m, body, query):
+    return 200, state.add_product(user, int(m.group(1)), body)
+
+
+@_route("GET", r"/wishlists/(\d+)/products")
+def _list_products(state, user, m, body, query):
+    return 200, state.list_products(user, int(m.group(1)), query)
+
+
+@_route("PUT", r"/products/(\d+)")
+def _update_product(state, user, m, body, query):
+    return 200, state.update_product(user, int(m.group(1)), body)
+
+
+@_route("DELETE", r"/products/(\d+)")
+def _delete_product(state, user, m, body, query):
+    state.store.delete_product(state.own_product(user, int(m.group(1)))["id"])
+    return 204, None
+
+
+@_route("PATCH", r"/products/(\d+)/toggle")
+def _toggle_product(state, user, m, body, query):
+    return 200, state.toggle_product(user, int(m.group(1)))
+
+
+def _make_handler(state: FakeApiState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):  # silencioso
+            pass
+
+        def _send(self, status: int, body) -> None:
+            data = b"" if body is None else json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            if body is not None:
+                self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _body(self) -> dict:
+            length = int(self.headers.get("Content-Length") or 0)
+            if not length:
+                return {}
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                return {}
+            return body if isinstance(body, dict) else {}
+
+        def _dispatch(self, method: str) -> None:
+            body = self._body()
+            parts = urlsplit(self.path)
+            path = parts.path.rstrip("/") or "/"
+            if path == "/fake/stats":
+                return self._send(200, {"requests": state.requests, "injected_errors": state.injected_errors})
+
+            delay, fail = state.chaos()
+            if delay:
+                time.sleep(delay)
+            if fail:
+                return self._send(state.error_status, {"detail": "Injected error"})
+
+            allowed = False
+            for route_method, pattern, auth, handler in _ROUTES:
+                m = pattern.match(path)
+                if not m:
+                    continue
+                if route_method != method:
+                    allowed = True
+                    continue
+                try:
+                    user = state.authenticate(self.headers.get("Authorization")) if auth else None
+                    status, payload = handler(state, user, m, body, parse_qs(parts.query))
+                except ApiError as e:
+                    return self._send(e.status, {"detail": e.detail})
+                return self._send(status, payload)
+            if allowed:
+                return self._send(405, {"detail": "Method Not Allowed"})
+            return self._send(404, {"detail": "Not Found"})
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def do_PUT(self):
+            self._dispatch("PUT")
+
+        def do_PATCH(self):
+            self._dispatch("PATCH")
+
+        def do_DELETE(self):
+            self._dispatch("DELETE")
+
+    return Handler
+
+
+def parse_latency(value: str) -> Tuple[float, float]:
+    """"20" → (0.02, 0.02); "10-50" → (0.01, 0.05). Valores em ms."""
+    value = (value or "0").strip()
+    lo, _, hi = value.partition("-")
+    try:
+        lo_s, hi_s = float(lo) / 1000, float(hi or lo) / 1000
+    except ValueError:
+        raise ValueError(f"Invalid latency {value!r}: use MS or MIN-MAX (ms), e.g. 20 or 10-50")
+    if lo_s < 0 or hi_s < lo_s:
+        raise ValueError(f"Invalid latency {value!r}: use MS or MIN-MAX (ms), e.g. 20 or 10-50")
+    return lo_s, hi_s
+
+
+class FakeApiServer:
+    """Sobe em thread; port=0 escolhe uma porta livre. seed=True cria o usuário padrão."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, backend: str = "memory",
+                 db_path: str = ":memory:", latency: Tuple[float, float] = (0.0, 0.0),
+                 error_rate: float = 0.0, error_status: int = 503, seed: bool = True, rng_seed: int = 0):
+        self.backend = backend
+        self.store = build_store(backend, db_path)
+        if seed:
+            seed_default_user(self.store)
+        self.state = FakeApiState(self.store, latency=latency, error_rate=error_rate,
+                                  error_status=error_status, seed=rng_seed)
+        self.httpd = ThreadingHTTPServer((host, port), _make_handler(self.state))
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeApiServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fake-api", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.store.close()
+
+    def stats(self) -> dict:
+        return {"backend": self.backend, "requests": self.state.requests,
+                "injected_errors": self.state.injected_errors}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Fake wishlist API (memory/sqlite)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--backend", choices=("memory", "sqlite"), default="memory")
+    ap.add_argument("--db", default=":memory:", help="arquivo SQLite (backend sqlite)")
+    ap.add_argument("--latency", default="0", help="ms por requisição: 20 ou 10-50")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="fração de respostas com erro injetado (0-1)")
+    ap.add_argument("--error-status", type=int, default=503)
+    ap.add_argument("--seed", type=int, default=0, help="semente da latência/erros injetados")
+    args = ap.parse_args(argv)
+
+    srv = FakeApiServer(args.host, args.port, args.backend, args.db, parse_latency(args.latency),
+                        args.error_rate, args.error_status, rng_seed=args.seed).start()
+    print(f"Fake API ({args.backend}) listening on {srv.url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        srv.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+# utils/history.py
+# Histórico entre sessões: um SQLite com o session_summary.json de cada execução
+# (tests_compiled_info/history.sqlite, ao lado das pastas de sessão).
+#
+# Ingestão incremental e idempotente: cada sessão é identificada pelo nome da
+# pasta (<timestamp>_<suite>); se o summary não mudou (mtime + tamanho) é pulada,
+# se mudou (sessão reconstruída) as linhas dela são trocadas. Uma transação por
+# chamada de ingest_dir; nodeids viram inteiros (tabela tests) nos índices.
+#
+# Consultas (sempre nas últimas N sessões da suíte, até a sessão do dashboard):
+#   session_trend → pass rate / duração por sessão
+#   test_trend    → duração e resultado de um teste ao longo do tempo
+#   flaky_tests   → alternância passed↔failed entre execuções seguidas (0..1)
+#   slowest_movers→ média recente vs. média anterior da duração de cada teste
+#   expected_durations → duração esperada por teste (utils/scheduler.py)
+#
+# CLI: python -m utils.history [--db ...] ingest|flaky|movers|trend <nodeid>
+
+import argparse
+import json
+import sqlite3
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_SESSIONS_ROOT = Path("tests_compiled_info")
+DEFAULT_HISTORY_PATH = DEFAULT_SESSIONS_ROOT / "history.sqlite"
+DEFAULT_WINDOW = 20
+SUMMARY_FILENAME = "session_summary.json"
+# abaixo disso a diferença de duração é ruído, não "mover"
+MIN_MOVER_DELTA_S = 0.05
+
+
+def suite_of(session: str) -> str:
+    """<YYYY-mm-dd_HH-MM-SS>_<suite> → suite."""
+    parts = session.split("_", 2)
+    return parts[2] if len(parts) == 3 else ""
+
+
+class History:
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sessions (
+        id INTEGER PRIMARY KEY, session TEXT UNIQUE NOT NULL, suite TEXT NOT NULL,
+        started_at TEXT, finished_at TEXT, exitstatus INTEGER,
+        total INTEGER, passed INTEGER, failed INTEGER, skipped INTEGER, pass_rate REAL,
+        source_mtime_ns INTEGER, source_size INTEGER, ingested_at REAL);
+    CREATE TABLE IF NOT EXISTS tests (id INTEGER PRIMARY KEY, nodeid TEXT UNIQUE NOT NULL);
+    CREATE TABLE IF NOT EXISTS results (
+        session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+        test_id INTEGER NOT NULL REFERENCES tests(id), ts TEXT, outcome TEXT, duration REAL,
+        PRIMARY KEY (session_id, test_id)) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS ix_sessions_suite_started ON sessions (suite, started_at);
+    CREATE INDEX IF NOT EXISTS ix_sessions_started ON sessions (started_at);
+    CREATE INDEX IF NOT EXISTS ix_results_test_ts ON results (test_id, ts);
+    """
+
+    def __init__(self, path: Path = DEFAULT_HISTORY_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path), isolation_level=None, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        # ingestão em lote: índices cabem no cache em vez de ir e voltar do disco
+        self.conn.execute("PRAGMA cache_size = -65536")
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(self._SCHEMA)
+        self._test_ids: Optional[Dict[str, int]] = None
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "History":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---------- ingestão ----------
+    def _test_id(self, nodeid: str) -> int:
+        if self._test_ids is None:
+            self._test_ids = {n: i for i, n in self.conn.execute("SELECT id, nodeid FROM tests")}
+        test_id = self._test_ids.get(nodeid)
+        if test_id is None:
+            test_id = self.conn.execute("INSERT INTO tests (nodeid) VALUES (?)", (nodeid,)).lastrowid
+            self._test_ids[nodeid] = test_id
+        return test_id
+
+    def _ingest(self, session_dir: Path) -> bool:
+        path = session_dir / SUMMARY_FILENAME
+        try:
+            st = path.stat()
+        except OSError:
+            return False
+        name = session_dir.name
+        row = self.conn.execute(
+            "SELECT source_mtime_ns, source_size FROM sessions WHERE session = ?", (name,)
+        ).fetchone()
+        if row is not None and (row[0], row[1]) == (st.st_mtime_ns, st.st_size):
+            return False
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+
+        info = data.get("session_info") or {}
+        ts = info.get("started_at")
+        self.conn.execute("DELETE FROM sessions WHERE session = ?", (name,))
+        session_id = self.conn.execute(
+            "INSERT INTO sessions (session, suite, started_at, finished_at, exitstatus, total, passed,"
+            " failed, skipped, pass_rate, source_mtime_ns, source_size, ingested_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (name, suite_of(name), ts, info.get("finished_at"), info.get("pytest_exitstatus"),
+             info.get("total_tests"), info.get("passed"), info.get("failed"), info.get("skipped"),
+             info.get("pass_rate"), st.st_mtime_ns, st.st_size, time.time()),
+        ).lastrowid
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO results (session_id, test_id, ts, outcome, duration) VALUES (?, ?, ?, ?, ?)",
+            ((session_id, self._test_id(t["nodeid"]), ts, t.get("outcome"), t.get("duration"))
+             for t in data.get("tests") or () if t.get("nodeid")),
+        )
+        return True
+
+    def _transaction(self, dirs: Iterable[Path]) -> int:
+        """Uma transação para todas (ingestão de centenas de sessões sem um fsync por sessão)."""
+        self.conn.execute("BEGIN")
+        try:
+            n = sum(self._ingest(Path(d)) for d in dirs)
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            self._test_ids = None
+            raise
+        return n
+
+    def ingest_session(self, session_dir: Path) -> bool:
+        """Grava (ou regrava) uma sessão. False = summary ausente/ilegível ou já ingerido igual."""
+        return bool(self._transaction([session_dir]))
+
+    def ingest_dir(self, root: Path = DEFAULT_SESSIONS_ROOT) -> int:
+        """Todas as sessões de root (só as novas/alteradas são lidas). Retorna quantas entraram."""
+        root = Path(root)
+        if not root.exists():
+            return 0
+        return self._transaction(p.parent for p in sorted(root.glob(f"*/{SUMMARY_FILENAME}")))
+
+    # ---------- consultas ----------
+    def _session_ids(self, suite: Optional[str], window: int, until: Optional[str]) -> List[int]:
+        sql = "SELECT id FROM sessions WHERE 1 = 1"
+        args: list = []
+        if suite:
+            sql += " AND suite = ?"
+            args.append(suite)
+        if until:
+            sql += " AND started_at <= ?"
+            args.append(until)
+        sql += " ORDER BY started_at DESC LIMIT ?"
+        args.append(window)
+        return [r[0] for r in self.conn.execute(sql, args)]
+
+    def session_trend(self, suite: Optional[str] = None, window: int = DEFAULT_WINDOW,
+                      until: Optional[str] = None) -> List[dict]:
+        ids = self._session_ids(suite, window, until)
+        if not ids:
+            return []
+        rows = self.conn.execute(
+            f"SELECT s.session, s.started_at, s.total, s.passed, s.failed, s.skipped, s.pass_rate,"
+            f" (SELECT SUM(duration) FROM results r WHERE r.session_id = s.id) AS busy_s"
+            f" FROM sessions s WHERE s.id IN ({','.join('?' * len(ids))}) ORDER BY s.started_at",
+            ids,
+        )
+        return [dict(r) for r in rows]
+
+    def test_trend(self, nodeid: str, limit: int = DEFAULT_WINDOW, until: Optional[str] = None) -> List[dict]:
+        rows = self.conn.execute(
+            "SELECT r.ts, r.outcome, r.duration FROM results r JOIN tests t ON t.id = r.test_id"
+            " WHERE t.nodeid = ? AND (? IS NULL OR r.ts <= ?) ORDER BY r.ts DESC LIMIT ?",
+            (nodeid, until, until, limit),
+        ).fetchall()
+        return [dict(r) for r in reversed(rows)]
+
+    def _window_results(self, ids: List[int]) -> str:
+        return f"SELECT test_id, ts, outcome, duration FROM results WHERE session_id IN ({','.join('?' * len(ids))})"
+
+    def flaky_tests(self, suite: Optional[str] = None, window: int = DEFAULT_WINDOW,
+                    until: Optional[str] = None, limit: int = 15) -> List[dict]:
+        """
+        flakiness = trocas passed↔failed entre execuções seguidas / (execuções - 1).
+        Sempre falhando ou sempre passando → 0; alternando a cada execução → 1.
+        """
+        ids = self._session_ids(suite, window, until)
+        if not ids:
+            return []
+        rows = self.conn.execute(
+            f"""
+            WITH w AS ({self._window_results(ids)} AND outcome IN ('passed', 'failed')),
+            seq AS (
+                SELECT test_id, outcome, LAG(outcome) OVER (PARTITION BY test_id ORDER BY ts) AS prev FROM w),
+            agg AS (
+                SELECT test_id, COUNT(*) AS runs,
+                       SUM(outcome = 'failed') AS failures,
+                       ROUND(100.0 * SUM(outcome = 'passed') / COUNT(*), 1) AS pass_rate,
+                       ROUND(1.0 * SUM(prev IS NOT NULL AND prev != outcome) / (COUNT(*) - 1), 3) AS flakiness
+                FROM seq GROUP BY test_id
+                HAVING COUNT(*) > 1 AND SUM(outcome = 'failed') > 0 AND SUM(outcome = 'passed') > 0)
+            SELECT t.nodeid, agg.runs, agg.failures, agg.pass_rate, agg.flakiness
+            FROM agg JOIN tests t ON t.id = agg.test_id
+            ORDER BY agg.flakiness DESC, agg.failures DESC, t.nodeid
+            LIMIT ?
+            """,
+            (*ids, limit),
+        )
+        return [dict(r) for r in rows]
+
+    def slowest_movers(self, suite: Optional[str] = None, window: int = DEFAULT_WINDOW,
+                       until: Optional[str] = None, recent: int = 3, limit: int = 15) -> List[dict]:
+        """Duração média nas `recent` últimas sessões vs. nas anteriores da janela (maior alta primeiro)."""
+        ids = self._session_ids(suite, window, until)
+        if len(ids) <= recent:
+            return []
+        recent_ids, older_ids = ids[:recent], ids[recent:]
+        rows = self.conn.execute(
+            f"""
+            SELECT t.nodeid,
+                   AVG(CASE WHEN r.session_id IN ({','.join('?' * len(recent_ids))}) THEN r.duration END) AS recent_s,
+                   AVG(CASE WHEN r.session_id IN ({','.join('?' * len(older_ids))}) THEN r.duration END) AS previous_s
+            FROM results r JOIN tests t ON t.id = r.test_id
+            WHERE r.session_id IN ({','.join('?' * len(ids))}) AND r.outcome = 'passed' AND r.duration IS NOT NULL
+            GROUP BY r.test_id
+            HAVING recent_s IS NOT NULL AND previous_s IS NOT NULL AND recent_s - previous_s >= ?
+            ORDER BY recent_s - previous_s DESC
+            LIMIT ?
+            """,
+            (*recent_ids, *older_ids, *ids, MIN_MOVER_DELTA_S, limit),
+        )
+        return [
+            {**dict(r), "delta_s": r["recent_s"] - r["previous_s"],
+             "ratio": (r["recent_s"] / r["previous_s"]) if r["previous_s"] else None}
+            for r in rows
+        ]
+
+    def expected_durations(self, window: int = DEFAULT_WINDOW) -> Dict[str, float]:
+        """Mediana da duração das últimas `window` execuções (passed/failed) de cada teste."""
+        rows = self.conn.execute(
+            """
+            SELECT t.nodeid, r.duration FROM (
+                SELECT test_id, duration,
+                       ROW_NUMBER() OVER (PARTITION BY test_id ORDER BY ts DESC) AS rn
+                FROM results WHERE outcome IN ('passed', 'failed') AND duration IS NOT NULL) r
+            JOIN tests t ON t.id = r.test_id
+            WHERE r.rn <= ?
+            """,
+            (window,),
+        )
+        by_test: Dict[str, List[float]] = {}
+        for nodeid, duration in rows:
+            by_test.setdefault(nodeid, []).append(duration)
+        return {nodeid: statistics.median(values) for nodeid, values in by_test.items()}
+
+    def trends(self, session: str, window: int = DEFAULT_WINDOW, limit: int = 15) -> dict:
+        """Tudo que o card Trends do dashboard da sessão precisa (janela termina nela)."""
+        row = self.conn.execute("SELECT suite, started_at FROM sessions WHERE session = ?", (session,)).fetchone()
+        suite, until = (row["suite"], row["started_at"]) if row else (suite_of(session), None)
+        flaky = self.flaky_tests(suite, window, until, limit)
+        movers = self.slowest_movers(suite, window, until, limit=limit)
+        series = {}
+        for t in flaky + movers:
+            if t["nodeid"] not in series:
+                series[t["nodeid"]] = self.test_trend(t["nodeid"], window, until)
+        return {
+            "window": window,
+            "suite": suite,
+            "sessions": self.session_trend(suite, window, until),
+            "flaky": flaky,
+            "movers": movers,
+            "series": series,
+        }
+
+
+def _print_rows(rows: Iterable[dict], columns: List[str]) -> None:
+    rows = list(rows)
+    if not rows:
+        print("(no data)")
+        return
+    print("  ".join(columns))
+    for r in rows:
+        print("  ".join("" if r.get(c) is None else str(round(r[c], 3) if isinstance(r[c], float) else r[c])
+                        for c in columns))
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m utils.history", description="Cross-session test history")
+    ap.add_argument("--db", default=str(DEFAULT_HISTORY_PATH))
+    ap.add_argument("--suite", default=None, help="filter by suite (api, web, mobile, mixed)")
+    ap.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="last N sessions")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    ing = sub.add_parser("ingest", help="ingest new/changed session summaries")
+    ing.add_argument("root", nargs="?", default=str(DEFAULT_SESSIONS_ROOT))
+    sub.add_parser("flaky", help="flakiest tests in the window")
+    sub.add_parser("movers", help="tests whose duration grew the most")
+    tr = sub.add_parser("trend", help="duration/outcome of one test over time")
+    tr.add_argument("nodeid")
+    args = ap.parse_args(argv)
+
+    with History(Path(args.db)) as h:
+        if args.cmd == "ingest":
+            t0 = time.perf_counter()
+            n = h.ingest_dir(Path(args.root))
+            print(f"Ingested {n} session(s) from {args.root} into {args.db} in {time.perf_counter() - t0:.2f}s")
+        elif args.cmd == "flaky":
+            _print_rows(h.flaky_tests(args.suite, args.window), ["flakiness", "pass_rate", "runs", "failures", "nodeid"])
+        elif args.cmd == "movers":
+            _print_rows(h.slowest_movers(args.suite, args.window), ["delta_s", "previous_s", "recent_s", "nodeid"])
+        else:
+            _print_rows(h.test_trend(args.nodeid, args.window), ["ts", "outcome", "duration"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
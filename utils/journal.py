@@ -0,0 +1,180 @@
+# utils/journal.py
+# Journal de resultados (JSONL, só append) dentro da pasta da sessão:
+#   <sessão>/journal/results_<worker|main>.jsonl
+#
+# Cada fase (setup/call/teardown), cada dado extra do teste (timing, meta,
+# screenshot...) e os relatórios da sessão (load/latency) viram UMA linha,
+# gravada e enviada ao SO na hora (flush). Se o processo morrer (timeout do
+# CI, Appium travado), tudo até a última linha completa continua no disco.
+#
+# Leitura em streaming (iter_results): cada arquivo é "dobrado" teste a teste
+# (um processo roda um teste por vez → as linhas de um teste são contíguas) e
+# os arquivos dos workers são intercalados pela ordem global de execução.
+# Na memória: o teste atual de cada arquivo + as poucas atualizações que
+# chegam depois do teste acabar (artefatos em background, limpeza no fim).
+
+import heapq
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+JOURNAL_DIRNAME = "journal"
+INTERRUPTED_ERROR = "interrupted: the run stopped during this test (no call result in the journal)"
+
+
+def journal_path(output_dir: Path, worker: Optional[str] = None) -> Path:
+    return Path(output_dir) / JOURNAL_DIRNAME / f"results_{worker or 'main'}.jsonl"
+
+
+def journal_files(output_dir: Path) -> List[Path]:
+    d = Path(output_dir) / JOURNAL_DIRNAME
+    return sorted(d.glob("results_*.jsonl")) if d.exists() else []
+
+
+class JournalWriter:
+    """Append + flush por linha; thread-safe (artefatos e limpeza gravam de outras threads)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._fh = self.path.open("a", encoding="utf-8")
+
+    def append(self, record: dict) -> None:
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            if self._fh is None:
+                return
+            self._fh.write(line)
+            self._fh.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+
+def iter_records(path: Path) -> Iterator[dict]:
+    """Linhas do journal; a última pode estar cortada (processo morto no meio da escrita) → ignorada."""
+    with Path(path).open(encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def _apply(result: dict, update: dict) -> None:
+    op, key, value = update["op"], update["key"], update["value"]
+    if op == "timing":
+        result.setdefault("timings", {})[key] = value
+    elif op == "extend":
+        result.setdefault(key, []).extend(value)
+    else:
+        result[key] = value
+
+
+# cabeçalho das linhas de teste ({"t":...,"nodeid":...} — sempre nesta ordem, ver JournalWriter)
+_HEAD = re.compile(r'\{"t":"(phase|result|update)","nodeid":("(?:[^"\\]+|\\.)*")')
+
+
+def _late_updates(path: Path) -> Dict[str, List[dict]]:
+    """
+    1ª passada: atualizações de testes que já tinham terminado (aplicadas na 2ª).
+    Só lê o cabeçalho de cada linha; JSON completo apenas das atualizações atrasadas.
+    """
+    late: Dict[str, List[dict]] = {}
+    current = None
+    with Path(path).open(encoding="utf-8") as fh:
+        for line in fh:
+            m = _HEAD.match(line)
+            if not m:
+                continue
+            nodeid = json.loads(m.group(2))
+            if m.group(1) != "update":
+                current = nodeid
+            elif nodeid != current:
+                try:
+                    late.setdefault(nodeid, []).append(json.loads(line))
+                except ValueError:
+                    continue
+    return late
+
+
+def _fold(path: Path, info: dict) -> Iterator[dict]:
+    """Resultados (um dict por teste) de UM arquivo, na ordem em que rodaram."""
+    late = _late_updates(path)
+    current, result, setup = None, None, None
+    finished = False
+
+    def _emit(res: Optional[dict]) -> Optional[dict]:
+        if res is None:
+            return None
+        for upd in late.pop(res["nodeid"], ()):
+            _apply(res, upd)
+        return res
+
+    for rec in iter_records(path):
+        t = rec.get("t")
+        if t == "session":
+            started = rec.get("started_at")
+            if started and (info.get("started_at") is None or started < info["started_at"]):
+                info["started_at"] = started
+        elif t == "extra":
+            info.setdefault("extras", {})[rec["key"]] = rec["value"]
+        elif t == "finish":
+            finished = True
+            info["exitstatus"] = rec.get("exitstatus")
+        elif t in ("phase", "result"):
+            if rec["nodeid"] != current:
+                done = _emit(result)
+                if done is not None:
+                    yield done
+                current, result, setup = rec["nodeid"], None, None
+            if t == "result":
+                payload = {k: v for k, v in rec.items() if k != "t"}
+                result = {**result, **payload} if result else payload
+            elif rec.get("when") == "setup":
+                setup = rec
+        elif t == "update" and rec["nodeid"] == current and result is not None:
+            _apply(result, rec)
+
+    done = _emit(result)
+    if done is not None:
+        yield done
+    elif setup is not None and setup.get("outcome") == "passed" and not finished:
+        # processo morreu durante o teste: aparece como falha, não some do relatório
+        interrupted = {
+            "nodeid": setup["nodeid"],
+            "name": setup.get("name") or setup["nodeid"].split("::")[-1],
+            "when": "interrupted",
+            "outcome": "failed",
+            "duration": None,
+            "start": setup.get("stop"),
+            "stop": None,
+            "error": INTERRUPTED_ERROR,
+            "order": setup.get("order"),
+        }
+        if setup.get("worker"):
+            interrupted["worker"] = setup["worker"]
+        yield interrupted
+    if not finished:
+        info.setdefault("unfinished", []).append(path.name)
+
+
+def iter_results(output_dir: Path, info: Optional[dict] = None) -> Iterator[dict]:
+    """
+    Resultados de todos os processos da sessão, pela ordem global de execução.
+    info (opcional) recebe, ao fim da iteração: started_at, exitstatus, extras
+    (relatórios da sessão) e unfinished (journals sem registro de fim).
+    """
+    info = info if info is not None else {}
+    streams = [_fold(p, info) for p in journal_files(output_dir)]
+    yield from heapq.merge(*streams, key=lambda r: r.get("order") or 999999)
+
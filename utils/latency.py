@@ -0,0 +1,237 @@
+# utils/latency.py
+# Latência por endpoint da suíte de API.
+#
+# Cada teste tem um RequestTimings pendurado nos listeners do api_client: toda
+# requisição entra num histograma por rota normalizada ("GET /wishlists/{id}")
+# e status. O histograma vai no resultado do teste (meta "latency"), é gravado no
+# journal de cada processo (utils/journal.py) e somado no fim da sessão
+# (reporting.latency_summary).
+#
+# Baseline (data/latency_baseline.json): p95 de referência por endpoint e, se
+# quiser, um teto absoluto (budget_ms). Endpoint acima do limite = regressão
+# (--latency-budget warn|fail).
+
+import json
+import math
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from utils.api_client import normalize_route
+
+DEFAULT_BASELINE_PATH = Path("data") / "latency_baseline.json"
+LATENCY_BUDGET_MODES = ("off", "warn", "fail")
+DEFAULT_TOLERANCE = 0.25
+# abaixo disso a diferença é ruído de rede/agendamento, não regressão
+DEFAULT_MIN_DELTA_MS = 5.0
+DEFAULT_METRIC = "p95_ms"
+# buckets logarítmicos: cada um ~10% maior que o anterior (erro relativo ≤ 10%)
+_GROWTH = 1.1
+_LOG_GROWTH = math.log(_GROWTH)
+
+
+def route_key(method: str, url: str) -> str:
+    return f"{method.upper()} {normalize_route(url)}"
+
+
+class Histogram:
+    """Contagem por bucket logarítmico (em ms) + total e máximo exatos. Soma com merge()."""
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, seconds: float) -> None:
+        ms = max(seconds * 1000.0, 0.001)
+        idx = math.ceil(math.log(ms) / _LOG_GROWTH)
+        self.buckets[idx] = self.buckets.get(idx, 0) + 1
+        self.count += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        for idx, n in other.buckets.items():
+            self.buckets[idx] = self.buckets.get(idx, 0) + n
+        self.count += other.count
+        self.sum_ms += other.sum_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+        return self
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Limite superior do bucket do p-ésimo percentil (nunca passa do máximo real)."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(p / 100.0 * self.count))
+        seen = 0
+        for idx in sorted(self.buckets):
+            seen += self.buckets[idx]
+            if seen >= rank:
+                return min(_GROWTH ** idx, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "n": self.count,
+            "sum_ms": round(self.sum_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+            "b": {str(k): v for k, v in sorted(self.buckets.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Histogram":
+        h = cls()
+        h.buckets = {int(k): v for k, v in (data.get("b") or {}).items()}
+        h.count = data.get("n", 0)
+        h.sum_ms = data.get("sum_ms", 0.0)
+        h.max_ms = data.get("max_ms", 0.0)
+        return h
+
+    def summary(self) -> dict:
+        r = lambda v: None if v is None else round(v, 2)  # noqa: E731
+        return {
+            "count": self.count,
+            "mean_ms": r(self.sum_ms / self.count) if self.count else None,
+            "p50_ms": r(self.percentile(50)),
+            "p95_ms": r(self.percentile(95)),
+            "p99_ms": r(self.percentile(99)),
+            "max_ms": r(self.max_ms) if self.count else None,
+        }
+
+
+class RequestTimings:
+    """Listener do ApiClient/AsyncApiClient: histograma por endpoint e status de UM teste."""
+
+    def __init__(self):
+        self.by_route: Dict[str, Dict[int, Histogram]] = {}
+
+    def __len__(self) -> int:
+        return sum(h.count for by_status in self.by_route.values() for h in by_status.values())
+
+    def on_response(self, method: str, url: str, kwargs: dict, resp, elapsed: float) -> None:
+        self.add(method, url, resp.status_code, elapsed)
+
+    def add(self, method: str, url: str, status: Optional[int], elapsed: float) -> None:
+        by_status = self.by_route.setdefault(route_key(method, url), {})
+        by_status.setdefault(status or 0, Histogram()).add(elapsed)
+
+    def to_dict(self) -> dict:
+        """{"GET /wishlists": {"200": {histograma}}} — formato da meta "latency" do teste."""
+        return {
+            key: {str(status): h.to_dict() for status, h in sorted(by_status.items())}
+            for key, by_status in sorted(self.by_route.items())
+        }
+
+
+class LatencyAggregate:
+    """Soma incremental da meta "latency" (um teste por vez; serve para leitura em streaming)."""
+
+    def __init__(self):
+        self.totals: Dict[str, Histogram] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+        self.tests: Dict[str, List[str]] = {}
+
+    def add(self, result: dict) -> None:
+        for key, by_status in (result.get("latency") or {}).items():
+            total = self.totals.setdefault(key, Histogram())
+            for status, data in by_status.items():
+                h = Histogram.from_dict(data)
+                total.merge(h)
+                by_code = self.statuses.setdefault(key, {})
+                by_code[status] = by_code.get(status, 0) + h.count
+            self.tests.setdefault(key, []).append(result.get("nodeid", ""))
+
+    def summary(self) -> Dict[str, dict]:
+        return {
+            key: {**self.totals[key].summary(), "statuses": dict(sorted(self.statuses[key].items())), "tests": self.tests[key]}
+            for key in sorted(self.totals)
+        }
+
+
+def aggregate(results: Iterable[dict]) -> Dict[str, dict]:
+    """
+    Soma a meta "latency" de todos os testes:
+    {endpoint: {count, mean/p50/p95/p99/max_ms, statuses: {"200": n}, tests: [nodeid...]}}
+    """
+    agg = LatencyAggregate()
+    for r in results:
+        agg.add(r)
+    return agg.summary()
+
+
+# ==========================================================
+# baseline / budgets
+# ==========================================================
+def load_baseline(path: Path) -> Optional[dict]:
+    path = Path(path)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def compare(endpoints: Dict[str, dict], baseline: Optional[dict], tolerance: Optional[float] = None) -> List[dict]:
+    """
+    Endpoints acima do limite. Por endpoint no baseline:
+      budget_ms → teto absoluto; senão limite = max(ref × (1 + tolerance), ref + min_delta_ms).
+    tolerance: da CLI > do endpoint > do arquivo > DEFAULT_TOLERANCE. Marca cada endpoint com
+    "baseline_ms"/"limit_ms"/"regressed" (in place) e devolve a lista de regressões.
+    """
+    if not baseline:
+        return []
+    metric = baseline.get("metric", DEFAULT_METRIC)
+    min_delta = baseline.get("min_delta_ms", DEFAULT_MIN_DELTA_MS)
+    regressions = []
+    for key, ep in endpoints.items():
+        ref = (baseline.get("endpoints") or {}).get(key)
+        current = ep.get(metric)
+        if not ref or current is None:
+            continue
+        if ref.get("budget_ms") is not None:
+            limit = float(ref["budget_ms"])
+        elif ref.get(metric) is not None:
+            tol = tolerance if tolerance is not None else ref.get("tolerance", baseline.get("tolerance", DEFAULT_TOLERANCE))
+            limit = max(ref[metric] * (1 + tol), ref[metric] + min_delta)
+        else:
+            continue
+        ep["baseline_ms"] = ref.get(metric)
+        ep["limit_ms"] = round(limit, 2)
+        ep["regressed"] = current > limit
+        if ep["regressed"]:
+            regressions.append({
+                "endpoint": key,
+                "metric": metric,
+                "current_ms": current,
+                "baseline_ms": ref.get(metric),
+                "limit_ms": round(limit, 2),
+                "tests": ep.get("tests", []),
+            })
+    return regressions
+
+
+def updated_baseline(endpoints: Dict[str, dict], previous: Optional[dict] = None) -> dict:
+    """Novo baseline com os valores desta sessão; mantém budget_ms/tolerance já configurados."""
+    previous = previous or {}
+    metric = previous.get("metric", DEFAULT_METRIC)
+    old = previous.get("endpoints") or {}
+    new = {}
+    for key, ep in endpoints.items():
+        entry = {k: v for k, v in (old.get(key) or {}).items() if k in ("budget_ms", "tolerance")}
+        entry.update({metric: ep.get(metric), "count": ep["count"]})
+        new[key] = entry
+    # endpoints que não rodaram nesta sessão continuam como estavam
+    for key, entry in old.items():
+        new.setdefault(key, entry)
+    return {
+        "metric": metric,
+        "tolerance": previous.get("tolerance", DEFAULT_TOLERANCE),
+        "min_delta_ms": previous.get("min_delta_ms", DEFAULT_MIN_DELTA_MS),
+        "endpoints": dict(sorted(new.items())),
+    }
+
+
+def regression_lines(regressions: List[dict]) -> List[str]:
+    return [
+        f"{r['endpoint']}: {r['metric']} {r['current_ms']}ms > limit {r['limit_ms']}ms "
+        f"(baseline {r['baseline_ms']}ms; {len(r['tests'])} test(s), e.g. {r['tests'][0] if r['tests'] else '-'})"
+        for r in regressions
+    ]
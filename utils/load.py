@@ -0,0 +1,227 @@
+# utils/load.py
+# Modo carga (--load): os cenários de API marcados com @pytest.mark.load viram
+# fluxos de uma carga ponderada, rodados por N usuários virtuais (threads).
+#
+# Cada iteração sorteia um fluxo pelo peso (weight) e chama a própria função
+# de teste com argumentos montados pelo conftest (api_client, new_user_token,
+# cleanups...). Toda requisição passa por um listener do ApiClient e entra na
+# rota normalizada ("GET /wishlists/{id}/products"); no fim sai throughput e
+# p50/p95/p99 por rota e por fluxo (load_report.json + card no dashboard).
+
+import inspect
+import math
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.latency import route_key
+
+DEFAULT_LOAD_USERS = 10
+DEFAULT_LOAD_DURATION_S = 30.0
+# amostras de erro guardadas por fluxo (o resto só conta)
+MAX_ERROR_SAMPLES = 5
+
+
+def percentile(sorted_values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank sobre uma lista JÁ ordenada."""
+    if not sorted_values:
+        return None
+    k = max(0, math.ceil(p / 100.0 * len(sorted_values)) - 1)
+    return sorted_values[k]
+
+
+def latency_summary(values: List[float]) -> dict:
+    """count/p50/p95/p99/max em ms a partir de durações em segundos."""
+    s = sorted(values)
+    ms = lambda v: None if v is None else round(v * 1000, 2)  # noqa: E731
+    return {
+        "count": len(s),
+        "p50_ms": ms(percentile(s, 50)),
+        "p95_ms": ms(percentile(s, 95)),
+        "p99_ms": ms(percentile(s, 99)),
+        "max_ms": ms(s[-1] if s else None),
+    }
+
+
+class Flow:
+    """Um cenário reaproveitado: função de teste + peso + argumentos que ela pede (params = parametrize)."""
+
+    def __init__(self, name: str, func: Callable, weight: float, argnames: Tuple[str, ...],
+                 params: Optional[dict] = None):
+        self.name = name
+        self.func = func
+        self.weight = weight
+        self.argnames = argnames
+        self.params = dict(params or {})
+
+    def __repr__(self) -> str:
+        return f"Flow({self.name}, weight={self.weight})"
+
+
+class LatencyRecorder:
+    """Listener do ApiClient: agrupa as durações por "METHOD /rota/{id}"."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = {}
+        self.statuses: Dict[str, Dict[int, int]] = {}
+
+    def on_response(self, method: str, url: str, kwargs: dict, resp, elapsed: float) -> None:
+        key = route_key(method, url)
+        with self._lock:
+            self.samples.setdefault(key, []).append(elapsed)
+            by_status = self.statuses.setdefault(key, {})
+            by_status[resp.status_code] = by_status.get(resp.status_code, 0) + 1
+
+
+class LoadRunner:
+    """
+    users: usuários virtuais (threads); ramp_up_s: o i-ésimo começa em ramp_up_s * i / users.
+    Para por duration_s ou, se iterations for dado, quando o total de iterações acabar.
+    prepare(flow, recorder) → (kwargs, teardown): monta os argumentos de UMA iteração.
+    """
+
+    def __init__(self, flows: List[Flow], prepare: Callable, users: int = DEFAULT_LOAD_USERS,
+                 duration_s: float = DEFAULT_LOAD_DURATION_S, iterations: Optional[int] = None,
+                 ramp_up_s: float = 0.0, seed: int = 0, run_coroutine: Optional[Callable] = None, logger=None):
+        if not flows:
+            raise ValueError("No load flows: mark API scenarios with @pytest.mark.load")
+        self.flows = flows
+        self.prepare = prepare
+        self.users = max(1, users)
+        self.duration_s = duration_s
+        self.iterations = iterations
+        self.ramp_up_s = max(0.0, ramp_up_s)
+        self.seed = seed
+        self.run_coroutine = run_coroutine
+        self._log = logger
+        self.recorder = LatencyRecorder()
+        self._lock = threading.Lock()
+        self._issued = 0
+        self._flow_times: Dict[str, List[float]] = {f.name: [] for f in flows}
+        self._flow_failures: Dict[str, int] = {f.name: 0 for f in flows}
+        self._flow_errors: Dict[str, List[str]] = {f.name: [] for f in flows}
+
+    def _info(self, msg: str) -> None:
+        if self._log:
+            self._log.info(msg)
+
+    def _take_ticket(self, deadline: float) -> bool:
+        if self.iterations is None:
+            return time.monotonic() < deadline
+        with self._lock:
+            if self._issued >= self.iterations:
+                return False
+            self._issued += 1
+            return True
+
+    def _run_once(self, flow: Flow) -> None:
+        kwargs, teardown = self.prepare(flow, self.recorder)
+        t0 = time.perf_counter()
+        error = None
+        try:
+            result = flow.func(**kwargs)
+            if inspect.iscoroutine(result):
+                (self.run_coroutine or _no_coroutines)(result)
+        except Exception as e:
+            error = f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+        finally:
+            elapsed = time.perf_counter() - t0
+            try:
+                teardown()
+            except Exception as e:
+                self._info(f"[LOAD] teardown of {flow.name} failed: {e}")
+        with self._lock:
+            self._flow_times[flow.name].append(elapsed)
+            if error:
+                self._flow_failures[flow.name] += 1
+                if len(self._flow_errors[flow.name]) < MAX_ERROR_SAMPLES:
+                    self._flow_errors[flow.name].append(error)
+
+    def _user(self, idx: int, start: float, deadline: float) -> None:
+        rng = random.Random(self.seed * 1000 + idx)
+        weights = [f.weight for f in self.flows]
+        delay = self.ramp_up_s * idx / self.users
+        if delay:
+            time.sleep(max(0.0, start + delay - time.monotonic()))
+        while self._take_ticket(deadline):
+            self._run_once(rng.choices(self.flows, weights=weights)[0])
+
+    def run(self) -> dict:
+        mode = f"{self.iterations} iteration(s)" if self.iterations is not None else f"{self.duration_s:.0f}s"
+        self._info(f"[LOAD] {self.users} user(s), {mode}, ramp-up {self.ramp_up_s:.0f}s, flows: {self.flows}")
+        start = time.monotonic()
+        deadline = start + self.ramp_up_s + self.duration_s
+        threads = [
+            threading.Thread(target=self._user, args=(i, start, deadline), name=f"load-{i}", daemon=True)
+            for i in range(self.users)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return self.report(time.monotonic() - start)
+
+    def report(self, elapsed_s: float) -> dict:
+        endpoints = {}
+        for key in sorted(self.recorder.samples):
+            values = self.recorder.samples[key]
+            statuses = self.recorder.statuses.get(key, {})
+            endpoints[key] = {
+                **latency_summary(values),
+                "rps": round(len(values) / elapsed_s, 2) if elapsed_s else None,
+                "errors": sum(n for s, n in statuses.items() if s >= 500),
+                "statuses": {str(s): n for s, n in sorted(statuses.items())},
+            }
+        flows = {}
+        for f in self.flows:
+            times = self._flow_times[f.name]
+            flows[f.name] = {
+                "weight": f.weight,
+                **latency_summary(times),
+                "per_s": round(len(times) / elapsed_s, 2) if elapsed_s else None,
+                "failures": self._flow_failures[f.name],
+                "errors": self._flow_errors[f.name],
+            }
+        iterations = sum(len(t) for t in self._flow_times.values())
+        requests = sum(len(v) for v in self.recorder.samples.values())
+        return {
+            "config": {
+                "users": self.users,
+                "duration_s": None if self.iterations is not None else self.duration_s,
+                "iterations": self.iterations,
+                "ramp_up_s": self.ramp_up_s,
+                "seed": self.seed,
+            },
+            "elapsed_s": round(elapsed_s, 3),
+            "iterations": iterations,
+            "failures": sum(self._flow_failures.values()),
+            "requests": requests,
+            "rps": round(requests / elapsed_s, 2) if elapsed_s else None,
+            "flows": flows,
+            "endpoints": endpoints,
+        }
+
+
+def _no_coroutines(coro) -> None:
+    coro.close()
+    raise TypeError("async flow without run_coroutine")
+
+
+def report_lines(report: dict) -> List[str]:
+    """Resumo em texto (terminal)."""
+    lines = [
+        f"{report['iterations']} iteration(s), {report['failures']} failed, {report['requests']} request(s) "
+        f"in {report['elapsed_s']:.1f}s ({report['rps']} req/s)",
+        f"{'endpoint':<42} {'count':>7} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'5xx':>5}",
+    ]
+    for key, ep in report["endpoints"].items():
+        lines.append(
+            f"{key:<42} {ep['count']:>7} {ep['rps']:>8} {ep['p50_ms']:>7}ms {ep['p95_ms']:>7}ms "
+            f"{ep['p99_ms']:>7}ms {ep['errors']:>5}"
+        )
+    for name, fl in report["flows"].items():
+        if fl["failures"]:
+            lines.append(f"FAILED {name}: {fl['failures']}/{fl['count']} — {'; '.join(fl['errors'][:2])}")
+    return lines
@@ -0,0 +1,72 @@
+# utils/parallel.py
+# Suporte a execução multi-processo (pytest-xdist):
+# - descobre se o processo é controller, worker ou execução simples
+# - contador global de execução compartilhado entre processos (arquivo + lock)
+#
+# Os workers escrevem o journal de resultados no MESMO diretório de sessão
+# (criado pelo controller) e o controller lê todos no fim.
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def worker_id(config) -> Optional[str]:
+    """'gw0', 'gw1'... nos workers do xdist; None fora deles."""
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput:
+        return workerinput.get("workerid")
+    return None
+
+
+def is_xdist_controller(config) -> bool:
+    """True no processo principal quando o xdist distribui os testes (-n N)."""
+    return config.pluginmanager.getplugin("dsession") is not None
+
+
+@contextmanager
+def file_lock(lock_path: Path):
+    """Lock exclusivo entre processos (flock no Unix, msvcrt no Windows)."""
+    lock_path = Path(lock_path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+") as fh:
+        if fcntl:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        else:
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+            else:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class SharedCounter:
+    """Contador monotônico guardado em arquivo; seguro entre processos."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock_path = self.path.with_name(self.path.name + ".lock")
+
+    def next(self) -> int:
+        with file_lock(self._lock_path):
+            try:
+                current = int(self.path.read_text(encoding="utf-8").strip() or 0)
+            except (FileNotFoundError, ValueError):
+                current = 0
+            current += 1
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(str(current), encoding="utf-8")
+            os.replace(tmp, self.path)
+            return current
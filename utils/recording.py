@@ -0,0 +1,58 @@
+# utils/recording.py
+# Política de gravação de tela da suíte mobile (--video).
+#
+#   always   → grava todo teste (vídeo só é salvo em falha) — comportamento antigo
+#   on-retry → grava só quando o teste está sendo repetido: reexecução do
+#              pytest-rerunfailures ou teste que falhou na última execução (cache --lf)
+#   marked   → grava só testes marcados com @pytest.mark.slow / @pytest.mark.critical
+#   never    → não grava
+#
+# Gravar custa CPU no emulador e transferência do mp4 pelo Appium; com vários
+# devices em paralelo isso deixa o emulador lento.
+
+from typing import Optional
+
+VIDEO_POLICIES = ("always", "on-retry", "marked", "never")
+RECORD_MARKERS = ("slow", "critical")
+
+
+def _is_retry(item) -> bool:
+    # pytest-rerunfailures: execution_count começa em 1
+    if (getattr(item, "execution_count", 1) or 1) > 1:
+        return True
+    cache = getattr(item.config, "cache", None)
+    if cache is None:
+        return False
+    return item.nodeid in (cache.get("cache/lastfailed", {}) or {})
+
+
+def should_record(policy: str, item) -> bool:
+    if policy == "never":
+        return False
+    if policy == "on-retry":
+        return _is_retry(item)
+    if policy == "marked":
+        return any(item.get_closest_marker(m) is not None for m in RECORD_MARKERS)
+    return True
+
+
+def recording_options(
+    time_limit: Optional[int] = None,
+    bit_rate: Optional[int] = None,
+    video_size: Optional[str] = None,
+) -> dict:
+    """
+    Opções do start_recording_screen (UiAutomator2): timeLimit (s),
+    bitRate (bits/s) e videoSize ("LARGURAxALTURA"). None = default do Appium.
+    """
+    opts = {"forceRestart": True}
+    if time_limit:
+        opts["timeLimit"] = str(int(time_limit))
+    if bit_rate:
+        opts["bitRate"] = int(bit_rate)
+    if video_size:
+        w, _, h = video_size.lower().partition("x")
+        if not (w.isdigit() and h.isdigit()):
+            raise ValueError(f"Invalid --video-size '{video_size}' (use LARGURAxALTURA, ex.: 720x1280)")
+        opts["videoSize"] = f"{int(w)}x{int(h)}"
+    return opts
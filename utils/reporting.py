@@ -1,25 +1,47 @@
 # utils/reporting.py
-# Dashboard dark + donut progress + filtros/busca/sort + colapso de erro
+# Dashboard dark + donut progress + filtros/busca/sort + erro sob demanda
+# (testes como JSON embutido; tabela virtual, só as linhas visíveis no DOM)
 # Mantém a API: reset_session, upsert_result, add_screenshot, add_video,
-# write_dashboard, write_and_open_dashboard, write_session_summary
+# record_timing, add_meta, write_dashboard, write_and_open_dashboard, write_session_summary
+# + open_journal/record_phase/close_journal: cada processo (main ou worker do
+# xdist) grava os resultados num journal JSONL (utils/journal.py) na hora;
+# summary e dashboard são reconstruídos dele em streaming — inclusive de uma
+# sessão morta no meio: python -m utils.reporting <pasta da sessão>
+# + card Trends a partir do histórico entre sessões (utils/history.py)
 
 import os
+import sys
 import json
 import shutil
+import argparse
+import tempfile
 import webbrowser
 from pathlib import Path
+from contextlib import ExitStack
 from datetime import datetime
 
-_REPORTS = []
-_REPORT_INDEX = {}
+from utils import journal as J
+from utils import latency as L
+from utils import signatures as S
+from utils.history import DEFAULT_HISTORY_PATH, History
+
 _SESSION_START = datetime.now()
+_JOURNAL = None
+_WORKER = None
+# nodeids com resultado (fase call) já no journal: depois disso, extras viram "update"
+_WITH_RESULT = set()
+
+_TS_FMT = "%Y-%m-%d %H:%M:%S"
 
 
 def reset_session():
-    """Zera buffers globais (útil em runs consecutivos e em sessionstart)."""
-    global _REPORTS, _REPORT_INDEX, _SESSION_START
-    _REPORTS = []
-    _REPORT_INDEX = {}
+    """Zera o estado global (útil em runs consecutivos e em sessionstart)."""
+    global _SESSION_START, _JOURNAL, _WORKER
+    if _JOURNAL is not None:
+        _JOURNAL.close()
+    _JOURNAL = None
+    _WORKER = None
+    _WITH_RESULT.clear()
     _SESSION_START = datetime.now()
 
 
@@ -48,6 +70,61 @@ def _read_session_meta(dir_path: Path):
     return {}
 
 
+# =====================  journal  =====================
+
+def open_journal(output_dir: Path, worker: str = None) -> Path:
+    """Abre o journal deste processo (<sessão>/journal/results_<worker|main>.jsonl)."""
+    global _JOURNAL, _WORKER
+    reset_session()
+    _WORKER = worker
+    _JOURNAL = J.JournalWriter(J.journal_path(output_dir, worker))
+    _journal({"t": "session", "worker": worker or "main", "started_at": _SESSION_START.strftime(_TS_FMT)})
+    return _JOURNAL.path
+
+
+def close_journal(exitstatus=None) -> None:
+    """Registro de fim: sem ele o leitor trata o processo como interrompido."""
+    global _JOURNAL
+    if _JOURNAL is None:
+        return
+    _journal({"t": "finish", "exitstatus": int(exitstatus) if exitstatus is not None else None})
+    _JOURNAL.close()
+    _JOURNAL = None
+
+
+def _journal(record: dict) -> None:
+    if _JOURNAL is not None:
+        _JOURNAL.append(record)
+
+
+def _update(nodeid: str, op: str, key: str, value) -> None:
+    if nodeid in _WITH_RESULT:
+        _journal({"t": "update", "nodeid": nodeid, "op": op, "key": key, "value": value})
+
+
+def record_phase(item, rep) -> None:
+    """
+    Setup/teardown vão pro journal só como marcação de progresso: se o processo
+    morrer depois do setup, o leitor sabe qual teste estava rodando.
+    """
+    if getattr(rep, "when", None) == "call":
+        return
+    record = {
+        "t": "phase",
+        "nodeid": item.nodeid,
+        "name": getattr(item, "name", item.nodeid.split("::")[-1]),
+        "when": rep.when,
+        "outcome": getattr(rep, "outcome", "unknown"),
+        "duration": getattr(rep, "duration", None),
+        "start": getattr(rep, "start", None),
+        "stop": getattr(rep, "stop", None),
+        "order": getattr(item, "_exec_index", None),
+    }
+    if _WORKER:
+        record["worker"] = _WORKER
+    _journal(record)
+
+
 def upsert_result(item, rep, order=None, test_dirname=None) -> None:
     """
     Grava somente o resultado da fase 'call' (evita sobrescritas por setup/teardown).
@@ -63,6 +140,8 @@ def upsert_result(item, rep, order=None, test_dirname=None) -> None:
         "when": "call",
         "outcome": getattr(rep, "outcome", "unknown"),
         "duration": getattr(rep, "duration", None),
+        "start": getattr(rep, "start", None),
+        "stop": getattr(rep, "stop", None),
         "error": "",
     }
 
@@ -78,29 +157,62 @@ def upsert_result(item, rep, order=None, test_dirname=None) -> None:
                 err_text = ""
         payload["error"] = err_text
 
+    timings = {
+        k[len("timing."):]: v
+        for k, v in (getattr(rep, "user_properties", None) or [])
+        if isinstance(k, str) and k.startswith("timing.")
+    }
+    if timings:
+        payload["timings"] = timings
+    for k, v in getattr(rep, "user_properties", None) or []:
+        if isinstance(k, str) and k.startswith("meta."):
+            payload[k[len("meta."):]] = v
+
     if order is not None:
         payload["order"] = order
     if test_dirname:
         payload["dir"] = test_dirname
+    if _WORKER:
+        payload["worker"] = _WORKER
 
-    idx = _REPORT_INDEX.get(nodeid)
-    if idx is not None:
-        _REPORTS[idx].update(payload)
-    else:
-        _REPORT_INDEX[nodeid] = len(_REPORTS)
-        _REPORTS.append(payload)
+    _journal({"t": "result", **payload})
+    _WITH_RESULT.add(nodeid)
 
 
 def add_screenshot(item, rel_path: str) -> None:
-    idx = _REPORT_INDEX.get(item.nodeid)
-    if idx is not None and rel_path:
-        _REPORTS[idx]["screenshot"] = rel_path
+    if rel_path:
+        _update(item.nodeid, "set", "screenshot", rel_path)
 
 
 def add_video(item, rel_path: str) -> None:
-    idx = _REPORT_INDEX.get(item.nodeid)
-    if idx is not None and rel_path:
-        _REPORTS[idx]["video"] = rel_path
+    if rel_path:
+        _update(item.nodeid, "set", "video", rel_path)
+
+
+def record_timing(item, name: str, seconds) -> None:
+    """
+    Registra um tempo extra do teste (ex.: session_create, app_reset).
+    Vai para item.user_properties (chega no report de setup/call) e, se o
+    resultado já existe (teardown), vira uma atualização no journal.
+    """
+    if seconds is None:
+        return
+    value = round(float(seconds), 3)
+    item.user_properties.append((f"timing.{name}", value))
+    _update(item.nodeid, "timing", name, value)
+
+
+def add_meta(item, key: str, value) -> None:
+    """Campo extra no resultado do teste (ex.: device usado). Mesmo esquema do record_timing."""
+    item.user_properties.append((f"meta.{key}", value))
+    _update(item.nodeid, "set", key, value)
+
+
+def add_cleanup_failures(nodeid: str, failures: list) -> None:
+    """DELETEs de limpeza que falharam (aparecem na linha do teste e no card Cleanup)."""
+    if failures:
+        _update(nodeid, "extend", "cleanup_failures",
+                [{k: f.get(k) for k in ("kind", "id", "request", "error")} for f in failures])
 
 
 # =====================  UI (CSS/JS)  =====================
@@ -199,10 +311,20 @@ thead th{
 }
 thead th .sort{opacity:.55; margin-left:6px; font-size:11px}
 tbody tr{background:var(--panel-2)}
-tbody tr:nth-child(odd){background:#121722}
-tbody tr:hover{background:#1a2130}
+tbody tr.odd{background:#121722}
+tbody tr.row:hover{background:#1a2130}
 td{padding:10px; border-bottom:1px solid var(--border); vertical-align:top}
 
+/* tabela virtual: só as linhas visíveis existem no DOM, todas com a mesma altura */
+.viewport{max-height:70vh; overflow:auto; border-radius:14px; border:1px solid var(--border)}
+.viewport table{table-layout:fixed; border:0; border-radius:0; overflow:visible}
+tbody tr.row td{padding:0 10px; white-space:nowrap; overflow:hidden; text-overflow:ellipsis; vertical-align:middle}
+tbody tr.spacer td{padding:0; border:0}
+.err-line{color:var(--muted); font-family:ui-monospace,SFMono-Regular,Menlo,Consolas,monospace; font-size:12px}
+.timings{color:var(--muted); font-size:11px; margin-left:6px}
+.count{color:var(--muted); font-size:12px; margin:6px 2px}
+#error-panel pre{max-height:320px}
+
 .badge{padding:4px 8px; border-radius:999px; font-size:12px; font-weight:600; display:inline-block}
 .badge.pass{background:rgba(32,201,151,.12); color:var(--pass); border:1px solid rgba(32,201,151,.35)}
 .badge.fail{background:rgba(255,107,107,.12); color:var(--fail); border:1px solid rgba(255,107,107,.35)}
@@ -223,10 +345,6 @@ pre.collapsed{max-height:52px}
 
 @media (max-width:900px){
   .summary{grid-template-columns: repeat(2,minmax(0,1fr));}
-  thead{display:none}
-  tbody tr{display:grid; grid-template-columns: 1fr; gap:6px; padding:8px}
-  td{border:0; padding:4px 0}
-  td::before{content:attr(data-th) ": "; color:var(--muted); font-weight:600}
 }
 """
 
@@ -236,22 +354,35 @@ _DARK_JS = r"""
   const $$ = (sel,ctx=document)=>Array.from(ctx.querySelectorAll(sel));
   function save(k,v){ try{ localStorage.setItem(k, JSON.stringify(v)); }catch(e){} }
   function load(k,def){ try{ const v = localStorage.getItem(k); return v? JSON.parse(v): def }catch(e){ return def } }
+  const esc = (s)=> String(s==null?'':s).replace(/&/g,'&amp;').replace(/</g,'&lt;').replace(/>/g,'&gt;').replace(/"/g,'&quot;');
+
+  // dados: bloco JSON #results-data (uma lista por teste, colunas em DATA.cols)
+  // erros completos: bloco JSON #results-errors — só é lido no primeiro "expandir"
+  let DATA = {cols:[], rows:[]}, ERRORS = null;
+  const C = {};
+  function readData(){
+    const el = $('#results-data');
+    if(el) DATA = JSON.parse(el.textContent);
+    DATA.cols.forEach((c,i)=> C[c]=i);
+  }
+  function errorOf(i){
+    if(ERRORS === null){
+      const el = $('#results-errors');
+      ERRORS = el ? JSON.parse(el.textContent) : {};
+    }
+    return ERRORS[i] || '';
+  }
 
-  function computeStats(table, considerHidden=false){
-    const rows = $$('tbody tr', table).filter(r=> considerHidden ? true : r.style.display !== 'none');
-    let total=0, passed=0, failed=0, skipped=0;
-    rows.forEach(r=>{
-      if (considerHidden || r.style.display !== 'none'){
-        total++;
-        const badge = r.querySelector('td:nth-child(4) .badge');
-        const cls = badge ? (badge.classList.contains('passed')?'passed':
-                             badge.classList.contains('failed')?'failed':
-                             badge.classList.contains('skipped')?'skipped':'') : '';
-        if(cls==='passed') passed++;
-        else if(cls==='failed') failed++;
-        else if(cls==='skipped') skipped++;
-      }
-    });
+  function computeStats(view){
+    const rows = DATA.rows, out = C.outcome;
+    let passed=0, failed=0, skipped=0;
+    for(let k=0; k<view.length; k++){
+      const o = rows[view[k]][out];
+      if(o==='passed') passed++;
+      else if(o==='failed') failed++;
+      else if(o==='skipped') skipped++;
+    }
+    const total = view.length;
     const passRate = total ? (passed/total)*100 : 0;
     return {total, passed, failed, skipped, passRate};
   }
@@ -326,82 +457,133 @@ _DARK_JS = r"""
           <button class="btn" id="clear">Limpar</button>
         </div>
       </div>
+      <div class="count" id="count"></div>
     `;
     const container = $('.container') || document.body;
-    container.insertBefore(wrap, container.querySelector('table'));
+    container.insertBefore(wrap, $('#viewport'));
+    // painel do erro completo (preenchido no "expandir")
+    const panel = document.createElement('div');
+    panel.className='card'; panel.id='error-panel'; panel.hidden=true;
+    panel.innerHTML = `
+      <div class="row-actions"><b id="error-title"></b>
+        <span class="linklike" id="error-copy">copiar erro</span>
+        <span class="linklike" id="error-close">recolher</span></div>
+      <pre id="error-body"></pre>
+    `;
+    container.insertBefore(panel, $('#viewport'));
   }
 
-  function enhanceTable(){
-    const table = $('table'); if(!table) return;
+  const OVERSCAN = 12;
+  // header (índice da coluna) → campo usado no sort; null = coluna sem sort
+  const SORT_COLS = ['order','name','when','outcome','duration',null,'error'];
 
-    // Add data-th for responsive + badges + collapse
+  function enhanceTable(){
+    const table = $('table.table'), viewport = $('#viewport'); if(!table || !viewport) return;
+    const tbody = $('tbody', table);
+    const rows = DATA.rows, n = rows.length;
+    const Q = DATA.rows.map(r=> r[C.q]);  // índice de busca (já em minúsculas)
     const ths = $$('thead th', table);
-    const rows = $$('tbody tr', table);
-    rows.forEach(row=>{
-      const tds = $$('td', row);
-      tds.forEach((td,i)=> td.setAttribute('data-th', (ths[i] && ths[i].innerText.trim()) || ''));
-      // badge styling by outcome
-      const out = row.querySelector('td:nth-child(4)');
-      if(out){
-        const val = out.textContent.trim();
-        out.innerHTML = `<span class="badge ${val}">${val}</span>`;
+    let order = identity();  // ordem atual (sort)
+    let view = order;        // índices visíveis (ordem + filtro + busca)
+    let frame = 0;
+
+    function identity(){ const a = new Uint32Array(n); for(let i=0;i<n;i++) a[i]=i; return a; }
+    function rowHeight(){ return document.body.classList.contains('compact') ? 30 : 42; }
+
+    // Sorting: uma chave numérica por linha (Float64Array), montada uma vez por coluna
+    const keyCache = {};
+    function sortKeys(field){
+      if(keyCache[field]) return keyCache[field];
+      const col = C[field], keys = new Float64Array(n);
+      if(field==='order' || field==='duration'){
+        for(let i=0;i<n;i++){ const v = rows[i][col]; keys[i] = typeof v==='number' ? v : Infinity; }
+      } else {
+        // texto → posição entre os valores distintos ordenados
+        const text = (i)=> String(rows[i][col]||'').toLowerCase();
+        const rank = new Map(Array.from(new Set(rows.map((_,i)=>text(i)))).sort().map((v,i)=>[v,i]));
+        for(let i=0;i<n;i++) keys[i] = rank.get(text(i));
       }
-      // error block collapse + actions
-      const errCell = row.lastElementChild;
-      if(errCell){
-        const pre = errCell.querySelector('pre');
-        if(pre){
-          pre.classList.add('collapsed');
-          const actions = document.createElement('div');
-          actions.className='row-actions';
-          const toggle = document.createElement('span');
-          toggle.className='linklike'; toggle.textContent='expandir';
-          toggle.addEventListener('click',()=>{
-            pre.classList.toggle('collapsed');
-            toggle.textContent = pre.classList.contains('collapsed') ? 'expandir' : 'recolher';
-          });
-          const copy = document.createElement('span');
-          copy.className='linklike'; copy.textContent='copiar erro';
-          copy.addEventListener('click',()=>{
-            navigator.clipboard.writeText(pre.innerText).catch(()=>{});
-          });
-          actions.appendChild(toggle); actions.appendChild(copy);
-          errCell.appendChild(actions);
-        }
-      }
-    });
+      return keyCache[field] = keys;
+    }
+
+    function sortBy(idx, dir){
+      const field = SORT_COLS[idx]; if(!field) return;
+      const keys = sortKeys(field), sign = dir==='desc' ? -1 : 1;
+      order = identity().sort((a,b)=> (sign*(keys[a]-keys[b])) || (a-b));
+      table.setAttribute('data-sort', `${idx}:${dir}`);
+      save('dash_sort', `${idx}:${dir}`);
+    }
 
-    // Sorting
     ths.forEach((th, idx)=>{
+      if(!SORT_COLS[idx]) return;
       const span = document.createElement('span');
       span.className='sort'; span.textContent='⇅';
       th.appendChild(span);
-      th.addEventListener('click', ()=> sortBy(idx));
+      th.addEventListener('click', ()=>{
+        const current = table.getAttribute('data-sort') || '';
+        sortBy(idx, current === `${idx}:asc` ? 'desc' : 'asc');
+        applyFilters();
+      });
     });
 
-    function sortBy(idx){
-      const tbody = $('tbody', table);
-      const rows = $$('tr', tbody);
-      const current = table.getAttribute('data-sort') || '';
-      const dir = current === `${idx}:asc` ? 'desc' : 'asc';
-      table.setAttribute('data-sort', `${idx}:${dir}`);
-      rows.sort((a,b)=>{
-        const ta = (a.children[idx]?.innerText||'').trim().toLowerCase();
-        const tb = (b.children[idx]?.innerText||'').trim().toLowerCase();
-        if(!isNaN(parseFloat(ta)) && !isNaN(parseFloat(tb))){
-          return (dir==='asc'?1:-1)*(parseFloat(ta)-parseFloat(tb));
-        }
-        return (dir==='asc'?1:-1)*(ta>tb?1:ta<tb?-1:0);
-      });
-      rows.forEach(r=>tbody.appendChild(r));
-      save('dash_sort', `${idx}:${dir}`);
+    function rowHtml(i, k, h){
+      const r = rows[i], o = r[C.outcome];
+      const cls = {failed:'fail', passed:'pass', skipped:'skip'}[o] || '';
+      const dur = typeof r[C.duration]==='number' ? `${r[C.duration].toFixed(2)}s` : '';
+      const t = r[C.timings];
+      const timings = t ? Object.keys(t).map(key=> `${key}: ${Number(t[key]).toFixed(2)}s`).join(' · ') : '';
+      const files = [
+        r[C.screenshot] ? `📸 <a href="${esc(r[C.screenshot])}">screenshot</a>` : '',
+        r[C.video] ? `🎥 <a href="${esc(r[C.video])}">video</a>` : '',
+      ].filter(Boolean).join(' | ');
+      const err = r[C.error]
+        ? `<span class="linklike" data-err="${i}">expandir</span> <span class="err-line" title="${esc(r[C.error])}">${esc(r[C.error])}</span>`
+        : '';
+      return `<tr class="row ${cls}${k%2 ? ' odd' : ''}" style="height:${h}px">`
+        + `<td>${esc(r[C.order])}</td>`
+        + `<td title="${esc(r[C.nodeid])}">${esc(r[C.name])}</td>`
+        + `<td>${esc(r[C.when])}</td>`
+        + `<td><span class="badge ${esc(o)} ${cls}">${esc(o)}</span></td>`
+        + `<td title="${esc(timings)}">${dur}${timings ? `<span class="timings">${esc(timings)}</span>` : ''}</td>`
+        + `<td class="artifacts">${files}</td>`
+        + `<td>${err}</td></tr>`;
+    }
+
+    // Virtual scroll: espaçador em cima + linhas visíveis (+ margem) + espaçador embaixo
+    function render(){
+      frame = 0;
+      const h = rowHeight(), cols = ths.length;
+      const top = viewport.scrollTop, height = viewport.clientHeight || 600;
+      const first = Math.max(0, Math.floor(top/h) - OVERSCAN);
+      const last = Math.min(view.length, Math.ceil((top+height)/h) + OVERSCAN);
+      const parts = [`<tr class="spacer"><td colspan="${cols}" style="height:${first*h}px"></td></tr>`];
+      for(let k=first; k<last; k++) parts.push(rowHtml(view[k], k, h));
+      parts.push(`<tr class="spacer"><td colspan="${cols}" style="height:${(view.length-last)*h}px"></td></tr>`);
+      tbody.innerHTML = parts.join('');
     }
+    function scheduleRender(){ if(!frame) frame = requestAnimationFrame(render); }
+    viewport.addEventListener('scroll', scheduleRender, {passive:true});
+    window.addEventListener('resize', scheduleRender);
+
+    // Erro completo sob demanda
+    const panel = $('#error-panel'), body = $('#error-body');
+    tbody.addEventListener('click', (ev)=>{
+      const link = ev.target.closest('[data-err]'); if(!link) return;
+      const i = parseInt(link.dataset.err, 10);
+      $('#error-title').textContent = `${rows[i][C.order]} · ${rows[i][C.name]}`;
+      body.textContent = errorOf(i);
+      panel.hidden = false;
+      panel.scrollIntoView({block:'nearest'});
+    });
+    $('#error-close')?.addEventListener('click', ()=>{ panel.hidden = true; body.textContent=''; });
+    $('#error-copy')?.addEventListener('click', ()=>{ navigator.clipboard.writeText(body.textContent).catch(()=>{}); });
 
     // Filters & search
     const btns = $$('.filter');
     const search = $('#search');
     const clear = $('#clear');
     const compact = $('#toggle-compact');
+    const count = $('#count');
 
     function updateButtons(){
       const want = load('dash_filter','all');
@@ -411,23 +593,26 @@ _DARK_JS = r"""
     function applyFilters(){
       const active = btns.find(b=>b.classList.contains('active'));
       const status = active ? active.dataset.filter : 'all';
-      const q = (search.value||'').toLowerCase();
-
-      $$('tbody tr', table).forEach(tr=>{
-        const outBadge = tr.querySelector('td:nth-child(4) .badge');
-        const text = tr.innerText.toLowerCase();
-        const matchesStatus = (status==='all') || (outBadge && outBadge.classList.contains(status));
-        const matchesQuery = !q || text.includes(q);
-        tr.style.display = (matchesStatus && matchesQuery) ? '' : 'none';
-      });
+      const q = (search.value||'').trim().toLowerCase();
+      const out = C.outcome, picked = new Uint32Array(n);
+      let m = 0;
+      for(let k=0; k<n; k++){
+        const i = order[k];
+        if(status!=='all' && rows[i][out]!==status) continue;
+        if(q && Q[i].indexOf(q) === -1) continue;
+        picked[m++] = i;
+      }
+      view = picked.subarray(0, m);
 
       save('dash_filter', status);
       save('dash_query', q);
       updateButtons();
+      if(count) count.textContent = `${m} / ${n} tests`;
 
       // Atualiza donut com base no filtro atual
-      const statsFiltered = computeStats(table, /*considerHidden*/false);
-      updateDonut(statsFiltered);
+      updateDonut(computeStats(view));
+      viewport.scrollTop = 0;
+      render();
     }
 
     // restore state
@@ -439,8 +624,7 @@ _DARK_JS = r"""
     if(search) search.value = savedQuery||'';
     if(savedSort){
       const [i,dir] = savedSort.split(':');
-      sortBy(parseInt(i,10));
-      if(dir==='desc') sortBy(parseInt(i,10)); // toggle again
+      sortBy(parseInt(i,10), dir);
     }
 
     btns.forEach(b=> b.addEventListener('click', ()=>{
@@ -448,24 +632,33 @@ _DARK_JS = r"""
       b.classList.add('active');
       applyFilters();
     }));
-    if(search){ search.addEventListener('input', applyFilters); }
+    // busca com debounce: filtra quando a digitação pausa, não a cada tecla
+    let debounce = 0;
+    if(search){ search.addEventListener('input', ()=>{ clearTimeout(debounce); debounce = setTimeout(applyFilters, 150); }); }
     if(clear){ clear.addEventListener('click', ()=>{ search.value=''; applyFilters(); }); }
+    // card Failure clusters: clicar numa assinatura filtra a tabela por ela
+    $$('[data-signature]').forEach(el=> el.addEventListener('click', ()=>{
+      if(!search) return;
+      search.value = el.dataset.signature;
+      btns.forEach(x=> x.classList.toggle('active', x.dataset.filter==='all'));
+      applyFilters();
+      viewport.scrollIntoView({behavior:'smooth', block:'start'});
+    }));
 
     compact?.addEventListener('click', ()=>{
       document.body.classList.toggle('compact');
       compact.classList.toggle('active');
       save('dash_compact', document.body.classList.contains('compact'));
+      render();
     });
     if(load('dash_compact', false)){ document.body.classList.add('compact'); compact?.classList.add('active'); }
 
-    // Inicial: badge & donut dos totais
-    const statsAll = computeStats(table, /*considerHidden*/true);
-    updateDonut(statsAll);
-    applyFilters(); // aplica filtro/busca salvos e atualiza donut filtrado
+    applyFilters(); // aplica filtro/busca salvos, atualiza donut e desenha
   }
 
   document.addEventListener('DOMContentLoaded', ()=>{
     // lê nome da sessão do <body data-session="">
+    readData();
     mountDonut();
     ensureToolbar();
     enhanceTable();
@@ -474,65 +667,429 @@ _DARK_JS = r"""
 """
 
 
-def _build_dashboard_html(session_dir_name: str, dir_path: Path) -> str:
-    total = len(_REPORTS)
-    failed = sum(1 for r in _REPORTS if r.get("outcome") == "failed")
-    passed = sum(1 for r in _REPORTS if r.get("outcome") == "passed")
-    skipped = sum(1 for r in _REPORTS if r.get("outcome") == "skipped")
+class _SessionTotals:
+    """
+    Tudo que o summary/dashboard precisa além das linhas, somado teste a teste
+    numa passada pelo journal (não guarda a lista de resultados).
+    """
+
+    def __init__(self):
+        self.total = self.passed = self.failed = self.skipped = 0
+        self.lanes = {}
+        self.devices = {}
+        self.cleanup = []
+        self.latency = L.LatencyAggregate()
+        self.failures = S.FailureClusters()
+        self.info = {}
+
+    def add(self, r: dict) -> None:
+        self.total += 1
+        outcome = r.get("outcome")
+        if outcome in ("passed", "failed", "skipped"):
+            setattr(self, outcome, getattr(self, outcome) + 1)
+        self._add_lane(r)
+        self._add_device(r)
+        self.cleanup.extend((r.get("name", ""), c) for c in r.get("cleanup_failures") or [])
+        self.latency.add(r)
+        self.failures.add(r)
+
+    def _add_lane(self, r: dict) -> None:
+        """
+        Resumo por navegador (lane): testes, resultados, soma das durações e o
+        tempo de parede da lane (primeiro start → último stop).
+        """
+        browser = r.get("browser")
+        if not browser:
+            return
+        ln = self.lanes.setdefault(
+            browser,
+            {"tests": 0, "passed": 0, "failed": 0, "skipped": 0, "busy_s": 0.0,
+             "first_start": None, "last_stop": None, "workers": []},
+        )
+        ln["tests"] += 1
+        if r.get("outcome") in ("passed", "failed", "skipped"):
+            ln[r["outcome"]] += 1
+        ln["busy_s"] += r.get("duration") or 0
+        if r.get("start") is not None:
+            ln["first_start"] = min(filter(None, [ln["first_start"], r["start"]]))
+        if r.get("stop") is not None:
+            ln["last_stop"] = max(filter(None, [ln["last_stop"], r["stop"]]))
+        if r.get("worker") and r["worker"] not in ln["workers"]:
+            ln["workers"].append(r["worker"])
+
+    def _add_device(self, r: dict) -> None:
+        udid = r.get("device")
+        if not udid:
+            return
+        st = self.devices.setdefault(udid, {"tests": 0, "passed": 0, "failed": 0, "busy": 0.0})
+        st["tests"] += 1
+        st["passed"] += r.get("outcome") == "passed"
+        st["failed"] += r.get("outcome") == "failed"
+        st["busy"] += (r.get("duration") or 0) + sum((r.get("timings") or {}).values())
+
+    def lane_summary(self) -> dict:
+        lanes = {b: dict(ln) for b, ln in self.lanes.items()}
+        for ln in lanes.values():
+            ln["busy_s"] = round(ln["busy_s"], 3)
+            ln["wall_s"] = (
+                round(ln["last_stop"] - ln["first_start"], 3)
+                if ln["first_start"] is not None and ln["last_stop"] is not None
+                else None
+            )
+        return lanes
+
+    @property
+    def started_at(self) -> str:
+        return self.info.get("started_at") or _SESSION_START.strftime(_TS_FMT)
+
+    @property
+    def extras(self) -> dict:
+        return self.info.get("extras") or {}
+
+
+def session_totals(output_dir: Path) -> _SessionTotals:
+    """Uma passada pelo journal da sessão."""
+    totals = _SessionTotals()
+    for r in J.iter_results(output_dir, totals.info):
+        totals.add(r)
+    return totals
+
+
+def _lanes_html(lanes: dict) -> str:
+    if not lanes:
+        return ""
+    rows = ""
+    for b, ln in sorted(lanes.items()):
+        wall = "" if ln["wall_s"] is None else f"{ln['wall_s']:.1f}s"
+        rows += (
+            f"<tr><td>{html_escape(b)}</td><td>{html_escape(', '.join(ln['workers']) or 'main')}</td>"
+            f"<td>{ln['tests']} ({ln['passed']} passed / {ln['failed']} failed / {ln['skipped']} skipped)</td>"
+            f"<td>{ln['busy_s']:.1f}s</td><td>{wall}</td></tr>"
+        )
+    return (
+        "<div class='card'><b>Browser lanes</b>"
+        "<table style='margin-top:10px'><thead><tr>"
+        "<th>Browser</th><th>Workers</th><th>Tests</th><th>Busy</th><th>Wall clock</th>"
+        f"</tr></thead><tbody>{rows}</tbody></table></div>"
+    )
+
+
+_CLUSTERS_SHOWN = 50
+
+
+def _failures_html(clusters: list) -> str:
+    """Card Failure clusters: falhas agrupadas por assinatura (ver utils/signatures.py)."""
+    if not clusters:
+        return ""
+
+    def _seen(s):
+        return (f"<span title='{html_escape(s.get('nodeid') or '').replace(chr(39), '&#39;')}'>"
+                f"#{s.get('order') or '?'} {html_escape((s.get('nodeid') or '').split('::')[-1])}</span>")
+
+    rows = "".join(
+        f"<tr><td><button class='btn' data-signature='{c['signature']}' title='filtrar a tabela'>"
+        f"{c['signature']}</button></td><td>{c['count']}</td><td>{html_escape(c['exception'])}</td>"
+        f"<td>{html_escape(c['message'])}</td><td>{html_escape(' ← '.join(c['frames']))}</td>"
+        f"<td>{_seen(c['first'])}<br>{_seen(c['last'])}</td></tr>"
+        for c in clusters[:_CLUSTERS_SHOWN]
+    )
+    failures = sum(c["count"] for c in clusters)
+    more = (f"<br>+{len(clusters) - _CLUSTERS_SHOWN} more in session_summary.json"
+            if len(clusters) > _CLUSTERS_SHOWN else "")
+    return (
+        f"<div class='card'><b>Failure clusters</b> — {failures} failure(s), {len(clusters)} signature(s)"
+        "<table style='margin-top:10px'><thead><tr>"
+        "<th>Signature</th><th>Count</th><th>Exception</th><th>Message</th><th>Where</th><th>First / last</th>"
+        f"</tr></thead><tbody>{rows}</tbody></table>{more}</div>"
+    )
+
+
+def _cleanup_html(failed: list) -> str:
+    if not failed:
+        return ""
+    rows = "".join(
+        f"<tr><td>{html_escape(name)}</td><td>{html_escape(str(c.get('kind', '')))}</td>"
+        f"<td>{html_escape(c.get('request', ''))}</td><td>{html_escape(str(c.get('error', '')))}</td></tr>"
+        for name, c in failed
+    )
+    return (
+        f"<div class='card'><b>Cleanup failures ({len(failed)})</b>"
+        "<table style='margin-top:10px'><thead><tr>"
+        "<th>Test</th><th>Resource</th><th>Request</th><th>Error</th>"
+        f"</tr></thead><tbody>{rows}</tbody></table></div>"
+    )
+
+
+def set_load_report(report: dict) -> None:
+    """Guarda o resultado do --load no journal (card no dashboard + chave "load" no summary)."""
+    _journal({"t": "extra", "key": "load", "value": report})
+
+
+def _ms(v) -> str:
+    return "" if v is None else f"{v:.1f}ms"
+
+
+def _load_html(rep) -> str:
+    if not rep:
+        return ""
+    cfg = rep["config"]
+    mode = f"{cfg['iterations']} iterations" if cfg["iterations"] is not None else f"{cfg['duration_s']:.0f}s"
+    ep_rows = "".join(
+        f"<tr><td>{html_escape(key)}</td><td>{ep['count']}</td><td>{ep['rps']}</td>"
+        f"<td>{_ms(ep['p50_ms'])}</td><td>{_ms(ep['p95_ms'])}</td><td>{_ms(ep['p99_ms'])}</td>"
+        f"<td>{_ms(ep['max_ms'])}</td>"
+        f"<td>{html_escape(', '.join(f'{s}×{n}' for s, n in ep['statuses'].items()))}</td></tr>"
+        for key, ep in rep["endpoints"].items()
+    )
+    flow_rows = "".join(
+        f"<tr><td>{html_escape(name)}</td><td>{fl['weight']}</td><td>{fl['count']}</td>"
+        f"<td>{fl['failures']}</td><td>{_ms(fl['p50_ms'])}</td><td>{_ms(fl['p95_ms'])}</td>"
+        f"<td>{_ms(fl['p99_ms'])}</td><td>{html_escape('; '.join(fl['errors'][:2]))}</td></tr>"
+        for name, fl in rep["flows"].items()
+    )
+    return (
+        f"<div class='card'><b>Load</b> — {cfg['users']} users, {mode}, ramp-up {cfg['ramp_up_s']:.0f}s: "
+        f"{rep['iterations']} iterations ({rep['failures']} failed), {rep['requests']} requests "
+        f"in {rep['elapsed_s']:.1f}s = {rep['rps']} req/s"
+        "<table style='margin-top:10px'><thead><tr>"
+        "<th>Endpoint</th><th>Requests</th><th>req/s</th><th>p50</th><th>p95</th><th>p99</th><th>Max</th><th>Status</th>"
+        f"</tr></thead><tbody>{ep_rows}</tbody></table>"
+        "<table style='margin-top:10px'><thead><tr>"
+        "<th>Flow</th><th>Weight</th><th>Iterations</th><th>Failed</th><th>p50</th><th>p95</th><th>p99</th><th>Errors</th>"
+        f"</tr></thead><tbody>{flow_rows}</tbody></table></div>"
+    )
+
+
+def latency_summary(output_dir: Path) -> dict:
+    """Histogramas de latência de todos os testes somados por endpoint (ver utils/latency.py)."""
+    return L.aggregate(J.iter_results(output_dir))
+
+
+def set_latency_report(report: dict) -> None:
+    """{"endpoints": ..., "regressions": [...], "baseline": path, "mode": warn|fail} → journal."""
+    _journal({"t": "extra", "key": "latency", "value": report})
+
+
+def _latency_html(rep) -> str:
+    if not rep or not rep.get("endpoints"):
+        return ""
+    rows = ""
+    for key, ep in rep["endpoints"].items():
+        if ep.get("regressed"):
+            verdict = "<span class='badge fail'>REGRESSED</span>"
+        elif ep.get("limit_ms") is not None:
+            verdict = "ok"
+        else:
+            verdict = "no baseline"
+        rows += (
+            f"<tr><td>{html_escape(key)}</td><td>{ep['count']}</td>"
+            f"<td>{_ms(ep['p50_ms'])}</td><td>{_ms(ep['p95_ms'])}</td><td>{_ms(ep['p99_ms'])}</td>"
+            f"<td>{_ms(ep['max_ms'])}</td>"
+            f"<td>{html_escape(', '.join(f'{s}×{n}' for s, n in ep['statuses'].items()))}</td>"
+            f"<td>{_ms(ep.get('baseline_ms'))}</td><td>{_ms(ep.get('limit_ms'))}</td><td>{verdict}</td></tr>"
+        )
+    regs = rep.get("regressions") or []
+    head = f"{len(regs)} regression(s) ({html_escape(rep.get('mode', ''))})" if regs else "no regressions"
+    baseline = html_escape(str(rep.get("baseline") or "no baseline file"))
+    return (
+        f"<div class='card'><b>API latency</b> — {len(rep['endpoints'])} endpoint(s), {head}; baseline: {baseline}"
+        "<table style='margin-top:10px'><thead><tr>"
+        "<th>Endpoint</th><th>Requests</th><th>p50</th><th>p95</th><th>p99</th><th>Max</th><th>Status</th>"
+        "<th>Baseline</th><th>Limit</th><th>Verdict</th>"
+        f"</tr></thead><tbody>{rows}</tbody></table></div>"
+    )
+
+
+def _sparkline(points: list, width: int = 140, height: int = 28) -> str:
+    """SVG inline: linha dos valores; pontos vermelhos onde o teste falhou. points = [(valor, outcome)]."""
+    vals = [v for v, _ in points if isinstance(v, (int, float))]
+    if not vals:
+        return ""
+    lo, hi = min(vals), max(vals)
+    span = (hi - lo) or 1.0
+    step = width / max(1, len(points) - 1)
+    xy, dots = [], ""
+    for i, (v, outcome) in enumerate(points):
+        if not isinstance(v, (int, float)):
+            continue
+        x, y = i * step, height - 3 - (v - lo) / span * (height - 6)
+        xy.append(f"{x:.1f},{y:.1f}")
+        if outcome == "failed":
+            dots += f"<circle cx='{x:.1f}' cy='{y:.1f}' r='2.5' fill='var(--fail)'/>"
+    return (
+        f"<svg width='{width}' height='{height}' viewBox='-3 0 {width + 6} {height}'>"
+        f"<polyline points='{' '.join(xy)}' fill='none' stroke='var(--accent)' stroke-width='1.5'/>{dots}</svg>"
+    )
+
+
+def _trends_html(trends: dict) -> str:
+    """Card Trends (histórico entre sessões, ver utils/history.py)."""
+    sessions = (trends or {}).get("sessions") or []
+    if len(sessions) < 2:
+        return ""
+    series = trends.get("series") or {}
+
+    def _spark(nodeid):
+        return _sparkline([(p["duration"], p["outcome"]) for p in series.get(nodeid, [])])
+
+    def _test(nodeid):
+        return f"<td title='{html_escape(nodeid).replace(chr(39), '&#39;')}'>{html_escape(nodeid.split('::')[-1])}</td>"
+
+    first, last = sessions[0], sessions[-1]
+    head = (
+        f"<div class='card'><b>Trends</b> — last {len(sessions)} {html_escape(trends.get('suite') or '')} session(s), "
+        f"pass rate {first.get('pass_rate') or 0:.1f}% → {last.get('pass_rate') or 0:.1f}% "
+        f"{_sparkline([(s.get('pass_rate'), None) for s in sessions])} "
+        f"busy {first.get('busy_s') or 0:.1f}s → {last.get('busy_s') or 0:.1f}s "
+        f"{_sparkline([(s.get('busy_s'), None) for s in sessions])}"
+    )
+    flaky_rows = "".join(
+        f"<tr>{_test(t['nodeid'])}<td>{t['runs']}</td><td>{t['pass_rate']:.1f}%</td><td>{t['flakiness']:.2f}</td>"
+        f"<td>{_spark(t['nodeid'])}</td></tr>"
+        for t in trends.get("flaky") or []
+    )
+    mover_rows = "".join(
+        f"<tr>{_test(t['nodeid'])}<td>{t['previous_s']:.2f}s</td><td>{t['recent_s']:.2f}s</td><td>+{t['delta_s']:.2f}s</td>"
+        f"<td>{_spark(t['nodeid'])}</td></tr>"
+        for t in trends.get("movers") or []
+    )
+    flaky = (
+        "<table style='margin-top:10px'><thead><tr>"
+        "<th>Flaky test</th><th>Runs</th><th>Pass rate</th><th>Flakiness</th><th>Duration over time</th>"
+        f"</tr></thead><tbody>{flaky_rows}</tbody></table>"
+    ) if flaky_rows else "<br>no flaky tests in the window"
+    movers = (
+        "<table style='margin-top:10px'><thead><tr>"
+        "<th>Slowest mover</th><th>Before</th><th>Recent</th><th>Δ</th><th>Duration over time</th>"
+        f"</tr></thead><tbody>{mover_rows}</tbody></table>"
+    ) if mover_rows else "<br>no slowest movers in the window"
+    return f"{head}{flaky}{movers}</div>"
+
+
+def _devices_table_html(devices: dict, stats: dict) -> str:
+    """Tabela de devices (lease + throughput) para o card Environment."""
+    if not devices:
+        return ""
+
+    rows = []
+    for udid, info in sorted(devices.items()):
+        st = stats.get(udid, {"tests": 0, "passed": 0, "failed": 0, "busy": 0.0})
+        per_min = (st["tests"] / (st["busy"] / 60.0)) if st["busy"] else 0.0
+        rows.append(
+            f"<tr><td>{html_escape(udid)}</td>"
+            f"<td>{html_escape(info.get('url', ''))}</td>"
+            f"<td>{html_escape(str(info.get('systemPort', '')))}</td>"
+            f"<td>{html_escape(', '.join(info.get('workers', [])))}</td>"
+            f"<td>{st['tests']} ({st['passed']} passed / {st['failed']} failed)</td>"
+            f"<td>{st['busy']:.1f}s</td>"
+            f"<td>{per_min:.2f} tests/min</td></tr>"
+        )
+    return (
+        "<table style='margin-top:10px'><thead><tr>"
+        "<th>Device</th><th>Appium URL</th><th>systemPort</th><th>Workers</th>"
+        "<th>Tests</th><th>Busy</th><th>Throughput</th>"
+        f"</tr></thead><tbody>{''.join(rows)}</tbody></table>"
+    )
+
+
+# colunas do data island do dashboard: uma lista por teste, nesta ordem
+_DASH_COLS = ("order", "name", "nodeid", "when", "outcome", "duration", "timings",
+              "screenshot", "video", "error", "q")
+_ERROR_MAX = 4000
+_ERROR_LINE_MAX = 200
+
+
+def _island(obj) -> str:
+    """JSON compacto seguro dentro de <script> ('<' escapado: nada de </script> no meio)."""
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).replace("<", "\\u003c")
+
+
+def _error_line(error: str) -> str:
+    """Resumo do erro na linha da tabela: a 1ª linha 'E ...' do traceback (ou a última não vazia)."""
+    lines = [ln.strip() for ln in error.splitlines() if ln.strip()]
+    if not lines:
+        return ""
+    e_lines = [ln[1:].strip() for ln in lines if ln.startswith("E ")]
+    return (e_lines[0] if e_lines else lines[-1])[:_ERROR_LINE_MAX]
+
+
+def _dashboard_row(r: dict, signature: str = None):
+    """(linha do data island, erro completo ou ""). signature entra no índice de busca."""
+    error = (r.get("error") or "")[:_ERROR_MAX]
+    cleanup = r.get("cleanup_failures") or []
+    if cleanup:
+        error += "".join(f"\n[cleanup] {c.get('request', '')}: {c.get('error', '')}" for c in cleanup)
+    line = _error_line(error)
+    name, nodeid = r.get("name", ""), r.get("nodeid", "")
+    outcome, when = r.get("outcome", ""), r.get("when", "")
+    row = [
+        r.get("order", ""), name, nodeid, when, outcome, r.get("duration"),
+        r.get("timings") or 0, r.get("screenshot") or 0, r.get("video") or 0, line,
+        # índice de busca: montado aqui uma vez, o JS só faz indexOf
+        f"{name} {nodeid} {when} {outcome} {line} {signature or ''}".lower(),
+    ]
+    return row, error
+
+
+# ordem das linhas: failed -> passed -> skipped -> resto; dentro de cada grupo, 'order'
+_ROW_GROUP = {"failed": 0, "passed": 1, "skipped": 2}
+
+
+def _write_dashboard_html(fh, dir_path: Path, trends: dict = None) -> None:
+    """
+    Escreve o HTML aos pedaços: cabeçalho/cards com os totais de uma passada
+    pelo journal, depois os testes como JSON (data island) numa segunda passada.
+    A tabela é desenhada no navegador, só as linhas visíveis.
+    trends: card Trends (History.trends da sessão), opcional.
+    """
+    totals = session_totals(dir_path)
+    total, passed, failed, skipped = totals.total, totals.passed, totals.failed, totals.skipped
 
     def pct(x):
         return (x / total * 100.0) if total else 0.0
 
     # cards de resumo (além do donut)
+    unfinished = totals.info.get("unfinished") or []
+    interrupted_html = (
+        f"<div class='kpi fail'><b>Interrupted</b><span>{html_escape(', '.join(unfinished))}</span></div>"
+        if unfinished else ""
+    )
     summary_html = (
         f"<div class='card'><div class='summary'>"
         f"<div class='kpi'><b>Total</b><span>{total}</span></div>"
         f"<div class='kpi pass'><b>Passed</b><span>{passed} ({pct(passed):.1f}%)</span></div>"
         f"<div class='kpi fail'><b>Failed</b><span>{failed} ({pct(failed):.1f}%)</span></div>"
         f"<div class='kpi skip'><b>Skipped</b><span>{skipped} ({pct(skipped):.1f}%)</span></div>"
-        f"<div class='kpi'><b>Started</b><span>{html_escape(_SESSION_START.strftime('%Y-%m-%d %H:%M:%S'))}</span></div>"
+        f"<div class='kpi'><b>Started</b><span>{html_escape(totals.started_at)}</span></div>"
+        f"{interrupted_html}"
         f"</div></div>"
     )
 
-    # ordena por: failed -> passed -> skipped, depois por 'order' se existir
-    outcome_weight = {"failed": 0, "passed": 1, "skipped": 2}
-    rows = []
-    for r in sorted(
-        _REPORTS,
-        key=lambda x: (outcome_weight.get(x.get("outcome"), 9), x.get("order", 999999))
-    ):
-        cls = {"failed": "fail", "passed": "pass", "skipped": "skip"}.get(r.get("outcome"), "")
-        err = html_escape((r.get("error") or "")[:4000])
-        dur_raw = r.get("duration")
-        dur = f"{dur_raw:.2f}s" if isinstance(dur_raw, (int, float)) else ""
-        files = " | ".join([x for x in [
-            f"📸 <a href='{r.get('screenshot')}'>screenshot</a>" if r.get("screenshot") else "",
-            f"🎥 <a href='{r.get('video')}'>video</a>" if r.get("video") else ""
-        ] if x])
-        rows.append(
-            f"<tr class='{cls}'>"
-            f"<td>{html_escape(str(r.get('order','')))}</td>"
-            f"<td>{html_escape(r.get('name',''))}</td>"
-            f"<td>{html_escape(r.get('when',''))}</td>"
-            f"<td>{html_escape(r.get('outcome',''))}</td>"
-            f"<td>{dur}</td>"
-            f"<td class='artifacts'>{files}</td>"
-            f"<td><pre>{err}</pre></td>"
-            f"</tr>"
-        )
-
-    caps = _read_session_meta(dir_path).get("capabilities", {})
+    meta = _read_session_meta(dir_path)
+    caps = meta.get("capabilities", {})
     env_html = ""
     if caps:
+        reuse = meta.get("appium_reuse") or {}
+        reuse_html = ""
+        if reuse:
+            reuse_html = (
+                f"<br>session reuse ({html_escape(reuse.get('reset_strategy', ''))}): "
+                f"{reuse.get('sessions_created', 0)} session(s) created, "
+                f"avg {reuse.get('session_create_avg_s') or 0:.2f}s | "
+                f"{reuse.get('app_resets', 0)} app reset(s), "
+                f"avg {reuse.get('app_reset_avg_s') or 0:.2f}s"
+            )
         env_html = (
             f"<div class='card'><b>Environment</b><br>"
             f"deviceName: {html_escape(str(caps.get('appium:deviceName', '')))} | "
             f"platform: {html_escape(str(caps.get('platformName', '')))} | "
-            f"appPackage: {html_escape(str(caps.get('appium:appPackage', '')))}</div>"
+            f"appPackage: {html_escape(str(caps.get('appium:appPackage', '')))}"
+            f"{reuse_html}{_devices_table_html(meta.get('devices') or {}, totals.devices)}</div>"
         )
 
+    extras = totals.extras
     # body carrega data-session pro donut exibir
-    return f"""<!doctype html>
+    fh.write(f"""<!doctype html>
 <html>
 <head>
 <meta charset='utf-8'><meta name="viewport" content="width=device-width,initial-scale=1">
@@ -540,12 +1097,23 @@ def _build_dashboard_html(session_dir_name: str, dir_path: Path) -> str:
 <style>{_DARK_CSS}</style>
 <script>{_DARK_JS}</script>
 </head>
-<body data-session="{html_escape(session_dir_name)}">
+<body data-session="{html_escape(Path(dir_path).name)}">
   <div class="container">
     <h1>Test Dashboard</h1>
     {summary_html}
+    {_failures_html(totals.failures.summary())}
     {env_html}
+    {_lanes_html(totals.lane_summary())}
+    {_cleanup_html(totals.cleanup)}
+    {_load_html(extras.get("load"))}
+    {_latency_html(extras.get("latency"))}
+    {_trends_html(trends)}
+    <div class="viewport" id="viewport">
     <table class="table">
+      <colgroup>
+        <col style="width:70px"><col><col style="width:80px"><col style="width:100px">
+        <col style="width:150px"><col style="width:170px"><col style="width:32%">
+      </colgroup>
       <thead>
         <tr>
           <th>Order</th>
@@ -557,22 +1125,59 @@ def _build_dashboard_html(session_dir_name: str, dir_path: Path) -> str:
           <th>Error</th>
         </tr>
       </thead>
-      <tbody>{''.join(rows)}</tbody>
+      <tbody></tbody>
     </table>
+    </div>
     <div class="footer">generated at {html_escape(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))}</div>
   </div>
-</body>
-</html>"""
-
-
-def write_dashboard(output_dir: Path) -> Path:
-    """Gera o dashboard.html sem abrir o navegador."""
+<script type="application/json" id="results-data">{{"cols":{_island(list(_DASH_COLS))},"rows":[""")
+    # uma passada: cada grupo vai para um arquivo temporário (concatenados na ordem
+    # no fim); a posição final de cada linha já é conhecida pelos totais, então os
+    # erros completos vão direto para o 2º bloco (parse só no primeiro "expandir")
+    sizes = [failed, passed, skipped, total - failed - passed - skipped]
+    offsets = [sum(sizes[:g]) for g in range(len(sizes))]
+    written = [0] * len(sizes)
+    with ExitStack() as stack:
+        groups = [stack.enter_context(tempfile.TemporaryFile("w+", encoding="utf-8")) for _ in sizes]
+        errors = stack.enter_context(tempfile.TemporaryFile("w+", encoding="utf-8"))
+        has_errors = False
+        for r in J.iter_results(dir_path):
+            g = _ROW_GROUP.get(r.get("outcome"), 3)
+            row, error = _dashboard_row(r, totals.failures.by_nodeid.get(r.get("nodeid")))
+            groups[g].write(("," if written[g] else "") + _island(row))
+            if error:
+                errors.write(f'{"," if has_errors else ""}"{offsets[g] + written[g]}":{_island(error)}')
+                has_errors = True
+            written[g] += 1
+        first = True
+        for g, tmp in enumerate(groups):
+            if not written[g]:
+                continue
+            fh.write("" if first else ",")
+            tmp.seek(0)
+            shutil.copyfileobj(tmp, fh)
+            first = False
+        fh.write(']}</script>\n<script type="application/json" id="results-errors">{')
+        errors.seek(0)
+        shutil.copyfileobj(errors, fh)
+    fh.write("}</script>\n</body>\n</html>")
+
+
+def _trends(output_dir: Path, history_db) -> dict:
+    if not history_db or not Path(history_db).exists():
+        return None
+    with History(history_db) as history:
+        return history.trends(Path(output_dir).name)
+
+
+def write_dashboard(output_dir: Path, history_db: Path = None) -> Path:
+    """Gera o dashboard.html sem abrir o navegador (history_db → card Trends)."""
     output_dir = Path(output_dir)
     ensure_dir(str(output_dir))
 
     html_path = output_dir / "dashboard.html"
-    html = _build_dashboard_html(output_dir.name, output_dir)
-    html_path.write_text(html, encoding="utf-8")
+    with html_path.open("w", encoding="utf-8") as fh:
+        _write_dashboard_html(fh, output_dir, _trends(output_dir, history_db))
 
     root_dir = Path(__file__).resolve().parents[1]
 
@@ -586,9 +1191,9 @@ def write_dashboard(output_dir: Path) -> Path:
     return html_path
 
 
-def write_and_open_dashboard(output_dir: Path) -> None:
+def write_and_open_dashboard(output_dir: Path, history_db: Path = None) -> None:
     """Gera o dashboard.html e abre no navegador (se não for CI)."""
-    path = write_dashboard(output_dir)
+    path = write_dashboard(output_dir, history_db)
     if not os.environ.get("CI"):
         try:
             webbrowser.open(path.resolve().as_uri())
@@ -596,29 +1201,102 @@ def write_and_open_dashboard(output_dir: Path) -> None:
             pass
 
 
-def write_session_summary(output_dir: Path, exitstatus: int) -> None:
+def write_session_summary(output_dir: Path, exitstatus: int = None) -> dict:
+    """
+    session_summary.json a partir do journal: cabeçalho com os totais (uma
+    passada) e depois o array "tests", um teste por linha (outra passada).
+    exitstatus=None → usa o do journal (ou marca a sessão como interrompida).
+    """
     ensure_dir(str(output_dir))
-    total = len(_REPORTS)
-    failed = sum(1 for r in _REPORTS if r.get("outcome") == "failed")
-    passed = sum(1 for r in _REPORTS if r.get("outcome") == "passed")
-    skipped = sum(1 for r in _REPORTS if r.get("outcome") == "skipped")
+    totals = session_totals(output_dir)
+    total, passed = totals.total, totals.passed
+    unfinished = totals.info.get("unfinished") or []
+    if exitstatus is None:
+        exitstatus = totals.info.get("exitstatus")
     finished = datetime.now()
 
-    payload = {
-        "session_info": {
-            "timestamp": Path(output_dir).name,
-            "started_at": _SESSION_START.strftime("%Y-%m-%d %H:%M:%S"),
-            "finished_at": finished.strftime("%Y-%m-%d %H:%M:%S"),
-            "pytest_exitstatus": exitstatus,
-            "total_tests": total,
-            "passed": passed,
-            "failed": failed,
-            "skipped": skipped,
-            "pass_rate": round((passed / total * 100.0), 2) if total else 0.0,
-        },
-        "tests": _REPORTS,
+    session_info = {
+        "timestamp": Path(output_dir).name,
+        "started_at": totals.started_at,
+        "finished_at": finished.strftime(_TS_FMT),
+        "pytest_exitstatus": None if exitstatus is None else int(exitstatus),
+        "total_tests": total,
+        "passed": passed,
+        "failed": totals.failed,
+        "skipped": totals.skipped,
+        "pass_rate": round((passed / total * 100.0), 2) if total else 0.0,
     }
-
-    (Path(output_dir) / "session_summary.json").write_text(
-        json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8"
+    if unfinished:
+        session_info["interrupted"] = unfinished
+
+    header = {"session_info": session_info}
+    lanes = totals.lane_summary()
+    if lanes:
+        header["lanes"] = lanes
+    for key in ("load", "latency"):
+        if totals.extras.get(key):
+            header[key] = totals.extras[key]
+    clusters = totals.failures.summary()
+    if clusters:
+        header["failure_clusters"] = clusters
+    signatures = totals.failures.by_nodeid
+
+    def _indent(obj, level: int) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False).replace("\n", "\n" + "  " * level)
+
+    def _compact(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False, separators=(", ", ": "))
+
+    path = Path(output_dir) / "session_summary.json"
+    tmp = path.with_name(".session_summary.json.tmp")
+    with tmp.open("w", encoding="utf-8") as fh:
+        fh.write("{\n")
+        for key, value in header.items():
+            fh.write(f"  {json.dumps(key)}: {_indent(value, 1)},\n")
+        fh.write('  "tests": [')
+        sep = "\n"
+        for r in J.iter_results(output_dir):
+            # um teste por linha: legível com grep/diff e sem o encoder lento do indent
+            sig = signatures.get(r.get("nodeid"))
+            fh.write(f"{sep}    {_compact(dict(r, signature=sig) if sig else r)}")
+            sep = ",\n"
+        fh.write("\n  ]\n}" if sep == ",\n" else "]\n}")
+    os.replace(tmp, path)
+    return session_info
+
+
+def main(argv=None) -> int:
+    """Reconstrói session_summary.json e dashboard.html a partir do journal (sessão parcial inclusive)."""
+    parser = argparse.ArgumentParser(
+        prog="python -m utils.reporting",
+        description="Rebuild session_summary.json and dashboard.html from a session's results journal.",
     )
+    parser.add_argument("session_dir", help="session folder (tests_compiled_info/<timestamp>_<suite>)")
+    parser.add_argument("--open", action="store_true", help="open the dashboard in the browser")
+    parser.add_argument("--history-db", default=str(DEFAULT_HISTORY_PATH),
+                        help="history database for the Trends card (ingests this session; '' = no trends)")
+    args = parser.parse_args(argv)
+
+    session_dir = Path(args.session_dir)
+    if not J.journal_files(session_dir):
+        print(f"No results journal in {session_dir / J.JOURNAL_DIRNAME}", file=sys.stderr)
+        return 2
+    info = write_session_summary(session_dir)
+    if args.history_db:
+        with History(args.history_db) as history:
+            history.ingest_session(session_dir)
+    if args.open:
+        write_and_open_dashboard(session_dir, args.history_db or None)
+    else:
+        write_dashboard(session_dir, args.history_db or None)
+    print(
+        f"{info['total_tests']} test(s): {info['passed']} passed, {info['failed']} failed, "
+        f"{info['skipped']} skipped"
+    )
+    if info.get("interrupted"):
+        print(f"Interrupted journal(s): {', '.join(info['interrupted'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
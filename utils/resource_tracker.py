@@ -0,0 +1,157 @@
+# utils/resource_tracker.py
+# Rastreia o que o teste criou pela API (wishlists, produtos, usuários) e apaga
+# exatamente isso no teardown — sem re-listar tudo do usuário.
+#
+# Entra como listener do ApiClient: cada POST bem-sucedido em /wishlists,
+# /wishlists/{id}/products ou /auth/register vira um recurso rastreado (com o
+# Authorization usado na criação); DELETE feito pelo próprio teste tira da lista.
+# A limpeza é concorrente (pool limitado) e por etapas, na ordem de dependência:
+# produtos → wishlists → usuários.
+
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+CLEANUP_ORDER = ("product", "wishlist", "user")
+CLEANUP_MODES = ("test", "deferred")
+DEFAULT_CLEANUP_WORKERS = 8
+
+_CREATE_ROUTES = (
+    (re.compile(r"^/wishlists/?$"), "wishlist"),
+    (re.compile(r"^/wishlists/[^/]+/products/?$"), "product"),
+    (re.compile(r"^/auth/register/?$"), "user"),
+)
+_DELETE_ROUTES = (
+    (re.compile(r"^/products/([^/]+)/?$"), "product"),
+    (re.compile(r"^/wishlists/([^/]+)/?$"), "wishlist"),
+)
+# status que contam como "já não existe" / "API não apaga esse tipo"
+_GONE_STATUSES = (404,)
+_UNSUPPORTED_STATUSES = (405,)
+
+
+class ResourceTracker:
+    """owner: nodeid do teste (vai junto das falhas para o dashboard)."""
+
+    def __init__(self, owner: str = "", logger=None):
+        self.owner = owner
+        self._log = logger
+        self._lock = threading.Lock()
+        self.resources: List[dict] = []
+
+    def __len__(self) -> int:
+        return len(self.resources)
+
+    def _info(self, msg: str) -> None:
+        if self._log:
+            self._log.info(msg)
+
+    # ---------- rastreio ----------
+    def track(self, kind: str, rid, base_url: str, headers: Optional[dict] = None, **extra) -> None:
+        with self._lock:
+            self.resources.append(
+                {"kind": kind, "id": rid, "base_url": base_url, "headers": dict(headers or {}),
+                 "owner": self.owner, **extra}
+            )
+
+    def untrack(self, kind: str, rid) -> None:
+        with self._lock:
+            self.resources = [
+                r for r in self.resources if not (r["kind"] == kind and str(r["id"]) == str(rid))
+            ]
+
+    def on_response(self, method: str, url: str, kwargs: dict, resp, elapsed: float) -> None:
+        """Listener do ApiClient."""
+        if not 200 <= resp.status_code < 300:
+            return
+        parts = urlsplit(url)
+        path, base_url = parts.path, f"{parts.scheme}://{parts.netloc}"
+        headers = {k: v for k, v in (kwargs.get("headers") or {}).items() if k.lower() == "authorization"}
+
+        if method == "POST":
+            for pattern, kind in _CREATE_ROUTES:
+                if not pattern.match(path):
+                    continue
+                try:
+                    body = resp.json() or {}
+                except ValueError:
+                    body = {}
+                if kind == "user":
+                    creds = kwargs.get("json") or {}
+                    self.track("user", body.get("id") or creds.get("email"), base_url,
+                               email=creds.get("email"), password=creds.get("password"))
+                elif body.get("id") is not None:
+                    self.track(kind, body["id"], base_url, headers)
+                return
+        elif method == "DELETE":
+            for pattern, kind in _DELETE_ROUTES:
+                m = pattern.match(path)
+                if m:
+                    self.untrack(kind, m.group(1))
+                    return
+
+    def absorb(self, other: "ResourceTracker", kinds: Iterable[str] = CLEANUP_ORDER) -> int:
+        """Modo deferred: move os recursos do teste para o tracker da sessão."""
+        kinds = set(kinds)
+        with other._lock:
+            moved = [r for r in other.resources if r["kind"] in kinds]
+            other.resources = [r for r in other.resources if r["kind"] not in kinds]
+        with self._lock:
+            self.resources.extend(moved)
+        return len(moved)
+
+    # ---------- limpeza ----------
+    def _delete(self, client, res: dict) -> Optional[dict]:
+        kind, base = res["kind"], res["base_url"]
+        url = "/users/me" if kind == "user" else f"/{kind}s/{res['id']}"
+        try:
+            if kind == "user":
+                if not res.get("email"):
+                    return None
+                login = client.post(
+                    f"{base}/auth/login", json={"email": res["email"], "password": res.get("password")}
+                )
+                if login.status_code in _GONE_STATUSES + (401,):
+                    return None  # já apagado / senha trocada pelo teste
+                token = (login.json() or {}).get("access_token")
+                resp = client.delete(f"{base}{url}", headers={"Authorization": f"Bearer {token}"})
+            else:
+                resp = client.delete(f"{base}{url}", headers=res["headers"])
+        except Exception as e:
+            return {"kind": kind, "id": res["id"], "request": f"DELETE {url}",
+                    "error": f"{type(e).__name__}: {e}", "owner": res["owner"]}
+        if resp.status_code < 300 or resp.status_code in _GONE_STATUSES:
+            return None
+        if kind == "user" and resp.status_code in _UNSUPPORTED_STATUSES:
+            return None
+        return {"kind": kind, "id": res["id"], "request": f"DELETE {url}",
+                "error": f"{resp.status_code} {resp.text[:200]}", "owner": res["owner"]}
+
+    def cleanup(self, client, kinds: Iterable[str] = CLEANUP_ORDER, workers: int = DEFAULT_CLEANUP_WORKERS) -> List[dict]:
+        """Apaga os recursos rastreados (etapa por tipo, concorrente dentro da etapa). Devolve as falhas."""
+        kinds = [k for k in CLEANUP_ORDER if k in set(kinds)]
+        failures: List[dict] = []
+        for kind in kinds:
+            with self._lock:
+                batch = [r for r in self.resources if r["kind"] == kind]
+                self.resources = [r for r in self.resources if r["kind"] != kind]
+            if not batch:
+                continue
+            if len(batch) == 1 or workers <= 1:
+                results = [self._delete(client, r) for r in batch]
+            else:
+                with ThreadPoolExecutor(max_workers=min(workers, len(batch))) as pool:
+                    results = list(pool.map(lambda r: self._delete(client, r), batch))
+            failures.extend(f for f in results if f)
+        for f in failures:
+            self._info(f"[CLEANUP] failed {f['request']} ({f['owner']}): {f['error']}")
+        return failures
+
+
+def group_by_owner(failures: List[dict]) -> Dict[str, List[dict]]:
+    out: Dict[str, List[dict]] = {}
+    for f in failures:
+        out.setdefault(f.get("owner") or "", []).append(f)
+    return out
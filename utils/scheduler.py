@@ -0,0 +1,235 @@
+# utils/scheduler.py
+# Ordem de execução e shards pela duração esperada de cada teste.
+#
+# Duração esperada = mediana das últimas execuções, do histórico entre sessões
+# (utils/history.py) ou, sem ele, dos session_summary.json mais recentes.
+# Teste sem histórico entra com a mediana dos conhecidos.
+#
+#   --schedule longest → mais longos primeiro (LPT). Com xdist (--dist load) os
+#     workers pegam o próximo teste da fila quando ficam livres: os fluxos longos
+#     saem no começo e não esticam o fim da execução.
+#   --shard i/N → divide os testes em N partes de tempo esperado parecido
+#     (LPT: cada unidade, da mais longa para a mais curta, vai para o shard
+#     menos carregado) e roda só a parte i. Mesma divisão em qualquer máquina
+#     que leia o mesmo snapshot de durações (ver abaixo).
+#
+# Unidades: testes que precisam ficar juntos (linhas de um mesmo CSV, que o
+# runner dispara de uma vez) contam como um bloco só, com a soma das durações.
+#
+# Shards precisam da MESMA entrada: cada execução entra no histórico no fim, então
+# `--shard 1/3`, `2/3`, `3/3` rodados em sequência veriam durações diferentes e as
+# partes não fechariam. Com --shard as durações vêm de um snapshot fixo
+# (--shard-durations, default tests_compiled_info/shard_durations.json): o 1º shard
+# grava, os outros leem. Para atualizar: apagar o arquivo ou, no CI antes de
+# disparar os shards,
+#   python -m utils.scheduler snapshot [--db history.sqlite] [--out shard_durations.json]
+# O fingerprint das durações vai para o log/terminal: shards com fingerprints
+# diferentes não formam uma partição.
+
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from utils.history import DEFAULT_HISTORY_PATH, DEFAULT_SESSIONS_ROOT, DEFAULT_WINDOW, SUMMARY_FILENAME, History
+
+SCHEDULE_MODES = ("collection", "longest")
+DEFAULT_SHARD_DURATIONS = DEFAULT_SESSIONS_ROOT / "shard_durations.json"
+# sem histórico nenhum: todos iguais (a divisão vira por quantidade)
+DEFAULT_UNKNOWN_S = 1.0
+
+
+def parse_shard(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    """'2/4' → (2, 4); None/'' → None."""
+    if not value:
+        return None
+    try:
+        index, total = (int(v) for v in value.split("/"))
+    except ValueError:
+        raise ValueError(f"--shard must be i/N (e.g. 1/4), got {value!r}") from None
+    if total < 1 or not 1 <= index <= total:
+        raise ValueError(f"--shard {value}: need 1 <= i <= N")
+    return index, total
+
+
+def durations_from_summaries(root: Path, sessions: int = DEFAULT_WINDOW) -> Dict[str, float]:
+    """Mediana por teste nos `sessions` session_summary.json mais recentes de root."""
+    paths = sorted(Path(root).glob(f"*/{SUMMARY_FILENAME}"))[-sessions:] if Path(root).exists() else []
+    by_test: Dict[str, List[float]] = {}
+    for path in paths:
+        try:
+            tests = json.loads(path.read_text(encoding="utf-8")).get("tests") or []
+        except (OSError, ValueError):
+            continue
+        for t in tests:
+            if t.get("outcome") in ("passed", "failed") and isinstance(t.get("duration"), (int, float)):
+                by_test.setdefault(t["nodeid"], []).append(t["duration"])
+    return {nodeid: statistics.median(values) for nodeid, values in by_test.items()}
+
+
+def expected_durations(history_db: Optional[Path], sessions_root: Path) -> Tuple[Dict[str, float], str]:
+    """(durações, origem). Histórico SQLite se existir; senão os summaries da pasta de sessões."""
+    if history_db and Path(history_db).exists():
+        with History(history_db) as history:
+            durations = history.expected_durations()
+        if durations:
+            return durations, str(history_db)
+    return durations_from_summaries(sessions_root), str(sessions_root)
+
+
+def fingerprint(durations: Dict[str, float]) -> str:
+    """Hash curto das durações (shards com o mesmo fingerprint dividem igual)."""
+    blob = json.dumps(durations, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:12]
+
+
+def write_snapshot(path: Path, durations: Dict[str, float], source: str) -> dict:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    snapshot = {
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "source": source,
+        "fingerprint": fingerprint(durations),
+        "durations": durations,
+    }
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(snapshot, indent=0, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+    return snapshot
+
+
+def pinned_durations(path: Path, history_db: Optional[Path], sessions_root: Path) -> Tuple[dict, bool]:
+    """(snapshot, criado agora?). Lê o snapshot de path; se não existir, gera do histórico e grava."""
+    path = Path(path)
+    if path.exists():
+        try:
+            snapshot = json.loads(path.read_text(encoding="utf-8"))
+            if isinstance(snapshot.get("durations"), dict):
+                return snapshot, False
+        except ValueError:
+            pass
+    durations, source = expected_durations(history_db, sessions_root)
+    return write_snapshot(path, durations, source), True
+
+
+class Unit:
+    """Bloco de testes que roda junto (um teste, ou todas as linhas de um CSV)."""
+
+    __slots__ = ("items", "cost", "first")
+
+    def __init__(self, first: int):
+        self.items: list = []
+        self.cost = 0.0
+        self.first = first  # posição de coleta: desempate estável
+
+    def __repr__(self) -> str:
+        return f"Unit({len(self.items)} item(s), {self.cost:.2f}s)"
+
+
+def build_units(items: list, durations: Dict[str, float],
+                group_key: Callable[[object], Optional[Hashable]] = lambda item: None) -> Tuple[List[Unit], int]:
+    """(unidades na ordem de coleta, quantos testes não tinham histórico)."""
+    known = [durations[i.nodeid] for i in items if i.nodeid in durations]
+    default = statistics.median(known) if known else DEFAULT_UNKNOWN_S
+    units: List[Unit] = []
+    groups: Dict[Hashable, Unit] = {}
+    unknown = 0
+    for pos, item in enumerate(items):
+        key = group_key(item)
+        unit = groups.get(key) if key is not None else None
+        if unit is None:
+            unit = Unit(pos)
+            units.append(unit)
+            if key is not None:
+                groups[key] = unit
+        cost = durations.get(item.nodeid)
+        if cost is None:
+            unknown += 1
+            cost = default
+        unit.items.append(item)
+        unit.cost += cost
+    return units, unknown
+
+
+def longest_first(units: List[Unit]) -> List[Unit]:
+    return sorted(units, key=lambda u: (-u.cost, u.first))
+
+
+def lpt_partition(units: List[Unit], n: int) -> List[List[Unit]]:
+    """N partes de custo parecido: mais longa primeiro, sempre para a parte menos carregada. O(u log u)."""
+    parts: List[List[Unit]] = [[] for _ in range(n)]
+    heap = [(0.0, i) for i in range(n)]
+    for unit in longest_first(units):
+        load, i = heapq.heappop(heap)
+        parts[i].append(unit)
+        heapq.heappush(heap, (load + unit.cost, i))
+    return parts
+
+
+def plan(items: list, durations: Dict[str, float], mode: str = "collection",
+         shard: Optional[Tuple[int, int]] = None,
+         group_key: Callable[[object], Optional[Hashable]] = lambda item: None) -> Tuple[list, list, dict]:
+    """
+    (itens a rodar na ordem nova, itens de outros shards, resumo para log/meta).
+    mode "collection" mantém a ordem de coleta dentro do shard; "longest" ordena por LPT.
+    """
+    units, unknown = build_units(items, durations, group_key)
+    info = {"mode": mode, "tests": len(items), "units": len(units), "unknown": unknown,
+            "expected_s": round(sum(u.cost for u in units), 3)}
+    deselected: list = []
+    if shard is not None:
+        index, total = shard
+        parts = lpt_partition(units, total)
+        info["shard"] = f"{index}/{total}"
+        info["shards_expected_s"] = [round(sum(u.cost for u in p), 3) for p in parts]
+        for i, part in enumerate(parts, start=1):
+            if i != index:
+                deselected.extend(item for u in part for item in u.items)
+        units = sorted(parts[index - 1], key=lambda u: u.first)
+        info["shard_tests"] = sum(len(u.items) for u in units)
+    if mode == "longest":
+        units = longest_first(units)
+    return [item for u in units for item in u.items], deselected, info
+
+
+def plan_lines(info: dict, source: str) -> List[str]:
+    lines = [
+        f"{info['mode']} order, {info['tests']} test(s), expected {info['expected_s']:.1f}s "
+        f"({info['unknown']} without history; durations from {source}"
+        + (f", fingerprint {info['fingerprint']}" if info.get("fingerprint") else "") + ")"
+    ]
+    if "shard" in info:
+        spread = info["shards_expected_s"]
+        lines.append(
+            f"shard {info['shard']}: {info['shard_tests']} test(s), expected "
+            f"{spread[int(info['shard'].split('/')[0]) - 1]:.1f}s (all shards: "
+            + ", ".join(f"{s:.1f}s" for s in spread) + ")"
+        )
+    return lines
+
+
+def main(argv=None) -> int:
+    """Gera o snapshot de durações que todos os shards leem (--shard-durations)."""
+    parser = argparse.ArgumentParser(prog="python -m utils.scheduler",
+                                     description="Expected test durations for --schedule/--shard.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    snap = sub.add_parser("snapshot", help="write the durations file shared by all shards")
+    snap.add_argument("--db", default=str(DEFAULT_HISTORY_PATH), help="history database ('' = summaries only)")
+    snap.add_argument("--sessions", default=str(DEFAULT_SESSIONS_ROOT), help="session folders (fallback)")
+    snap.add_argument("--out", default=str(DEFAULT_SHARD_DURATIONS))
+    args = parser.parse_args(argv)
+
+    durations, source = expected_durations(Path(args.db) if args.db else None, Path(args.sessions))
+    snapshot = write_snapshot(Path(args.out), durations, source)
+    print(f"{len(durations)} test duration(s) from {source} → {args.out} (fingerprint {snapshot['fingerprint']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+# utils/signatures.py
+# Assinatura de falha: agrupa testes que quebraram pela mesma causa.
+#
+# Do texto do erro (longreprtext do pytest, ver reporting.upsert_result) saem:
+#   exceção  → tipo da última exceção ("NoSuchElementException", "AssertionError")
+#   mensagem → 1ª linha "E ..." da última exceção, normalizada (sem endereços,
+#              timestamps, ids de sessão, números longos e valores de locator)
+#   frames   → os 3 frames mais internos do código do projeto (pages/, utils/,
+#              conftest...), sem número de linha; frames de teste (test_*.py) e
+#              de bibliotecas ficam de fora — o mesmo page object quebrado em 30
+#              testes diferentes vira uma assinatura só
+# assinatura = sha1(exceção + mensagem + frames)[:12]
+#
+# FailureClusters soma teste a teste (uma passada, dict por assinatura): contagem,
+# primeira/última ocorrência e alguns nodeids de exemplo.
+
+import hashlib
+import re
+from typing import Dict, List, Optional, Tuple
+
+TOP_FRAMES = 3
+MESSAGE_MAX = 200
+EXAMPLE_TESTS = 20
+
+# "pages/home.py:42: in search" / "pages/home.py:42: NoSuchElementException" (formato long/short do pytest)
+_LOCATION = re.compile(r"^(\S.*?\.py):\d+:(?: in (\w+)| (\w[\w.]*))?\s*$")
+# '  File "pages/home.py", line 42, in search' (--tb=native)
+_NATIVE = re.compile(r'^\s*File "([^"]+\.py)", line \d+, in (\w+)')
+_DEF = re.compile(r"^\s*(?:async\s+)?def (\w+)\(")
+_EXC_PREFIX = re.compile(r"^([A-Za-z_][\w.]*(?:Error|Exception|Exit|Interrupt|Timeout|Failure|Warning)): ?")
+_LIB_PATH = re.compile(r"site-packages|dist-packages|[/\\]lib[/\\]python|^<")
+_TEST_FILE = re.compile(r"(?:^|[/\\])(?:test_[^/\\]*|[^/\\]*_test)\.py$")
+
+# ordem importa: locators e timestamps antes dos números genéricos
+_NORMALIZE: List[Tuple[re.Pattern, str]] = [
+    # {"method":"css selector","selector":"#busca"} (Selenium) / {"using":...,"value":"x"} (W3C/Appium);
+    # a estratégia (method/using) fica
+    (re.compile(r'("(?:selector|value)"\s*:\s*)"(?:[^"\\]|\\.)*"'), r'\1"<locator>"'),
+    # ('css selector', '#busca') / (By.ID, "x") / (AppiumBy.ACCESSIBILITY_ID, 'x')
+    (re.compile(r"""(\((?:['"](?:css selector|xpath|id|name|link text|partial link text|tag name|class name|"""
+                r"""accessibility id|-android uiautomator|-ios predicate string|-ios class chain)['"]"""
+                r"""|\w*By\.\w+),\s*)(['"]).*?\2(?=\))"""), r"\1<locator>"),
+    # locator=..., xpath: '...', with value '...'
+    (re.compile(r"""\b(locator|selector|xpath|css|value)(\s*[=:]\s*|\s+)(['"]).*?\3""", re.I), r"\1\2<locator>"),
+    (re.compile(r"0x[0-9a-fA-F]+"), "<addr>"),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}(?:[T _]\d{2}[:-]\d{2}[:-]\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?)?\b"), "<ts>"),
+    (re.compile(r"\b\d{1,2}:\d{2}:\d{2}(?:[.,]\d+)?\b"), "<ts>"),
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"), "<id>"),
+    # "invalid session id: Session ..." não é id: o valor precisa ter dígito
+    (re.compile(r"""(session[ _-]?id["']?\s*[:=]\s*["']?)(?=[\w.-]*\d)[\w.-]+""", re.I), r"\1<id>"),
+    (re.compile(r"\b(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{16,}\b"), "<id>"),
+    (re.compile(r"(?<![\w.])\d+\.\d{3,}"), "<n>"),
+    (re.compile(r"(?<![\w.])\d{5,}(?!\d)"), "<n>"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+def normalize(text: str) -> str:
+    for pattern, repl in _NORMALIZE:
+        text = pattern.sub(repl, text)
+    return text.strip()
+
+
+def _project_frame(path: str) -> bool:
+    return not _LIB_PATH.search(path) and not _TEST_FILE.search(path)
+
+
+def parse_error(error: str) -> Tuple[str, str, List[str]]:
+    """(tipo da exceção, mensagem crua, frames do projeto do mais externo ao mais interno)."""
+    frames: List[str] = []
+    exc_type = ""
+    last_e: Optional[str] = None  # 1ª linha E do bloco que fechou no último frame
+    current_e: Optional[str] = None
+    last_def = ""
+    last_line = ""
+    for raw in error.splitlines():
+        line = raw.rstrip()
+        if not line:
+            continue
+        last_line = line
+        if line.startswith("E "):
+            if current_e is None:
+                current_e = line[1:].strip()
+            continue
+        m = (_LOCATION.match(line) or _NATIVE.match(line)) if ".py" in line else None
+        if m:
+            path, func = m.group(1), m.group(2)
+            if m.re is _LOCATION and not func:
+                func = last_def
+                exc_type = m.group(3) or exc_type
+            if _project_frame(path):
+                frames.append(f"{path}::{func}" if func else path)
+            if current_e is not None:
+                last_e, current_e = current_e, None
+            last_def = ""
+            continue
+        if "def " in line:
+            d = _DEF.match(line.lstrip(">"))
+            last_def = d.group(1) if d else last_def
+    message = current_e if current_e is not None else last_e
+    if message is None:
+        # sem linhas "E" (--tb=native, erro montado à mão): última linha não vazia
+        message = last_line.strip()
+    prefix = _EXC_PREFIX.match(message)
+    if prefix:
+        exc_type = prefix.group(1).rsplit(".", 1)[-1]
+        message = message[prefix.end():]
+    elif message.startswith("assert "):
+        exc_type = exc_type or "AssertionError"
+    return exc_type or "Error", message, frames
+
+
+def signature(error: str) -> Tuple[str, dict]:
+    """(assinatura, {"exception", "message", "frames"}) de um texto de erro."""
+    exc_type, message, frames = parse_error(error)
+    top: List[str] = []
+    for frame in reversed(frames):
+        if not top or top[-1] != frame:
+            top.append(frame)
+        if len(top) == TOP_FRAMES:
+            break
+    detail = {"exception": exc_type, "message": normalize(message)[:MESSAGE_MAX], "frames": top}
+    key = "\n".join([exc_type, detail["message"], *top])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12], detail
+
+
+class FailureClusters:
+    """Falhas agrupadas por assinatura, teste a teste (O(n) no total de falhas)."""
+
+    def __init__(self):
+        self.clusters: Dict[str, dict] = {}
+        self.by_nodeid: Dict[str, str] = {}
+
+    def add(self, r: dict) -> Optional[str]:
+        """Resultado do journal; só entra quem tem erro. Devolve a assinatura (ou None)."""
+        error = r.get("error")
+        if not error or r.get("outcome") in ("passed", "skipped"):
+            return None
+        sig, detail = signature(error)
+        seen = {k: r.get(k) for k in ("nodeid", "order", "start")}
+        cl = self.clusters.get(sig)
+        if cl is None:
+            cl = self.clusters[sig] = dict(signature=sig, count=0, **detail, first=seen, last=seen, tests=[])
+        cl["count"] += 1
+        cl["last"] = seen
+        if len(cl["tests"]) < EXAMPLE_TESTS:
+            cl["tests"].append(r.get("nodeid"))
+        self.by_nodeid[r.get("nodeid")] = sig
+        return sig
+
+    def summary(self) -> List[dict]:
+        """Maiores grupos primeiro; empate → quem apareceu antes."""
+        return sorted(self.clusters.values(), key=lambda c: (-c["count"], c["first"].get("order") or 0))
@@ -0,0 +1,126 @@
+# utils/startup_profile.py
+# Perfil de inicialização do pytest (--startup-profile): quanto custa importar
+# cada módulo durante a coleta e quanto tempo cada arquivo de teste leva para
+# ser coletado. Mesma ideia do `python -X importtime`, mas só da fase de coleta
+# e agrupado por pacote, para achar quem puxa selenium/appium sem necessidade.
+
+import builtins
+import importlib.util
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# dependências pesadas que uma execução só de API não deveria carregar
+HEAVY_PACKAGES = ("selenium", "appium", "webdriver_manager")
+
+
+class ImportProfiler:
+    """
+    Envolve builtins.__import__ e mede os imports de primeira vez.
+    records: módulo → [self_s, cumulative_s] (self = sem os imports aninhados).
+    """
+
+    def __init__(self):
+        self.records: Dict[str, List[float]] = {}
+        self._stack: List[float] = []
+        self._orig = None
+
+    def start(self) -> None:
+        if self._orig is None:
+            self._orig = builtins.__import__
+            builtins.__import__ = self._import
+
+    def stop(self) -> None:
+        if self._orig is not None:
+            builtins.__import__ = self._orig
+            self._orig = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        orig = self._orig or builtins.__import__
+        if level == 0 and name in sys.modules:
+            return orig(name, globals, locals, fromlist, level)
+        fullname = name
+        if level:
+            try:
+                fullname = importlib.util.resolve_name("." * level + name, (globals or {}).get("__package__"))
+            except (ImportError, ValueError):
+                pass
+            if fullname in sys.modules:
+                return orig(name, globals, locals, fromlist, level)
+
+        self._stack.append(0.0)
+        t0 = time.perf_counter()
+        try:
+            return orig(name, globals, locals, fromlist, level)
+        finally:
+            cum = time.perf_counter() - t0
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += cum
+            rec = self.records.setdefault(fullname, [0.0, 0.0])
+            rec[0] += cum - children
+            rec[1] += cum
+
+
+class StartupProfile:
+    """Junta os tempos de import e de coleta por arquivo e gera o relatório."""
+
+    def __init__(self):
+        self.imports = ImportProfiler()
+        self.collect_files: Dict[str, float] = {}
+        self.collection_s: Optional[float] = None
+        self.preloaded_heavy = [p for p in HEAVY_PACKAGES if p in sys.modules]
+
+    def start(self) -> None:
+        self.imports.start()
+
+    def stop(self) -> None:
+        self.imports.stop()
+
+    def record_file(self, path: str, seconds: float) -> None:
+        self.collect_files[path] = self.collect_files.get(path, 0.0) + seconds
+
+    def by_package(self) -> Dict[str, float]:
+        out: Dict[str, float] = {}
+        for name, (self_s, _) in self.imports.records.items():
+            top = name.split(".")[0]
+            out[top] = out.get(top, 0.0) + self_s
+        return out
+
+    def to_dict(self, top: int = 25) -> dict:
+        loaded_heavy = [p for p in HEAVY_PACKAGES if p in sys.modules]
+        modules = sorted(self.imports.records.items(), key=lambda kv: kv[1][1], reverse=True)[:top]
+        return {
+            "collection_s": None if self.collection_s is None else round(self.collection_s, 4),
+            "import_s": round(sum(s for s, _ in self.imports.records.values()), 4),
+            "heavy_loaded_before_collection": self.preloaded_heavy,
+            "heavy_loaded": loaded_heavy,
+            "files": {
+                k: round(v, 4)
+                for k, v in sorted(self.collect_files.items(), key=lambda kv: kv[1], reverse=True)
+            },
+            "packages": {
+                k: round(v, 4)
+                for k, v in sorted(self.by_package().items(), key=lambda kv: kv[1], reverse=True)[:top]
+            },
+            "modules": {name: {"self_s": round(s, 4), "cumulative_s": round(c, 4)} for name, (s, c) in modules},
+        }
+
+    def write(self, path: Path) -> Path:
+        path = Path(path)
+        path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+        return path
+
+    def lines(self, top: int = 10) -> List[str]:
+        data = self.to_dict(top=top)
+        out = [
+            f"collection: {data['collection_s'] or 0:.3f}s  (imports during collection: {data['import_s']:.3f}s)",
+            f"heavy deps loaded: {', '.join(data['heavy_loaded']) or 'none'}",
+            "slowest test files (collect):",
+        ]
+        out += [f"  {v * 1000:8.1f}ms  {k}" for k, v in list(data["files"].items())[:top]]
+        out.append("import cost by package (self time):")
+        out += [f"  {v * 1000:8.1f}ms  {k}" for k, v in data["packages"].items()]
+        return out
@@ -0,0 +1,223 @@
+# utils/user_pool.py
+# Pool de usuários da API pré-cadastrados (um pool por processo/worker).
+#
+# Em vez de register + login a cada teste, o pool cadastra N usuários de uma
+# vez (em paralelo) na primeira vez que alguém pede um usuário e empresta um
+# usuário "limpo" por teste:
+#   - no lease, as wishlists (e produtos) que sobraram do teste anterior são apagadas
+#   - o token é renovado (novo login) quando está perto de expirar ou a API responde 401
+#   - no fim da sessão os usuários são apagados (DELETE /users/me), se a API permitir
+# check_token_exp=False (--cassette replay): o JWT gravado traz o `exp` da hora da
+# gravação; conferir contra o relógio de agora pediria logins que não estão no cassete.
+
+import base64
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+DEFAULT_POOL_SIZE = 4
+USER_PASSWORD = "password123"
+# renova o token quando faltar menos que isso para expirar
+TOKEN_REFRESH_MARGIN_S = 60
+
+
+def jwt_expiry(token: str) -> Optional[float]:
+    """`exp` (epoch) do JWT, sem validar assinatura; None se não for JWT/sem exp."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+        return float(exp) if exp is not None else None
+    except Exception:
+        return None
+
+
+class PooledUser:
+    def __init__(self, username: str, email: str, password: str):
+        self.username = username
+        self.email = email
+        self.password = password
+        self.token: Optional[str] = None
+        self.token_exp: Optional[float] = None
+
+    @property
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.token}"}
+
+    def token_expiring(self) -> bool:
+        if not self.token:
+            return True
+        return self.token_exp is not None and self.token_exp - time.time() < TOKEN_REFRESH_MARGIN_S
+
+    def __repr__(self) -> str:
+        return f"PooledUser({self.email})"
+
+
+class UserPool:
+    """
+    client: ApiClient (ou qualquer coisa com get/post/delete) sem token fixo.
+    owner entra no username (ex.: gw0) para não colidir entre workers.
+    """
+
+    def __init__(self, client, base_url: str, size: int = DEFAULT_POOL_SIZE, owner: str = "main", logger=None,
+                 check_token_exp: bool = True):
+        self.client = client
+        self.check_token_exp = check_token_exp
+        self.base_url = base_url.rstrip("/")
+        self.size = max(1, size)
+        self.owner = owner
+        self._log = logger
+        self._lock = threading.Lock()
+        self._free: List[PooledUser] = []
+        self._all: List[PooledUser] = []
+        self._provisioned = False
+        self.leases = 0
+        self.refreshes = 0
+        self.cleaned_on_lease = 0
+
+    def _info(self, msg: str) -> None:
+        if self._log:
+            self._log.info(msg)
+
+    # ---------- cadastro / login ----------
+    def _new_user(self) -> PooledUser:
+        username = f"pool_{self.owner}_{uuid.uuid4().hex[:10]}"
+        user = PooledUser(username, f"{username}@example.com", USER_PASSWORD)
+        resp = self.client.post(
+            f"{self.base_url}/auth/register",
+            json={"username": user.username, "email": user.email, "password": user.password},
+        )
+        if resp.status_code != 200:
+            raise RuntimeError(f"Failed to register pool user: {resp.status_code} {resp.text}")
+        self._login(user)
+        return user
+
+    def _login(self, user: PooledUser) -> None:
+        resp = self.client.post(
+            f"{self.base_url}/auth/login", json={"email": user.email, "password": user.password}
+        )
+        if resp.status_code not in (200, 201):
+            raise RuntimeError(f"Failed to login pool user {user.email}: {resp.status_code} {resp.text}")
+        token = resp.json().get("access_token")
+        if not token:
+            raise RuntimeError(f"Token not returned by the API for {user.email}")
+        user.token = token
+        user.token_exp = jwt_expiry(token) if self.check_token_exp else None
+
+    def provision(self, n: int) -> List[PooledUser]:
+        """Cadastra + loga n usuários em paralelo."""
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(n, 8)) as pool:
+            users = list(pool.map(lambda _: self._new_user(), range(n)))
+        with self._lock:
+            self._all.extend(users)
+            self._free.extend(users)
+        self._info(f"[USERS] provisioned {n} user(s) in {time.perf_counter() - t0:.2f}s ({self.owner})")
+        return users
+
+    def refresh(self, user: PooledUser) -> str:
+        self._login(user)
+        with self._lock:
+            self.refreshes += 1
+        return user.token
+
+    # ---------- lease ----------
+    def _ensure_clean(self, user: PooledUser) -> None:
+        """Garante token válido e nenhuma wishlist/produto sobrando do teste anterior."""
+        if user.token_expiring():
+            self.refresh(user)
+        resp = self.client.get(f"{self.base_url}/wishlists", headers=user.headers)
+        if resp.status_code == 401:
+            self.refresh(user)
+            resp = self.client.get(f"{self.base_url}/wishlists", headers=user.headers)
+        if resp.status_code != 200:
+            raise RuntimeError(f"Cannot list wishlists for {user.email}: {resp.status_code} {resp.text}")
+        wishlists = resp.json() or []
+        if not wishlists:
+            return
+        with self._lock:
+            self.cleaned_on_lease += 1
+        for w in wishlists:
+            wid = w.get("id")
+            if wid is None:
+                continue
+            p_resp = self.client.get(f"{self.base_url}/wishlists/{wid}/products", headers=user.headers)
+            if p_resp.status_code == 200:
+                for p in p_resp.json() or []:
+                    if p.get("id") is not None:
+                        self.client.delete(f"{self.base_url}/products/{p['id']}", headers=user.headers)
+            self.client.delete(f"{self.base_url}/wishlists/{wid}", headers=user.headers)
+
+    def lease(self) -> PooledUser:
+        with self._lock:
+            first = not self._provisioned
+            self._provisioned = True
+        if first:
+            self.provision(self.size)
+
+        with self._lock:
+            user = self._free.pop(0) if self._free else None
+        if user is None:
+            # mais testes simultâneos que o tamanho do pool: cresce sob demanda
+            # (direto para _all; passando por _free outra thread poderia pegá-lo)
+            user = self._new_user()
+            with self._lock:
+                self._all.append(user)
+            self._info(f"[USERS] pool grew to {len(self._all)} user(s) ({self.owner})")
+
+        try:
+            self._ensure_clean(user)
+        except RuntimeError as e:
+            # usuário apagado/quebrado por algum teste: troca por um novo
+            self._info(f"[USERS] replacing {user.email}: {e}")
+            with self._lock:
+                self._all.remove(user)
+            user = self._new_user()
+            with self._lock:
+                self._all.append(user)
+        with self._lock:
+            self.leases += 1
+        return user
+
+    def release(self, user: PooledUser) -> None:
+        with self._lock:
+            if user in self._all and user not in self._free:
+                self._free.append(user)
+
+    def owns(self, token: Optional[str]) -> bool:
+        return bool(token) and any(u.token == token for u in self._all)
+
+    # ---------- fim da sessão ----------
+    def close(self) -> dict:
+        """Apaga os usuários do pool (best-effort) e devolve as estatísticas."""
+        users, deleted = list(self._all), 0
+        if users:
+            def _delete(user):
+                try:
+                    if user.token_expiring():
+                        self._login(user)
+                    resp = self.client.delete(f"{self.base_url}/users/me", headers=user.headers)
+                    return resp.status_code in (200, 204)
+                except Exception:
+                    return False
+
+            with ThreadPoolExecutor(max_workers=min(len(users), 8)) as pool:
+                deleted = sum(pool.map(_delete, users))
+            if deleted < len(users):
+                self._info(f"[USERS] {len(users) - deleted} pool user(s) not deleted (DELETE /users/me unavailable?)")
+        stats = self.stats()
+        stats["deleted"] = deleted
+        self._info(f"[USERS] pool stats ({self.owner}): {stats}")
+        self._all, self._free = [], []
+        return stats
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self._all),
+            "leases": self.leases,
+            "token_refreshes": self.refreshes,
+            "cleaned_on_lease": self.cleaned_on_lease,
+        }